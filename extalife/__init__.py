@@ -3,18 +3,21 @@ import asyncio
 from datetime import timedelta
 import importlib
 import logging
-from typing import Optional
+import time
+from typing import Any, Callable, Optional
 import voluptuous as vol
 
 from homeassistant.const import CONF_ACCESS_TOKEN
 import homeassistant.helpers.config_validation as cv
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.discovery import load_platform
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers import entity_component
 from homeassistant.helpers import entity_platform
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_track_time_interval, async_call_later
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.typing import HomeAssistantType, ConfigType
 from homeassistant.components.switch import DOMAIN as DOMAIN_SWITCH
 from homeassistant.components.light import DOMAIN as DOMAIN_LIGHT
@@ -22,10 +25,16 @@ from homeassistant.components.binary_sensor import DOMAIN as DOMAIN_BINARY_SENSO
 from homeassistant.components.climate import DOMAIN as DOMAIN_CLIMATE
 from homeassistant.components.cover import DOMAIN as DOMAIN_COVER
 from homeassistant.components.sensor import DOMAIN as DOMAIN_SENSOR
+from homeassistant.components.scene import DOMAIN as DOMAIN_SCENE
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
 
 from .pyextalife import ExtaLifeAPI         # pylint: disable=syntax-error
 from .pyextalife import TCPConnError        # pylint: disable=syntax-error
+from .pyextalife import LatencyStats        # pylint: disable=syntax-error
+from .pyextalife import (                   # pylint: disable=syntax-error
+    COMMAND_PRIORITY_REFRESH,
+    COMMAND_PRIORITY_BACKGROUND,
+)
 from .pyextalife import (                   # pylint: disable=syntax-error
     DEVICE_ARR_ALL_SWITCH,
     DEVICE_ARR_ALL_LIGHT,
@@ -55,7 +64,14 @@ from .helpers.const import (
     OPTIONS_COVER_INVERTED_CONTROL,
     SIGNAL_DATA_UPDATED,
     SIGNAL_NOTIF_STATE_UPDATED,
+    SIGNAL_CONNECTION_STATE,
+    SIGNAL_CHANNEL_DATA_UPDATED,
+    SIGNAL_CHANNEL_STATE_STORED,
+    SIGNAL_CHANNEL_REMOVED,
     DOMAIN_TRANSMITTER,
+    DOMAIN_VIRTUAL_SENSORS,
+    TRIGGER_BUTTON_DOWN,
+    TRIGGER_BUTTON_UP,
     CONF_OPTIONS,
     OPTIONS_SWITCH,
     OPTIONS_LIGHT,
@@ -65,6 +81,8 @@ from .helpers.const import (
     OPTIONS_GENERAL,
     OPTIONS_GENERAL_POLL_INTERVAL,
     OPTIONS_GENERAL_DISABLE_NOT_RESPONDING,
+    OPTIONS_GENERAL_CONFIRM_TIMEOUT,
+    DEFAULT_CONFIRM_TIMEOUT,
     VIRT_SENSOR_CHN_FIELD,
     VIRT_SENSOR_DEV_CLS,
     VIRT_SENSOR_PATH,
@@ -72,13 +90,17 @@ from .helpers.const import (
 )
 
 from .helpers.services import ExtaLifeServices
+from .helpers.store import ChannelStore, SOURCE_NOTIFICATION, SOURCE_OPTIMISTIC
 from .config_flow import get_default_options
 from .helpers.core import Core
+from .helpers.group import get_group_members
 
 _LOGGER = logging.getLogger(__name__)
 
 OPTIONS_DEFAULTS = get_default_options()
 
+RESYNC_MIN_INTERVAL = 30  # min. seconds between state resyncs after reconnection
+
 # schema validations
 OPTIONS_CONF_SCHEMA = {
     vol.Optional(OPTIONS_GENERAL, default=OPTIONS_DEFAULTS[OPTIONS_GENERAL]): {
@@ -296,12 +318,17 @@ async def initialize(hass: HomeAssistantType, config_entry: ConfigEntry):
         await core.unload_entry_from_hass()
         raise ConfigEntryNotReady                                                           # pylint: disable=raise-missing-from
 
+    # re-verify cached controller MAC off the startup path
+    hass.async_create_task(core.async_verify_mac())
+
     await core.register_controller()
 
     core = Core.get(config_entry.entry_id)
 
     await data.async_start_polling(poll_now=True)
 
+    await data.async_setup_scenes()
+
     # publish services to HA service registry
     await core.async_register_services()
 
@@ -319,14 +346,32 @@ class ChannelDataManager:
         self._config_entry = config_entry
         self._listeners = []
 
-        self.channels_indx = {}
-        self.initial_channels = {}
+        self.channels_indx = ChannelStore()
+        # channel id: platform of the channel's entities (None - not supported); channels processed by discovery
+        self.discovered_channels = {}
+        # ids of controller scenes with scene entities
+        self.scenes = set()
+        # ids of channels whose stored data is followed by groups; groups change only with entry reload
+        self.group_members = get_group_members(config_entry)
+        # (device id, channel) of discovered channels with entities or transmitters and of those ignored
+        # by discovery. Keyed like raw notification data so that notifications can be filtered cheaply
+        self.subscribed_channels = set()
+        self.ignored_channels = set()
 
         # self._notif_listener: NotifThreadListener = None
 
         self._poller_callback_remove = None
         self._ping_callback_remove = None
 
+        self._last_resync = None
+        self._resync_callback_remove = None
+
+        # instrumentation
+        self.poll_stats = LatencyStats()
+        self.discovery_stats = LatencyStats()
+        self.notifications_dropped_unknown = 0
+        self.notifications_dropped_ignored = 0
+
         return None
 
     @property
@@ -337,6 +382,25 @@ class ChannelDataManager:
     def controller(self) -> ExtaLifeAPI:
         return Core.get(self._config_entry.entry_id).api
 
+    @staticmethod
+    def get_notification_key(channel_data: dict) -> tuple:
+        """(device id, channel) of channel data or status notification data"""
+        return channel_data.get("id"), channel_data.get("channel", "#")
+
+    # callback
+    def is_subscribed(self, data: dict) -> bool:
+        """Check if status notification data concern a channel with entities or a transmitter.
+        Counts notifications of other channels: ignored by discovery (e.g. repeaters) or unknown"""
+        key = (data.get("id"), data.get("channel", "#"))
+        if key in self.subscribed_channels:
+            return True
+
+        if key in self.ignored_channels:
+            self.notifications_dropped_ignored += 1
+        else:
+            self.notifications_dropped_unknown += 1
+        return False
+
     # callback
     def on_notify(self, msg):
         _LOGGER.debug("Received status change notification from controller: %s", msg)
@@ -344,6 +408,11 @@ class ChannelDataManager:
         channel = data.get("channel", "#")
         chan_id = str(data.get("id")) + "-" + str(channel)
 
+        # transmitter button bound locally to a channel action - execute it before anything else
+        if self.core.bindings and "button" in data:
+            gesture = TRIGGER_BUTTON_DOWN if data.get("state") == 1 else TRIGGER_BUTTON_UP
+            self.core.bindings.on_button_event(chan_id, data["button"], gesture)
+
         # inform HA entity of state change via notification
         signal = ExtaLifeChannel.get_notif_upd_signal(chan_id)
         if channel != "#":
@@ -351,10 +420,51 @@ class ChannelDataManager:
         else:
             self.core.async_signal_send_sync(signal, data)
 
-    def update_channel(self, id: str, data: dict):      # pylint: disable=redefined-builtin
+    # callback
+    def on_scene_notify(self, msg):
+        """Controller scenes can't be listed - learn them from their activation notifications
+        and create scene entities for new ones"""
+        data = msg.get("data") or {}
+        try:
+            scene_id = int(data.get("id"))
+        except (TypeError, ValueError):
+            return
+
+        if scene_id in self.scenes:
+            return
+
+        if self.core.async_add_channels(DOMAIN_SCENE, [{"id": scene_id, "data": data}]):
+            _LOGGER.info("Controller scene %s discovered", scene_id)
+            self.scenes.add(scene_id)
+
+    async def async_setup_scenes(self):
+        """Set up scene platform with scenes learnt during previous runs and kept in entity registry"""
+        from .scene import ExtaLifeScene
+
+        registry = er.async_get(self._hass)
+        scenes = []
+        for entry in er.async_entries_for_config_entry(registry, self._config_entry.entry_id):
+            scene_id = ExtaLifeScene.get_scene_id(entry.unique_id) if entry.domain == DOMAIN_SCENE else None
+            if scene_id is None or scene_id in self.scenes:
+                continue
+
+            self.scenes.add(scene_id)
+            scenes.append({"id": scene_id, "data": {"alias": entry.original_name}})
+
+        # store array of channels (variable 'channels') for the platform setup
+        self.core.push_channels(DOMAIN_SCENE, scenes)
+        await self._hass.config_entries.async_forward_entry_setup(
+            self._config_entry, DOMAIN_SCENE
+        )
+
+    def update_channel(self, id: str, data: dict, source: str = SOURCE_NOTIFICATION) -> int:      # pylint: disable=redefined-builtin
         """Update data of a channel e.g. after notification data received and processed
-        by an entity"""
-        self.channels_indx.update({id: data})
+        by an entity. Returns new revision of the channel data"""
+        revision = self.channels_indx.update(id, data, source)
+        if id in self.group_members:
+            # groups compute their state from stored channel data - they are informed only after the store
+            self.core.async_signal_send(f"{SIGNAL_CHANNEL_STATE_STORED}_{id}")
+        return revision
 
     async def async_start_polling(self, poll_now: bool):
         """Start cyclic status polling
@@ -369,7 +479,7 @@ class ChannelDataManager:
         if self._poller_callback_remove is not None:
             self._poller_callback_remove()
 
-        await self._async_update_callback()
+        await self._async_update_callback(priority=COMMAND_PRIORITY_REFRESH)
 
         self.setup_periodic_callback()
 
@@ -380,28 +490,86 @@ class ChannelDataManager:
             self._poller_callback_remove()
             self._poller_callback_remove = None
 
-    async def _async_update_callback(self, now=None):
+        if self._resync_callback_remove is not None:
+            self._resync_callback_remove()
+            self._resync_callback_remove = None
+
+    async def async_resync(self, now=None):
+        """Fetch status of all channels e.g. after reconnection and inform only entities
+        whose channels changed. Notifications sent by the controller during connection outage are lost,
+        so without this the state would be stale until the next poll.
+
+        Rate limited - when called too often (flapping connection) the resync is deferred"""
+
+        if now is not None:
+            # deferred resync is being executed
+            self._resync_callback_remove = None
+
+        if self._last_resync is not None:
+            wait = self._last_resync + RESYNC_MIN_INTERVAL - time.monotonic()
+            if wait > 0:
+                if self._resync_callback_remove is None:
+                    _LOGGER.debug("Status resync deferred by %.1f seconds", wait)
+                    self._resync_callback_remove = async_call_later(
+                        self._hass, wait, self.async_resync
+                    )
+                return
+
+        self._last_resync = time.monotonic()
+
+        _LOGGER.debug("Executing EFC-01 status resync....")    # pylint: disable=hass-logger-period
+        since = self.channels_indx.revision
+        channels = await self.controller.async_get_channels(priority=COMMAND_PRIORITY_REFRESH)
+        if channels is None:
+            _LOGGER.warning("No Channels could be obtained from the controller")
+            return
+
+        self._remove_missing_channels(channels)
+
+        known = set(self.channels_indx)
+        changed = 0
+        new_channels = False
+        for chan_id in self.channels_indx.merge_snapshot(((elem["id"], elem["data"]) for elem in channels), since):
+            if chan_id not in known:
+                new_channels = True
+                continue
+
+            changed += 1
+            self.core.async_signal_send(ExtaLifeChannel.get_data_upd_signal(chan_id))
+
+        _LOGGER.debug("Exta Life: status resync. Changed channels: %s", changed)
+
+        if new_channels:
+            await self.async_discover_devices()
+
+    async def _async_update_callback(self, now=None, priority=COMMAND_PRIORITY_BACKGROUND):
         """Get the latest device&channel status data from EFC-01.
-        This method is called from HA task scheduler via async_track_time_interval"""
+        This method is called from HA task scheduler via async_track_time_interval
+
+        priority - priority of the fetches in the controller's command queue. Periodic polling runs
+        in the background so that user actions are not delayed"""
 
         _LOGGER.debug("Executing EFC-01 status polling....")    # pylint: disable=hass-logger-period
+        started = time.monotonic()
+        since = self.channels_indx.revision
         # use Exta Life TCP communication class
 
         # if connection error or other - will receive None
         # otherwise it contains a list of channels
-        channels = await self.controller.async_get_channels()
+        channels = await self.controller.async_get_channels(priority=priority)
 
         if channels is None:
             _LOGGER.warning("No Channels could be obtained from the controller")
             return
 
         # create indexed access: dict from list element
-        # dict key = "data" section
-        for elem in channels:
-            chan = {elem["id"]: elem["data"]}
-            self.channels_indx.update(chan)
+        # dict key = "data" section; channels updated by notifications during the fetch keep their newer data
+        self.channels_indx.merge_snapshot(((elem["id"], elem["data"]) for elem in channels), since)
+        self._remove_missing_channels(channels)
 
+        # entities skip the update if their channel's revision didn't change
         self.core.async_signal_send(SIGNAL_DATA_UPDATED)
+        self.poll_stats.add(time.monotonic() - started)
 
         _LOGGER.debug(
             "Exta Life: status for %s devices updated", len(self.channels_indx)
@@ -409,10 +577,22 @@ class ChannelDataManager:
 
         await self.async_discover_devices()
 
-        if now is None:
-            # store initial channel list for subsequent discovery runs for detection of new devices
-            # store only for the 1st call (by setup code, not by HA)
-            self.initial_channels = self.channels_indx.copy()
+    def _remove_missing_channels(self, channels: list):
+        """Remove channels missing in status snapshot of all channels - devices deleted from the controller.
+        Their entities are removed from HA, but stay in entity registry"""
+        if not channels:
+            # rather a glitch than all devices deleted
+            return
+
+        present = {elem["id"] for elem in channels}
+        for chan_id in [chan_id for chan_id in self.channels_indx if chan_id not in present]:
+            _LOGGER.info("Channel %s no longer exists in the controller. Removing its entities", chan_id)
+            key = self.get_notification_key(self.channels_indx[chan_id])
+            self.subscribed_channels.discard(key)
+            self.ignored_channels.discard(key)
+            self.channels_indx.remove(chan_id)
+            self.discovered_channels.pop(chan_id, None)
+            self.core.async_signal_send(ExtaLifeChannel.get_remove_signal(chan_id))
 
     def setup_periodic_callback(self):
         """(Re)set periodic callback period based on options"""
@@ -424,14 +604,16 @@ class ChannelDataManager:
 
         _LOGGER.debug("setup_periodic_callback(). Setting interval: %s", interval)
 
-        self._poller_callback_remove = self.core.async_track_time_interval(
-            self._async_update_callback, timedelta(minutes=interval)
+        # polls of multiple controllers are spread in time by the shared scheduler
+        self._poller_callback_remove = self.core.poll_scheduler.async_add(
+            self._config_entry.entry_id, timedelta(minutes=interval), self._async_update_callback
         )
 
     async def async_discover_devices(self):
         """
         Fetch / refresh device data & discover devices and register them in Home Assistant.
         """
+        started = time.monotonic()
 
         component_configs = {}
         other_configs = {}
@@ -440,15 +622,17 @@ class ChannelDataManager:
 
         entities = 0
         for channel_id, channel_data in self.channels_indx.items():  # -> dict id:data
+            # do discovery only for newly discovered devices
+            if channel_id in self.discovered_channels:
+                continue
+            self.discovered_channels[channel_id] = None
+            key = self.get_notification_key(channel_data)
+            self.ignored_channels.add(key)
+
             channel = {"id": channel_id, "data": channel_data}
 
             chn_type = channel["data"]["type"]
 
-            # do discovery only for newly discovered devices
-            ch_id = channel.get("id")
-            if self.initial_channels.get(ch_id):
-                continue
-
             component_name = None
 
             # skip some devices that are not to be shown nor controlled by HA
@@ -483,6 +667,9 @@ class ChannelDataManager:
                 component_name = DOMAIN_CLIMATE
 
             elif chn_type in DEVICE_ARR_ALL_TRANSMITTER:
+                self.discovered_channels[channel_id] = DOMAIN_TRANSMITTER
+                self.ignored_channels.discard(key)
+                self.subscribed_channels.add(key)
                 other_configs.setdefault(DOMAIN_TRANSMITTER, []).append(channel)
                 continue
 
@@ -494,6 +681,9 @@ class ChannelDataManager:
                 )
                 continue
 
+            self.discovered_channels[channel_id] = component_name
+            self.ignored_channels.discard(key)
+            self.subscribed_channels.add(key)
             component_configs.setdefault(component_name, []).append(channel)
             entities += 1
 
@@ -510,18 +700,7 @@ class ChannelDataManager:
             component_configs[DOMAIN_SENSOR] = component_configs.pop(DOMAIN_SENSOR)
 
             for component_name, channels in component_configs.items():
-                # store array of channels (variable 'channels') for each platform
-                self.core.push_channels(component_name, channels)
-
-                # 'sync' call to synchronize channels' stack with platform setup
-                await self._hass.config_entries.async_forward_entry_setup(
-                    self._config_entry, component_name
-                )
-                # self._hass.async_create_task(
-                #     self._hass.config_entries.async_forward_entry_setup(
-                #         self._config_entry, component_name
-                #     )
-                # )
+                await self._async_add_platform_channels(component_name, channels)
 
         # setup pseudo-platforms
         for component_name, channels in other_configs.items():
@@ -531,6 +710,41 @@ class ChannelDataManager:
                 self.core.async_setup_custom_platforms(component_name)
             )
 
+        self.discovery_stats.add(time.monotonic() - started)
+
+    async def _async_add_platform_channels(self, platform: str, channels: list):
+        """Create entities for newly discovered channels. A platform is set up by HA only once -
+        afterwards entities are added directly by the platform's async_add_entities callback
+        kept by Core, without touching other platforms"""
+        if self.core.async_add_channels(platform, channels):
+            if platform == DOMAIN_SENSOR:
+                # virtual sensors pushed by the entities just created on other platforms
+                for virtual_domain in DOMAIN_VIRTUAL_SENSORS:
+                    virtual_channels = self.core.get_channels(virtual_domain)
+                    self.core.pop_channels(virtual_domain)
+                    self.core.async_add_channels(virtual_domain, virtual_channels)
+            return
+
+        # store array of channels (variable 'channels') for the platform setup
+        self.core.push_channels(platform, channels)
+
+        # 'sync' call to synchronize channels' stack with platform setup
+        await self._hass.config_entries.async_forward_entry_setup(
+            self._config_entry, platform
+        )
+
+    def stats_as_dict(self) -> dict:
+        """Instrumentation data for diagnostics"""
+        return {
+            "channels": len(self.channels_indx),
+            "poll": self.poll_stats.as_dict(),
+            "discovery": self.discovery_stats.as_dict(),
+            "notifications_dropped": {
+                "unknown": self.notifications_dropped_unknown,
+                "ignored": self.notifications_dropped_ignored,
+            },
+        }
+
 
 class ExtaLifeChannel(Entity):
     """Base class of a ExtaLife Channel (an equivalent of HA's Entity).
@@ -549,21 +763,69 @@ class ExtaLifeChannel(Entity):
         self._signal_data_updated = None
         self._signal_data_notif_upd = None
 
+        self._last_trace = None
+
+        # revision of channel data in ChannelStore the entity state reflects
+        self._revision: int = None
+
+        # state attributes and the channel data they were built from, see extra_state_attributes
+        self._attributes_key: tuple = None
+        self._attributes: dict = None
+
+        # entity metadata computed from channel data, see get_cached_metadata
+        self._metadata_key: tuple = None
+        self._metadata: dict = {}
+
+        # optimistic state: channel_data values from before pending optimistic updates, None if nothing pending
+        self._optimistic_base: dict = None
+        self._optimistic_pending = 0
+
     @staticmethod
     def get_notif_upd_signal(ch_id):
         return f"{SIGNAL_NOTIF_STATE_UPDATED}_{ch_id}"
 
+    @staticmethod
+    def get_data_upd_signal(ch_id):
+        return f"{SIGNAL_CHANNEL_DATA_UPDATED}_{ch_id}"
+
+    @staticmethod
+    def get_remove_signal(ch_id):
+        return f"{SIGNAL_CHANNEL_REMOVED}_{ch_id}"
+
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
 
         _LOGGER.debug("async_added_to_hass() for entity: %s", self.entity_id)
-        Core.get(self.config_entry.entry_id).async_signal_register(
-            SIGNAL_DATA_UPDATED, self.async_update_callback
+        core = Core.get(self.config_entry.entry_id)
+
+        # signal listeners are unregistered when the entity is removed
+        self.async_on_remove(
+            core.async_signal_register(SIGNAL_DATA_UPDATED, self.async_update_callback)
         )
 
-        Core.get(self.config_entry.entry_id).async_signal_register(
-            self.get_notif_upd_signal(self.channel_id),
-            self.async_state_notif_update_callback,
+        self.async_on_remove(
+            core.async_signal_register(
+                self.get_notif_upd_signal(self.channel_id),
+                self.async_state_notif_update_callback,
+            )
+        )
+
+        self.async_on_remove(
+            core.async_signal_register(
+                self.get_data_upd_signal(self.channel_id), self.async_update_callback
+            )
+        )
+
+        self.async_on_remove(
+            core.async_signal_register(
+                SIGNAL_CONNECTION_STATE, self.async_connection_state_callback
+            )
+        )
+
+        self.async_on_remove(
+            core.async_signal_register(
+                self.get_remove_signal(self.channel_id), self.async_channel_removed_callback
+            )
         )
 
     async def async_will_remove_from_hass(self) -> None:
@@ -571,9 +833,25 @@ class ExtaLifeChannel(Entity):
 
     async def async_update_callback(self):
         """Inform HA of state update from status poller"""
+        if self.is_revision_current:
+            return
         _LOGGER.debug("Update callback for entty id: %s", self.entity_id)
         self.async_schedule_update_ha_state(True)
 
+    @property
+    def is_revision_current(self) -> bool:
+        """Does entity reflect the latest channel data from the data manager?"""
+        return self._revision == self.data_poller.channels_indx.get_revision(self.channel_id)
+
+    async def async_channel_removed_callback(self):
+        """Remove entity of a channel which no longer exists in the controller. The entity registry entry
+        is kept, so that entity id and user customizations are restored if the device is added back"""
+        await self.async_remove()
+
+    async def async_connection_state_callback(self):
+        """Inform HA of availability change after controller connection was lost or restored"""
+        self.async_schedule_update_ha_state()
+
     async def async_state_notif_update_callback(self, *args):
         """Inform HA of state change received from controller status notification"""
         data = args[0]
@@ -583,6 +861,9 @@ class ExtaLifeChannel(Entity):
             data,
         )
 
+        # notification carries the real state - pending optimistic changes are not to be reverted anymore
+        self._optimistic_base = None
+
         self.on_state_notification(data)
 
     def on_state_notification(self, data):
@@ -614,15 +895,33 @@ class ExtaLifeChannel(Entity):
         """Return Data poller object"""
         return self.core.data_manager
 
+    def get_cached_metadata(self, name: str, build: Callable[[], Any]) -> Any:
+        """Return entity metadata (unique id, name, device info etc.) computed once by `build`.
+        Home Assistant reads them on every state write, but they change only with channel data fields:
+        serial, type, alias, exta_free_device"""
+        data = self.channel_data
+        key = (data.get("serial"), data.get("type"), data.get("alias"), data.get("exta_free_device"))
+        if key != self._metadata_key:
+            self._metadata_key = key
+            self._metadata = {}
+
+        try:
+            return self._metadata[name]
+        except KeyError:
+            value = self._metadata[name] = build()
+            return value
+
     @property
     def unique_id(self) -> str:
         """Return a unique ID."""
-        return self.get_unique_id()
+        return self.get_cached_metadata("unique_id", self.get_unique_id)
 
     @property
     def model(self) -> str:
         """Return model"""
-        return DEVICE_MAP_TYPE_TO_MODEL.get(self.channel_data.get("type"))
+        return self.get_cached_metadata(
+            "model", lambda: DEVICE_MAP_TYPE_TO_MODEL.get(self.channel_data.get("type"))
+        )
 
     @property
     def is_exta_free(self) -> bool:
@@ -632,12 +931,13 @@ class ExtaLifeChannel(Entity):
     @property
     def assumed_state(self) -> bool:
         """Returns boolean if entity status is assumed status"""
-        ret = self.is_exta_free
-        _LOGGER.debug("Assumed state for entity: %s, %s", self.entity_id, ret)
-        return ret
+        return self.is_exta_free
 
     @property
     def device_info(self):
+        return self.get_cached_metadata("device_info", self._build_device_info)
+
+    def _build_device_info(self) -> dict:
         prod_series = (
             PRODUCT_SERIES if not self.is_exta_free else PRODUCT_SERIES_EXTA_FREE
         )
@@ -654,11 +954,13 @@ class ExtaLifeChannel(Entity):
         """Return name of the entity"""
         return self.channel_data["alias"]
 
-    async def async_action(self, action, **add_pars):
+    async def async_action(self, action, timeout: float = None, **add_pars):
         """
         Run controller command/action.
 
         Actions are currently hardcoded in platforms
+
+        timeout - optional, max. time (seconds) for the controller to execute the action
         """
 
         _LOGGER.debug(
@@ -668,30 +970,130 @@ class ExtaLifeChannel(Entity):
             add_pars,
         )
 
-        try:
-            resp = await self.controller.async_execute_action(
-                action, self.channel_id, **add_pars
-            )
-        except TCPConnError as err:
-            _LOGGER.error(err.data)
+        resp = None
+        with self.controller.tracer.trace(
+            "action", entity_id=self.entity_id, action=action
+        ) as trace:
+            try:
+                resp = await self.controller.async_execute_action(
+                    action, self.channel_id, timeout, **add_pars
+                )
+            except TCPConnError as err:
+                _LOGGER.error(err.data)
+
+        # platforms write entity state right after the action; add it to the trace
+        self._last_trace = trace
+
+        return resp
+
+    async def async_action_press_release(self, press_action, **add_pars):
+        """
+        Press and release Exta Free button in one operation. Both commands are pipelined, so the operation
+        takes a single controller round trip
+
+        press_action - one of ACTN_EXFREE_*_PRESS actions
+
+        Returns responses to both commands or None if any of them failed
+        """
+
+        _LOGGER.debug(
+            "Executing press-release %s on channel %s, params: %s",
+            press_action,
+            self.channel_id,
+            add_pars,
+        )
+
+        resp = None
+        with self.controller.tracer.trace(
+            "action", entity_id=self.entity_id, action=press_action
+        ) as trace:
+            try:
+                resp = await self.controller.async_execute_press_release(
+                    press_action, self.channel_id, **add_pars
+                )
+            except TCPConnError as err:
+                _LOGGER.error(err.data)
+
+        self._last_trace = trace
 
         return resp
 
+    async def async_action_optimistic(self, action, expected: dict, **add_pars) -> bool:
+        """
+        Run controller command/action with optimistic state update.
+
+        expected - channel_data fields expected after the action succeeds. They are applied and entity state
+        is written right away, without waiting for the controller. Confirmed by the response or the state
+        notification, whichever comes first. If the action fails or is not confirmed within the confirmation
+        timeout, the previous values are restored - unless a notification has updated the state in the meantime
+
+        Returns True if the action succeeded
+        """
+        data = self.channel_data
+        if self._optimistic_base is None:
+            self._optimistic_base = {}
+        for field in expected:
+            self._optimistic_base.setdefault(field, data.get(field))
+
+        data.update(expected)
+        self._revision = self.data_poller.update_channel(self.channel_id, data, SOURCE_OPTIMISTIC)
+        self._optimistic_pending += 1
+        self.async_write_ha_state()
+
+        try:
+            resp = await self.async_action(action, timeout=self.confirm_timeout, **add_pars)
+        finally:
+            self._optimistic_pending -= 1
+
+        base = self._optimistic_base
+        if resp:
+            if base is not None:
+                if self._optimistic_pending:
+                    # newer optimistic changes are pending; if they fail, revert to this confirmed state
+                    base.update(expected)
+                else:
+                    self._optimistic_base = None
+            return True
+
+        # revert only once the latest pending action has failed; the newer one decides otherwise
+        if base is not None and not self._optimistic_pending:
+            _LOGGER.debug("Action %s on entity %s failed. Reverting state", action, self.entity_id)
+            data.update(base)
+            self._optimistic_base = None
+            self._revision = self.data_poller.update_channel(self.channel_id, data, SOURCE_OPTIMISTIC)
+            self.async_write_ha_state()
+        return False
+
+    @property
+    def confirm_timeout(self) -> float:
+        """Time (seconds) for controller to confirm action before optimistic state is reverted"""
+        return self.config_entry.options.get(OPTIONS_GENERAL, {}).get(
+            OPTIONS_GENERAL_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT
+        )
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write entity state; record the write if it follows a traced action"""
+        trace = self._last_trace
+        if trace is None:
+            super().async_write_ha_state()
+            return
+
+        self._last_trace = None
+        start = time.monotonic()
+        super().async_write_ha_state()
+        trace.add_span("state_write", start, time.monotonic())
+
     @property
     def available(self):
+        # read on every state write - no logging here
         is_timeout = (
             self.channel_data.get("is_timeout")
             if self.config_entry.options.get(OPTIONS_GENERAL_DISABLE_NOT_RESPONDING)
             else False
         )
-        _LOGGER.debug(
-            "available() for entity: %s. self.data_available: %s; 'is_timeout': %s",
-            self.entity_id,
-            self.data_available,
-            is_timeout,
-        )
 
-        return self.data_available == True and is_timeout == False
+        return self.data_available == True and is_timeout == False and self.controller.is_connected
 
     async def async_update(self):
         """Call to update state."""
@@ -700,6 +1102,7 @@ class ExtaLifeChannel(Entity):
 
         # read "data" section/dict by channel id
         data = channel_indx.get(self.channel_id)
+        self._revision = channel_indx.get_revision(self.channel_id)
 
         _LOGGER.debug(
             "async_update() for entity: %s, data to be updated: %s",
@@ -720,12 +1123,21 @@ class ExtaLifeChannel(Entity):
         then must update its state. For consistency reasons - Data Manager is updated and then
         HA status update is scheduled"""
 
-        self.data_poller.update_channel(self.channel_id, self.channel_data)
+        self._revision = self.data_poller.update_channel(self.channel_id, self.channel_data)
         self.async_schedule_update_ha_state(True)
 
     @property
     def extra_state_attributes(self):
-        """ " Return state atributes"""
+        """Return state attributes built by build_state_attributes(). They are built once per channel data
+        revision - the same dict is returned until channel data changes, so it must not be modified"""
+        key = (self._revision, id(self.channel_data))
+        if key != self._attributes_key:
+            self._attributes_key = key
+            self._attributes = self.build_state_attributes()
+        return self._attributes
+
+    def build_state_attributes(self) -> dict:
+        """ " Return state atributes. Subclasses extend the dict returned by super()"""
         return {
             "channel_id": self.channel_id,
             "not_responding": self.channel_data.get("is_timeout"),
@@ -913,6 +1325,7 @@ class ExtaLifeController(Entity):
         attr = super().extra_state_attributes
         if attr is None:
             attr = {}
+        reconnect = self.core.reconnect_manager
         attr.update(
                 {
                      "type": "gateway",
@@ -920,6 +1333,10 @@ class ExtaLifeController(Entity):
                      "ipv4_addres:": self.api.host,
                      "software_version": self.api.sw_version,
                      "name": self.api.name,
+                     "reconnects": reconnect.reconnects,
+                     "reconnect_failed_attempts": reconnect.failed_attempts,
+                     "last_reconnect_time": reconnect.last_reconnect_time,
+                     "max_reconnect_time": reconnect.max_reconnect_time,
                 }
             )
         return attr
@@ -1,6 +1,5 @@
 """Support for Exta Life binary sensor devices e.g. leakage sensor, door/window open sensor"""
 import logging
-from pprint import pformat
 from homeassistant.components.binary_sensor import BinarySensorEntity, DOMAIN as DOMAIN_BINARY_SENSOR
 from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.config_entries import ConfigEntry
@@ -24,12 +23,9 @@ async def async_setup_entry(hass: HomeAssistantType, config_entry: ConfigEntry,
     """Set up Exta Life binary sensors based on existing config."""
 
     core = Core.get(config_entry.entry_id)
-    channels = core.get_channels(DOMAIN_BINARY_SENSOR)
-
-    _LOGGER.debug("Discovery: %s", pformat(channels))
-    async_add_entities([ExtaLifeBinarySensor(device, config_entry) for device in channels])
-
-    core.pop_channels(DOMAIN_BINARY_SENSOR)
+    core.async_setup_platform_entities(
+        DOMAIN_BINARY_SENSOR, async_add_entities, lambda device: ExtaLifeBinarySensor(device, config_entry)
+    )
 
 class ExtaLifeBinarySensor(ExtaLifeChannel, BinarySensorEntity):
     """Representation of an ExtaLife binary sensors"""
@@ -83,10 +79,9 @@ class ExtaLifeBinarySensor(ExtaLifeChannel, BinarySensorEntity):
     def device_class(self):
         return self._dev_class
 
-    @property
-    def extra_state_attributes(self):
+    def build_state_attributes(self) -> dict:
         """Return device specific state attributes."""
-        attr = super().extra_state_attributes
+        attr = super().build_state_attributes()
         if attr is None:
             attr = {}
         data = self.channel_data
@@ -1,5 +1,4 @@
 import logging
-from pprint import pformat
 
 # from homeassistant.components.extalife import ExtaLifeChannel
 from homeassistant.config_entries import ConfigEntry
@@ -66,12 +65,9 @@ async def async_setup_entry(hass: HomeAssistantType, config_entry: ConfigEntry,
     """Set up an Exta Life heat controllers """
 
     core = Core.get(config_entry.entry_id)
-    channels = core.get_channels(DOMAIN_CLIMATE)
-
-    _LOGGER.debug("Discovery: %s", pformat(channels))
-    async_add_entities([ExtaLifeClimate(device, config_entry) for device in channels])
-
-    core.pop_channels(DOMAIN_CLIMATE)
+    core.async_setup_platform_entities(
+        DOMAIN_CLIMATE, async_add_entities, lambda device: ExtaLifeClimate(device, config_entry)
+    )
 
 class ExtaLifeClimate(ExtaLifeChannel, ClimateEntity):
     """Representation of Exta Life Thermostat."""
@@ -117,9 +113,11 @@ class ExtaLifeClimate(ExtaLifeChannel, ClimateEntity):
 
     async def async_set_hvac_mode(self, hvac_mode):
         """Set new target hvac mode (heat, auto => manual, auto)."""
-        if await self.async_action(HA_MODE_ACTION.get(hvac_mode), value=self.channel_data.get("value")):
-            self.channel_data["work_mode"] = HVAC_MODE_EXTA.get(hvac_mode)
-            self.async_schedule_update_ha_state()
+        await self.async_action_optimistic(
+            HA_MODE_ACTION.get(hvac_mode),
+            {"work_mode": HVAC_MODE_EXTA.get(hvac_mode)},
+            value=self.channel_data.get("value"),
+        )
 
     @property
     def temperature_unit(self):
@@ -144,15 +142,15 @@ class ExtaLifeClimate(ExtaLifeChannel, ClimateEntity):
             return
         temp_el = temperature * 10.0
 
-        if await self.async_action(ExtaLifeAPI.ACTN_SET_TMP, value=temp_el):
-            self.channel_data["value"] = temp_el
-            self.channel_data["work_mode"] = HVAC_MODE_EXTA[HVACMode.HEAT]
-            self.async_schedule_update_ha_state()
+        await self.async_action_optimistic(
+            ExtaLifeAPI.ACTN_SET_TMP,
+            {"value": temp_el, "work_mode": HVAC_MODE_EXTA[HVACMode.HEAT]},
+            value=temp_el,
+        )
 
-    @property
-    def extra_state_attributes(self):
+    def build_state_attributes(self) -> dict:
         """Return device specific state attributes."""
-        attr = super().extra_state_attributes
+        attr = super().build_state_attributes()
         if attr is None:
             attr = {}
         data = self.channel_data
@@ -1,5 +1,7 @@
 """Config flow to configure Exta Life component."""
 
+from uuid import uuid4
+
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -7,8 +9,11 @@ from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 import logging
 
-from .helpers.const import (DOMAIN, CONF_CONTROLLER_IP, CONF_USER, CONF_PASSWORD, DEFAULT_POLL_INTERVAL, OPTIONS_LIGHT_ICONS_LIST,
-     OPTIONS_COVER_INVERTED_CONTROL, OPTIONS_GENERAL_POLL_INTERVAL, OPTIONS_GENERAL_DISABLE_NOT_RESPONDING)
+from .helpers.const import (DOMAIN, CONF_CONTROLLER_IP, CONF_CONTROLLER_MAC, CONF_USER, CONF_PASSWORD, DEFAULT_POLL_INTERVAL, OPTIONS_LIGHT_ICONS_LIST,
+     OPTIONS_COVER_INVERTED_CONTROL, OPTIONS_GENERAL_POLL_INTERVAL, OPTIONS_GENERAL_DISABLE_NOT_RESPONDING,
+     OPTIONS_GENERAL_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT, OPTIONS_GROUP, OPTIONS_GROUP_LIST, GROUP_ID, GROUP_NAME,
+     GROUP_PLATFORM, GROUP_CHANNELS, OPTIONS_BINDING, OPTIONS_BINDING_LIST, BINDING_ID, BINDING_TRANSMITTER, BINDING_BUTTON,
+     BINDING_GESTURE, BINDING_CHANNEL, BINDING_ACTION, BINDING_ACTION_TOGGLE, DOMAIN_TRANSMITTER, TRIGGER_BUTTON_DOWN)
 _LOGGER = logging.getLogger(__name__)
 from .pyextalife import ExtaLifeAPI, TCPConnError, DEVICE_ICON_ARR_LIGHT
 
@@ -60,7 +65,7 @@ class ExtaLifeFlowHandler(config_entries.ConfigFlow):
         controller_ip = self._import_data.get(CONF_CONTROLLER_IP) if self._import_data else None
         description_placeholders = {"error_info": ""}
         if user_input is None or (self._import_data is not None and self._import_data.get(CONF_CONTROLLER_IP) is None):
-            controller_ip = await self.hass.async_add_executor_job(ExtaLifeAPI.discover_controller)
+            controller_ip = await self._async_discover_controller()
         if user_input is not None or self._import_data is not None:
             try:
                 if controller_ip is None:
@@ -77,6 +82,12 @@ class ExtaLifeFlowHandler(config_entries.ConfigFlow):
                 if self._import_data:
                     self._import_data[CONF_CONTROLLER_IP] = controller_ip
 
+                # store MAC, so it doesn't need to be resolved on every connection
+                if self._user_input:
+                    self._user_input[CONF_CONTROLLER_MAC] = controller.mac
+                else:
+                    self._import_data[CONF_CONTROLLER_MAC] = controller.mac
+
                 # check if connection to this controller is already configured (based on MAC address)
                 # for controllers accessed through internet this may lead to misidentification due to MAC
                 # being MAC of a router, not a real EFC-01 MAC. For connections through VPN this should be ok
@@ -110,6 +121,19 @@ class ExtaLifeFlowHandler(config_entries.ConfigFlow):
             description_placeholders=description_placeholders,
         )
 
+    async def _async_discover_controller(self):
+        """Return IP of a discovered controller. If there are multiple controllers in the network
+        prefer the one, which is not configured yet"""
+        controllers = await ExtaLifeAPI.async_discover_controllers(self.hass.loop)
+        configured = {entry.data.get(CONF_CONTROLLER_IP) for entry in self._async_current_entries()}
+
+        _LOGGER.debug("Discovered controllers: %s", controllers)
+        for controller in controllers:
+            if controller["host"] not in configured:
+                return controller["host"]
+
+        return controllers[0]["host"] if controllers else None
+
     async def async_step_title(self, user_input=None):
         """Ask for additional title for Integrations screen. To differentiate in GUI between multiple config entries"""
         if user_input is not None or self._import_data is not None:
@@ -140,9 +164,12 @@ class ExtaLifeFlowHandler(config_entries.ConfigFlow):
 
 def get_default_options():
     options = {}
-    options.setdefault("general", {OPTIONS_GENERAL_POLL_INTERVAL: DEFAULT_POLL_INTERVAL, OPTIONS_GENERAL_DISABLE_NOT_RESPONDING: True})
+    options.setdefault("general", {OPTIONS_GENERAL_POLL_INTERVAL: DEFAULT_POLL_INTERVAL, OPTIONS_GENERAL_DISABLE_NOT_RESPONDING: True,
+                                   OPTIONS_GENERAL_CONFIRM_TIMEOUT: DEFAULT_CONFIRM_TIMEOUT})
     options.setdefault("light", {OPTIONS_LIGHT_ICONS_LIST: DEVICE_ICON_ARR_LIGHT})
     options.setdefault("cover", {OPTIONS_COVER_INVERTED_CONTROL: False})
+    options.setdefault(OPTIONS_GROUP, {OPTIONS_GROUP_LIST: []})
+    options.setdefault(OPTIONS_BINDING, {OPTIONS_BINDING_LIST: []})
     return options.copy()
 
 
@@ -152,6 +179,7 @@ class ExtaLifeOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry):
         """Initialize Exta Life options flow."""
         self.options = config_entry.options.copy()
+        self._entry_id = config_entry.entry_id
 
         if self.options == {}:
             self.options = get_default_options()
@@ -170,7 +198,11 @@ class ExtaLifeOptionsFlowHandler(config_entries.OptionsFlow):
             data_schema=vol.Schema(
                 {
                     vol.Required(OPTIONS_GENERAL_POLL_INTERVAL, default=DEFAULT_POLL_INTERVAL): cv.positive_int,
-                    vol.Required(OPTIONS_GENERAL_DISABLE_NOT_RESPONDING, default=True): bool
+                    vol.Required(OPTIONS_GENERAL_DISABLE_NOT_RESPONDING, default=True): bool,
+                    vol.Required(
+                        OPTIONS_GENERAL_CONFIRM_TIMEOUT,
+                        default=self.options["general"].get(OPTIONS_GENERAL_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT)
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=30)),
                 }
             ),
         )
@@ -192,7 +224,7 @@ class ExtaLifeOptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_cover(self, user_input=None):
         if user_input is not None:
             self.options["cover"] = user_input
-            return self.async_create_entry(title="Exta Life Options", data=self.options)
+            return await self.async_step_group()
 
         return self.async_show_form(
             step_id="cover",
@@ -202,3 +234,143 @@ class ExtaLifeOptionsFlowHandler(config_entries.OptionsFlow):
                 }
             ),
         )
+
+    async def async_step_group(self, user_input=None):
+        """Native groups of channels. Unchecking a group removes it; a new group is added by entering
+        its name and channels, then the step is shown again to add another one"""
+        from .helpers.core import Core
+        from .helpers.group import get_groupable_channels
+
+        core = Core.get(self._entry_id)
+        channels = get_groupable_channels(core) if core is not None else {}
+        groups = self.options.get(OPTIONS_GROUP, {}).get(OPTIONS_GROUP_LIST, [])
+        errors = {}
+
+        if core is not None:
+            # channels of devices removed from the controller after the groups were defined
+            current = []
+            for group in groups:
+                members = [channel_id for channel_id in group[GROUP_CHANNELS] if channel_id in channels]
+                if len(members) != len(group[GROUP_CHANNELS]) and user_input is None:
+                    errors = {"base": "extalife_group_stale"}
+                if members:
+                    current.append({**group, GROUP_CHANNELS: members})
+            groups = current
+
+        if user_input is not None:
+            keep = user_input.get(OPTIONS_GROUP_LIST, [])
+            groups = [group for group in groups if group[GROUP_ID] in keep]
+
+            name = user_input.get(GROUP_NAME)
+            members = user_input.get(GROUP_CHANNELS, [])
+            if name or members:
+                platforms = {channels[channel_id][0] for channel_id in members}
+                if not name or not members:
+                    errors = {"base": "extalife_group_incomplete"}
+                elif len(platforms) != 1:
+                    errors = {"base": "extalife_group_mixed"}
+                else:
+                    groups = groups + [
+                        {GROUP_ID: uuid4().hex, GROUP_NAME: name, GROUP_PLATFORM: platforms.pop(), GROUP_CHANNELS: members}
+                    ]
+
+            self.options[OPTIONS_GROUP] = {OPTIONS_GROUP_LIST: groups}
+            if not errors and not name:
+                return await self.async_step_binding()
+
+        return self.async_show_form(
+            step_id="group",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(OPTIONS_GROUP_LIST, default=[group[GROUP_ID] for group in groups]): cv.multi_select(
+                        {group[GROUP_ID]: group[GROUP_NAME] for group in groups}
+                    ),
+                    vol.Optional(GROUP_NAME): str,
+                    vol.Optional(GROUP_CHANNELS, default=[]): cv.multi_select(
+                        {channel_id: f"{alias} ({channel_id})" for channel_id, (platform, alias) in channels.items()}
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_binding(self, user_input=None):
+        """Transmitter buttons bound to channel actions, executed by the integration itself.
+        Unchecking a binding removes it; a new binding is added by selecting its transmitter and channel,
+        then the step is shown again to add another one"""
+        from .helpers.binding import BINDING_ACTIONS, BINDING_GESTURES
+        from .helpers.core import Core
+        from .helpers.group import get_groupable_channels
+
+        core = Core.get(self._entry_id)
+        channels = get_groupable_channels(core) if core is not None else {}
+        transmitters = {}
+        if core is not None:
+            manager = core.data_manager
+            for channel_id, platform in manager.discovered_channels.items():
+                if platform == DOMAIN_TRANSMITTER and channel_id in manager.channels_indx:
+                    transmitters[channel_id] = f"{manager.channels_indx[channel_id].get('alias')} ({channel_id})"
+        bindings = self.options.get(OPTIONS_BINDING, {}).get(OPTIONS_BINDING_LIST, [])
+        actions = sorted({action for platform_actions in BINDING_ACTIONS.values() for action in platform_actions})
+        errors = {}
+
+        if core is not None:
+            # transmitters or channels of devices removed from the controller after the bindings were defined
+            current = [
+                binding for binding in bindings
+                if binding[BINDING_TRANSMITTER] in transmitters and binding[BINDING_CHANNEL] in channels
+            ]
+            if len(current) != len(bindings) and user_input is None:
+                errors = {"base": "extalife_binding_stale"}
+            bindings = current
+
+        if user_input is not None:
+            keep = user_input.get(OPTIONS_BINDING_LIST, [])
+            bindings = [binding for binding in bindings if binding[BINDING_ID] in keep]
+
+            transmitter = user_input.get(BINDING_TRANSMITTER)
+            channel_id = user_input.get(BINDING_CHANNEL)
+            if transmitter or channel_id:
+                action = user_input.get(BINDING_ACTION)
+                if not transmitter or not channel_id or user_input.get(BINDING_BUTTON) is None:
+                    errors = {"base": "extalife_binding_incomplete"}
+                elif action not in BINDING_ACTIONS[channels[channel_id][0]]:
+                    errors = {"base": "extalife_binding_action"}
+                else:
+                    bindings = bindings + [
+                        {
+                            BINDING_ID: uuid4().hex,
+                            BINDING_TRANSMITTER: transmitter,
+                            BINDING_BUTTON: user_input[BINDING_BUTTON],
+                            BINDING_GESTURE: user_input[BINDING_GESTURE],
+                            BINDING_CHANNEL: channel_id,
+                            BINDING_ACTION: action,
+                        }
+                    ]
+
+            self.options[OPTIONS_BINDING] = {OPTIONS_BINDING_LIST: bindings}
+            if not errors and not transmitter and not channel_id:
+                return self.async_create_entry(title="Exta Life Options", data=self.options)
+
+        return self.async_show_form(
+            step_id="binding",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(OPTIONS_BINDING_LIST, default=[binding[BINDING_ID] for binding in bindings]): cv.multi_select(
+                        {
+                            binding[BINDING_ID]: f"{binding[BINDING_TRANSMITTER]} / {binding[BINDING_BUTTON]} / "
+                            f"{binding[BINDING_GESTURE]} -> {binding[BINDING_CHANNEL]}: {binding[BINDING_ACTION]}"
+                            for binding in bindings
+                        }
+                    ),
+                    vol.Optional(BINDING_TRANSMITTER): vol.In(transmitters),
+                    vol.Optional(BINDING_BUTTON, default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=36)),
+                    vol.Optional(BINDING_GESTURE, default=TRIGGER_BUTTON_DOWN): vol.In(BINDING_GESTURES),
+                    vol.Optional(BINDING_CHANNEL): vol.In(
+                        {channel_id: f"{alias} ({channel_id})" for channel_id, (platform, alias) in channels.items()}
+                    ),
+                    vol.Optional(BINDING_ACTION, default=BINDING_ACTION_TOGGLE): vol.In(actions),
+                }
+            ),
+            errors=errors,
+        )
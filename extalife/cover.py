@@ -1,6 +1,5 @@
 """Support for Exta Life roller shutters: SRP, SRM, ROB(future)"""
 import logging
-from pprint import pformat
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.cover import (
@@ -15,6 +14,7 @@ from homeassistant.helpers.typing import HomeAssistantType
 from . import ExtaLifeChannel
 from .helpers.const import OPTIONS_COVER_INVERTED_CONTROL, DOMAIN_VIRTUAL_COVER_SENSOR
 from .helpers.core import Core
+from .helpers.group import ExtaLifeGroup, get_groups
 from .pyextalife import ExtaLifeAPI, MODEL_ROB01, DEVICE_MAP_TYPE_TO_MODEL, DEVICE_ARR_COVER, DEVICE_ARR_SENS_GATE_CONTROLLER   # pylint: disable=syntax-error
 
 GATE_CHN_TYPE_GATE = 0
@@ -32,12 +32,11 @@ async def async_setup_entry(hass: HomeAssistantType, config_entry: ConfigEntry,
     """Set up Exta Life covers based on existing config."""
 
     core = Core.get(config_entry.entry_id)
-    channels = core.get_channels(DOMAIN_COVER)
+    core.async_setup_platform_entities(
+        DOMAIN_COVER, async_add_entities, lambda device: ExtaLifeCover(device, config_entry)
+    )
 
-    _LOGGER.debug("Discovery: %s", pformat(channels))
-    async_add_entities([ExtaLifeCover(device, config_entry) for device in channels])
-
-    core.pop_channels(DOMAIN_COVER)
+    async_add_entities([ExtaLifeCoverGroup(group, config_entry) for group in get_groups(config_entry, DOMAIN_COVER)])
 
 class ExtaLifeCover(ExtaLifeChannel, CoverEntity):
     """Representation of ExtaLife Cover"""
@@ -94,14 +93,11 @@ class ExtaLifeCover(ExtaLifeChannel, CoverEntity):
 
     async def async_set_cover_position(self, **kwargs):
         """Move the cover to a specific position."""
-        data = self.channel_data
         pos = int(kwargs.get(ATTR_POSITION))
         value = pos if self.is_inverted_control else 100-pos
 
         _LOGGER.debug("set_cover_position for cover: %s. From HA: %s, model: %s", self.entity_id, pos, value)
-        if await self.async_action(ExtaLifeAPI.ACTN_SET_POS, value=value):
-            data["value"] = value
-            self.async_schedule_update_ha_state()
+        await self.async_action_optimistic(ExtaLifeAPI.ACTN_SET_POS, {"value": value}, value=value)
 
     @property
     def is_inverted_control(self):
@@ -124,31 +120,25 @@ class ExtaLifeCover(ExtaLifeChannel, CoverEntity):
 
     async def async_open_cover(self, **kwargs):
         """Open the cover."""
-        data = self.channel_data
         pos  = 1 if self.device_class == CoverDeviceClass.GATE or self.device_class == CoverDeviceClass.DOOR else  ExtaLifeCover.POS_OPEN  #ROB-21 to open 'pos' must be different from 0
         if not self.is_exta_free:
             action = ExtaLifeAPI.ACTN_SET_POS if self.device_class != CoverDeviceClass.GATE and self.device_class != CoverDeviceClass.DOOR else ExtaLifeAPI.ACTN_SET_GATE_POS
-            if await self.async_action(action, value=pos):
-                data["value"] = pos
-                _LOGGER.debug("open_cover for cover: %s. model: %s", self.entity_id, pos)
-                self.async_schedule_update_ha_state()
+            _LOGGER.debug("open_cover for cover: %s. model: %s", self.entity_id, pos)
+            await self.async_action_optimistic(action, {"value": pos}, value=pos)
         else:
-            if await self.async_action(ExtaLifeAPI.ACTN_EXFREE_UP_PRESS) and await self.async_action(ExtaLifeAPI.ACTN_EXFREE_UP_RELEASE):
+            if await self.async_action_press_release(ExtaLifeAPI.ACTN_EXFREE_UP_PRESS):
                 self.async_schedule_update_ha_state()
 
     async def async_close_cover(self, **kwargs):
         """Close the cover."""
-        data = self.channel_data
         pos = ExtaLifeCover.POS_CLOSED
         if not self.is_exta_free:
             action = ExtaLifeAPI.ACTN_SET_POS if self.device_class != CoverDeviceClass.GATE and self.device_class != CoverDeviceClass.DOOR else ExtaLifeAPI.ACTN_SET_GATE_POS
-            if await self.async_action(action, value=pos):
-                data["value"] = pos
-                _LOGGER.debug("close_cover for cover: %s. model: %s", self.entity_id, pos)
-                self.async_schedule_update_ha_state()
+            _LOGGER.debug("close_cover for cover: %s. model: %s", self.entity_id, pos)
+            await self.async_action_optimistic(action, {"value": pos}, value=pos)
 
         elif DEVICE_MAP_TYPE_TO_MODEL.get(self.channel_data.get("type")) != MODEL_ROB01:    # ROB-01 supports only 1 toggle mode using 1 command
-            if await self.async_action(ExtaLifeAPI.ACTN_EXFREE_DOWN_PRESS) and await self.async_action(ExtaLifeAPI.ACTN_EXFREE_DOWN_RELEASE):
+            if await self.async_action_press_release(ExtaLifeAPI.ACTN_EXFREE_DOWN_PRESS):
                 self.async_schedule_update_ha_state()
 
     async def async_stop_cover(self, **kwargs):
@@ -170,3 +160,48 @@ class ExtaLifeCover(ExtaLifeChannel, CoverEntity):
             # synchronize DataManager data with processed update & entity data
             self.sync_data_update_ha()
 
+
+class ExtaLifeCoverGroup(ExtaLifeGroup, CoverEntity):
+    """Native group of Exta Life roller shutters"""
+
+    _attr_device_class = CoverDeviceClass.SHUTTER
+    _attr_supported_features = CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.SET_POSITION | CoverEntityFeature.STOP
+
+    @property
+    def is_inverted_control(self):
+        return self.config_entry.options.get(DOMAIN_COVER).get(OPTIONS_COVER_INVERTED_CONTROL, False)
+
+    @property
+    def current_cover_position(self):
+        """Mean position of members. 0 is closed, 100 is open."""
+        values = [data.get("value") for channel_id, data in self.members_data if data.get("value") is not None]
+        if not values:
+            return None
+        val = sum(values) / len(values)
+        return round(val if self.is_inverted_control else 100-val)
+
+    @property
+    def is_closed(self):
+        """Return true if all members are closed"""
+        values = [data.get("value") for channel_id, data in self.members_data if data.get("value") is not None]
+        if not values:
+            return None
+        return all(value == ExtaLifeCover.POS_CLOSED for value in values)
+
+    async def async_set_cover_position(self, **kwargs):
+        """Move all members to a specific position."""
+        pos = int(kwargs.get(ATTR_POSITION))
+        value = pos if self.is_inverted_control else 100-pos
+        await self.async_action_members(ExtaLifeAPI.ACTN_SET_POS, lambda data: {"value": value})
+
+    async def async_open_cover(self, **kwargs):
+        """Open all members."""
+        await self.async_action_members(ExtaLifeAPI.ACTN_SET_POS, lambda data: {"value": ExtaLifeCover.POS_OPEN})
+
+    async def async_close_cover(self, **kwargs):
+        """Close all members."""
+        await self.async_action_members(ExtaLifeAPI.ACTN_SET_POS, lambda data: {"value": ExtaLifeCover.POS_CLOSED})
+
+    async def async_stop_cover(self, **kwargs):
+        """Stop all members."""
+        await self.async_action_members(ExtaLifeAPI.ACTN_STOP)
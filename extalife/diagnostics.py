@@ -0,0 +1,40 @@
+"""Diagnostics support for Exta Life"""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.typing import HomeAssistantType
+
+from .helpers.const import CONF_PASSWORD, CONF_USER
+from .helpers.core import Core
+
+TO_REDACT = {CONF_USER, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistantType, config_entry: ConfigEntry) -> dict:
+    """Return diagnostics of a config entry: controller info and instrumentation data"""
+    core = Core.get(config_entry.entry_id)
+    api = core.api
+    reconnect = core.reconnect_manager
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(config_entry.data), TO_REDACT),
+            "options": dict(config_entry.options),
+        },
+        "controller": {
+            "host": api.host,
+            "mac": api.mac,
+            "name": api.name,
+            "software_version": api.sw_version,
+            "connected": api.is_connected,
+        },
+        "reconnect": {
+            "reconnects": reconnect.reconnects,
+            "failed_attempts": reconnect.failed_attempts,
+            "last_attempts": reconnect.last_attempts,
+            "last_reconnect_time": reconnect.last_reconnect_time,
+            "max_reconnect_time": reconnect.max_reconnect_time,
+        },
+        "connection": api.stats.as_dict(),
+        "data_manager": core.data_manager.stats_as_dict(),
+        "button_bindings": core.bindings.stats.as_dict(),
+    }
@@ -0,0 +1,134 @@
+""" Local bindings of transmitter buttons to channel actions """
+import logging
+import time
+
+from homeassistant.components.cover import DOMAIN as DOMAIN_COVER
+from homeassistant.components.light import DOMAIN as DOMAIN_LIGHT
+from homeassistant.components.switch import DOMAIN as DOMAIN_SWITCH
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+
+from .const import (
+    BINDING_ACTION,
+    BINDING_ACTION_CLOSE,
+    BINDING_ACTION_OPEN,
+    BINDING_ACTION_STOP,
+    BINDING_ACTION_TOGGLE,
+    BINDING_ACTION_TURN_OFF,
+    BINDING_ACTION_TURN_ON,
+    BINDING_BUTTON,
+    BINDING_CHANNEL,
+    BINDING_GESTURE,
+    BINDING_TRANSMITTER,
+    OPTIONS_BINDING,
+    OPTIONS_BINDING_LIST,
+    TRIGGER_BUTTON_DOUBLE_CLICK,
+    TRIGGER_BUTTON_DOWN,
+    TRIGGER_BUTTON_LONG_PRESS,
+    TRIGGER_BUTTON_SINGLE_CLICK,
+    TRIGGER_BUTTON_TRIPLE_CLICK,
+    TRIGGER_BUTTON_UP,
+)
+from ..pyextalife import ExtaLifeAPI, LatencyStats, TCPConnError
+
+_LOGGER = logging.getLogger(__name__)
+
+BINDING_GESTURES = (
+    TRIGGER_BUTTON_DOWN,
+    TRIGGER_BUTTON_UP,
+    TRIGGER_BUTTON_SINGLE_CLICK,
+    TRIGGER_BUTTON_DOUBLE_CLICK,
+    TRIGGER_BUTTON_TRIPLE_CLICK,
+    TRIGGER_BUTTON_LONG_PRESS,
+)
+
+# actions available for channels of a platform
+BINDING_ACTIONS = {
+    DOMAIN_SWITCH: (BINDING_ACTION_TOGGLE, BINDING_ACTION_TURN_ON, BINDING_ACTION_TURN_OFF),
+    DOMAIN_LIGHT: (BINDING_ACTION_TOGGLE, BINDING_ACTION_TURN_ON, BINDING_ACTION_TURN_OFF),
+    DOMAIN_COVER: (BINDING_ACTION_OPEN, BINDING_ACTION_CLOSE, BINDING_ACTION_STOP),
+}
+
+
+def get_bindings(config_entry: ConfigEntry) -> list:
+    """Return binding definitions from options"""
+    return config_entry.options.get(OPTIONS_BINDING, {}).get(OPTIONS_BINDING_LIST, [])
+
+
+class ButtonBindings:
+    """Transmitter button -> channel action bindings defined in options. A bound action is executed right
+    in the status notification handler, instead of going through the HA event bus, a device trigger
+    automation, a service call and the entity"""
+
+    def __init__(self, core):
+        self._core = core
+        self._bindings = {}  # (transmitter channel id, button, gesture): [binding]
+
+        # instrumentation: time from the button notification to the controller's response to the bound action
+        self.stats = LatencyStats()
+
+    def __bool__(self) -> bool:
+        return bool(self._bindings)
+
+    def load(self, config_entry: ConfigEntry):
+        """(Re)build the binding table from options"""
+        self._bindings = {}
+        for binding in get_bindings(config_entry):
+            key = (binding[BINDING_TRANSMITTER], binding[BINDING_BUTTON], binding[BINDING_GESTURE])
+            self._bindings.setdefault(key, []).append(binding)
+
+    @callback
+    def on_button_event(self, transmitter_id: str, button: int, gesture: str) -> bool:
+        """Execute actions bound to the button gesture. Returns True if there was any"""
+        bindings = self._bindings.get((transmitter_id, button, gesture))
+        if not bindings:
+            return False
+
+        started = time.monotonic()
+        for binding in bindings:
+            self._core.hass.async_create_task(self._async_execute(binding, started))
+        return True
+
+    async def _async_execute(self, binding: dict, started: float):
+        channel_id = binding[BINDING_CHANNEL]
+        manager = self._core.data_manager
+        data = manager.channels_indx.get(channel_id)
+        if data is None:
+            _LOGGER.warning("Channel %s of button binding does not exist", channel_id)
+            return
+
+        action, fields = self._get_command(binding[BINDING_ACTION], manager.discovered_channels.get(channel_id), data)
+        _LOGGER.debug("Button binding %s: executing action %s on channel %s", binding, action, channel_id)
+        try:
+            resp = await self._core.api.async_execute_action(action, channel_id, **fields)
+        except TCPConnError as err:
+            _LOGGER.error(err.data)
+            resp = None
+        if resp is None:
+            _LOGGER.warning("Action %s of button binding could not be executed on channel %s", action, channel_id)
+            return
+
+        self.stats.add(time.monotonic() - started)
+
+    @staticmethod
+    def _get_command(binding_action: str, platform: str, data: dict) -> tuple:
+        """Return (action, fields of control command) for the bound action. State notification
+        from the controller updates the entity afterwards"""
+        from ..light import get_state_fields
+        from ..switch import is_switch_on
+
+        if binding_action == BINDING_ACTION_TOGGLE:
+            binding_action = BINDING_ACTION_TURN_OFF if is_switch_on(data) else BINDING_ACTION_TURN_ON
+
+        if binding_action in (BINDING_ACTION_TURN_ON, BINDING_ACTION_TURN_OFF):
+            action = ExtaLifeAPI.ACTN_TURN_ON if binding_action == BINDING_ACTION_TURN_ON else ExtaLifeAPI.ACTN_TURN_OFF
+            # lights keep their mode, colour and brightness
+            return action, get_state_fields(data) if platform == DOMAIN_LIGHT else {}
+
+        if binding_action == BINDING_ACTION_STOP:
+            return ExtaLifeAPI.ACTN_STOP, {}
+
+        from ..cover import ExtaLifeCover
+
+        value = ExtaLifeCover.POS_OPEN if binding_action == BINDING_ACTION_OPEN else ExtaLifeCover.POS_CLOSED
+        return ExtaLifeAPI.ACTN_SET_POS, {"value": value}
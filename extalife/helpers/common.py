@@ -16,7 +16,7 @@ from ..pyextalife import (
     PRODUCT_MANUFACTURER,
     PRODUCT_SERIES,
 )
-from .const import DOMAIN as DOMAIN, SIGNAL_NOTIF_STATE_UPDATED
+from .const import DOMAIN as DOMAIN, SIGNAL_NOTIF_STATE_UPDATED, SIGNAL_CHANNEL_REMOVED
 
 from .device import Device
 
@@ -79,6 +79,10 @@ class PseudoPlatform():
     def get_notif_upd_signal(ch_id):
         return f"{SIGNAL_NOTIF_STATE_UPDATED}_{ch_id}"
 
+    @staticmethod
+    def get_remove_signal(ch_id):
+        return f"{SIGNAL_CHANNEL_REMOVED}_{ch_id}"
+
     async def async_added_to_hass(self):
         pass
 
@@ -6,6 +6,7 @@ DOMAIN = "extalife"
 DATA_CORE = "core"
 
 CONF_CONTROLLER_IP = "controller_ip"
+CONF_CONTROLLER_MAC = "controller_mac"
 CONF_USER = "user"
 CONF_PASSWORD = "password"
 CONF_POLL_INTERVAL = "poll_interval"  # in minutes
@@ -13,6 +14,8 @@ DEFAULT_POLL_INTERVAL = 5
 
 OPTIONS_GENERAL_POLL_INTERVAL = "poll_interval"
 OPTIONS_GENERAL_DISABLE_NOT_RESPONDING = "disable_not_responding"
+OPTIONS_GENERAL_CONFIRM_TIMEOUT = "confirm_timeout"  # in seconds
+DEFAULT_CONFIRM_TIMEOUT = 5
 OPTIONS_LIGHT_ICONS_LIST = "icons_list"
 OPTIONS_COVER_INVERTED_CONTROL = "inverted_control"
 
@@ -25,10 +28,39 @@ OPTIONS_LIGHT_ICONS_LIST = (
 )
 OPTIONS_COVER = "cover"  # additional cover configuration
 OPTIONS_COVER_INV_CONTROL = "inverted_control"
+OPTIONS_GROUP = "group"  # native groups of channels
+OPTIONS_GROUP_LIST = "groups"  # list of group definitions, see GROUP_*
+
+# group definition fields
+GROUP_ID = "id"
+GROUP_NAME = "name"
+GROUP_PLATFORM = "platform"  # platform of all member channels
+GROUP_CHANNELS = "channels"  # member channel ids
+OPTIONS_BINDING = "binding"  # local transmitter button bindings
+OPTIONS_BINDING_LIST = "bindings"  # list of binding definitions, see BINDING_*
+
+# binding definition fields
+BINDING_ID = "id"
+BINDING_TRANSMITTER = "transmitter"  # transmitter channel id
+BINDING_BUTTON = "button"
+BINDING_GESTURE = "gesture"  # one of TRIGGER_BUTTON_*
+BINDING_CHANNEL = "channel"  # target channel id
+BINDING_ACTION = "action"  # one of BINDING_ACTION_*
+
+BINDING_ACTION_TOGGLE = "toggle"
+BINDING_ACTION_TURN_ON = "turn_on"
+BINDING_ACTION_TURN_OFF = "turn_off"
+BINDING_ACTION_OPEN = "open"
+BINDING_ACTION_CLOSE = "close"
+BINDING_ACTION_STOP = "stop"
 
 # signals
 SIGNAL_DATA_UPDATED = f"{DOMAIN}_data_updated"
 SIGNAL_NOTIF_STATE_UPDATED = f"{DOMAIN}_notif_state_updated"
+SIGNAL_CONNECTION_STATE = f"{DOMAIN}_connection_state"
+SIGNAL_CHANNEL_DATA_UPDATED = f"{DOMAIN}_channel_data_updated"
+SIGNAL_CHANNEL_REMOVED = f"{DOMAIN}_channel_removed"
+SIGNAL_CHANNEL_STATE_STORED = f"{DOMAIN}_channel_state_stored"
 
 
 # transmitters
@@ -56,6 +88,7 @@ VIRT_SENSOR_DEV_CLS = "device_class"
 VIRT_SENSOR_UNIT = "unit"
 VIRT_SENSOR_FACTOR = "factor"
 VIRT_SENSOR_NAME_SUFFIX = "name_suffix"
+VIRT_SENSOR_ENABLED_DEFAULT = "enabled_default"
 
 # virtual sensor channel data field
 VIRT_SENSOR_CHN_FIELD = "_virtual_sensor"
@@ -2,6 +2,7 @@ import asyncio
 import logging
 import importlib
 import datetime
+from pprint import pformat
 from typing import Callable, Any
 from homeassistant.helpers.event import async_track_time_interval
 import homeassistant.helpers.entity_registry as er
@@ -10,7 +11,7 @@ from homeassistant.helpers.typing import HomeAssistantType, ConfigType
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 
-from .const import DATA_CORE, DOMAIN, CONF_EXTALIFE_EVENT_SCENE
+from .const import DATA_CORE, DOMAIN, CONF_EXTALIFE_EVENT_SCENE, CONF_CONTROLLER_MAC, SIGNAL_CONNECTION_STATE, OPTIONS_GROUP, DOMAIN_VIRTUAL_SENSORS
 from ..pyextalife import ExtaLifeAPI
 from .typing import (
     TransmitterManagerType,
@@ -20,6 +21,9 @@ from .typing import (
     CoreType,
 )
 from .services import ExtaLifeServices
+from .reconnect import ReconnectManager
+from .scheduler import PollScheduler
+from .binding import ButtonBindings
 
 
 MAP_NOTIF_CMD_TO_EVENT = {
@@ -34,14 +38,24 @@ async def options_change_callback(hass, config_entry: ConfigEntry):
     """Options update listener"""
 
     core = Core.get(config_entry.entry_id)
+
+    # group entities are created during platform setup
+    if config_entry.options.get(OPTIONS_GROUP) != core.group_options:
+        await hass.config_entries.async_reload(config_entry.entry_id)
+        return
+
+    core.bindings.load(config_entry)
     core.data_manager.setup_periodic_callback()
 
 
 class Core:
 
+    # shared by all controllers (config entries)
     _inst = dict()
     _hass: HomeAssistantType = None
     _services: ExtaLifeServices = None
+    _poll_scheduler: PollScheduler = None
+    _stop_listener_remove = None
 
     _is_stopping = False
 
@@ -49,16 +63,32 @@ class Core:
     def create(cls, hass: HomeAssistantType, config_entry: ConfigEntry):
         """Create Core instance for a given Config Entry"""
         cls._hass = hass
+        if cls._poll_scheduler is None:
+            cls._poll_scheduler = PollScheduler(hass)
         inst = Core(config_entry)
+        inst._options_change_remove_callback = config_entry.add_update_listener(
+            options_change_callback
+        )
 
         hass.data[DOMAIN][DATA_CORE] = cls._inst
 
-        # register callback for HomeAssistant Stop event
-        cls._hass.bus.async_listen_once(
-            EVENT_HOMEASSISTANT_STOP, cls._on_homeassistant_stop
-        )
+        # register callback for HomeAssistant Stop event - once, it handles all instances
+        if cls._stop_listener_remove is None:
+            cls._stop_listener_remove = cls._hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STOP, cls._on_homeassistant_stop
+            )
         return inst
 
+    @classmethod
+    def create_with_api(
+        cls, hass: HomeAssistantType, config_entry: ConfigEntry, api: ExtaLifeAPI
+    ) -> "Core":
+        """Create Core instance for a given Config Entry using an existing controller API object.
+        The instance is not registered in Home Assistant (no options listener, stop listener, polling)
+        and the API connection callbacks are left untouched - used by tools, e.g. benchmarks"""
+        cls._hass = hass
+        return Core(config_entry, api)
+
     @classmethod
     def get(cls, entry_id: ConfigEntry.entry_id) -> "Core":  # forward
         """Get instance of the Core object based on Config Entry ID"""
@@ -69,7 +99,7 @@ class Core:
         """Return HomeAssistantType instance"""
         return cls._hass
 
-    def __init__(self, config_entry: ConfigEntry):
+    def __init__(self, config_entry: ConfigEntry, api: ExtaLifeAPI = None):
         """initialize instance"""
         from .device import DeviceManager
         from ..transmitter import TransmitterManager
@@ -80,7 +110,7 @@ class Core:
         self._config_entry = config_entry
         self._dev_manager = DeviceManager(config_entry, self)
         self._transmitter_manager = TransmitterManager(config_entry)
-        self._api = ExtaLifeAPI(
+        self._api = api or ExtaLifeAPI(
             self.hass.loop,
             on_connect_callback=self._on_reconnect_callback,
             on_disconnect_callback=self._on_disconnect_callback,
@@ -89,20 +119,26 @@ class Core:
         self._track_time_callbacks = []
         self._platforms = dict()
         self._platforms_cust = dict()
+        self._platform_adders = dict()   # platform: (async_add_entities, entity factory)
         self._data_manager = ChannelDataManager(self.hass, self.config_entry)
         self._api.set_notification_callback(self._on_status_notification_callback)
+        self._api.set_mac(config_entry.data.get(CONF_CONTROLLER_MAC))
         self._queue = asyncio.Queue()
         self._queue_task = Core.get_hass().loop.create_task(self._queue_worker())
         self._signals = {}
 
-        self._periodic_reconnect_remove_callback = None
+        self._reconnect = ReconnectManager(self)
 
-        self._options_change_remove_callback = config_entry.add_update_listener(
-            options_change_callback
-        )
+        self._options_change_remove_callback = None
 
         self._controller_entity: Entity = None
 
+        # group definitions the entities were created for
+        self._group_options = config_entry.options.get(OPTIONS_GROUP)
+
+        self._bindings = ButtonBindings(self)
+        self._bindings.load(config_entry)
+
         self._storage = {}
 
         self._is_unloading = False
@@ -117,8 +153,9 @@ class Core:
         await self.api.disconnect()
 
         # unload services when the last entry is unloaded
-        if len(self._inst) == 1 and self._services:
-            await self._services.async_unregister_services()
+        if len(self._inst) == 1 and Core._services:
+            await Core._services.async_unregister_services()
+            Core._services = None
 
         for platform in self._platforms:
             await self.hass.config_entries.async_forward_entry_unload(
@@ -126,21 +163,26 @@ class Core:
             )
 
         await self.async_unload_custom_platforms()
+        self._platform_adders = dict()
 
         # remove instance only after everything is unloaded
         self._inst.pop(self.config_entry.entry_id)
 
+        if not self._inst and Core._stop_listener_remove is not None:
+            Core._stop_listener_remove()
+            Core._stop_listener_remove = None
+
     @classmethod
     async def _on_homeassistant_stop(cls, event):
         """Called when Home Assistant is shutting down"""
         cls._is_stopping = True
+        cls._stop_listener_remove = None
 
         await cls._callbacks_cleanup()
         for inst in cls._inst.values():
-            await Core._callbacks_cleanup(inst.config_entry.entry_id)
             await inst.data_manager.async_stop_polling()
 
-            inst.api.disconnect()
+            await inst.api.disconnect()
 
     @classmethod
     async def _callbacks_cleanup(cls, entry_id=None):
@@ -155,8 +197,7 @@ class Core:
             inst.unregister_signal_callbacks()
             inst.unregister_track_time_callbacks()
 
-            if inst._periodic_reconnect_remove_callback:
-                inst._periodic_reconnect_remove_callback()
+            await inst._reconnect.async_stop()
 
             if inst._options_change_remove_callback:
                 inst._options_change_remove_callback()
@@ -169,20 +210,25 @@ class Core:
 
     async def async_register_services(self):
         """ " Register services, but only once"""
-        if self._services is None:
-            self._services = ExtaLifeServices(self._hass)
-            await self._services.async_register_services()
+        if Core._services is None:
+            Core._services = ExtaLifeServices(self._hass)
+            await Core._services.async_register_services()
 
     def _on_reconnect_callback(self):
         """Execute actions on (re)connection to controller"""
 
-        if self._periodic_reconnect_remove_callback is not None:
-            self._periodic_reconnect_remove_callback()
-
         # Update controller sotware info
         if self._controller_entity is not None:
             self._controller_entity.schedule_update_ha_state()
 
+        # entities become available again
+        self.hass.loop.call_soon_threadsafe(self.async_signal_send, SIGNAL_CONNECTION_STATE)
+
+        # catch up with state changes missed while disconnected. Initial connection is
+        # followed by regular polling, so there's nothing to resync yet
+        if self._data_manager.channels_indx:
+            self.hass.add_job(self._data_manager.async_resync)
+
     def _on_disconnect_callback(self):
         """Execute actions on disconnection with controller"""
 
@@ -193,28 +239,51 @@ class Core:
         if self._controller_entity is not None:
             self._controller_entity.schedule_update_ha_state()
 
-        # need to schedule periodic reconnection attempt
-        if self._periodic_reconnect_remove_callback is not None:
-            self._periodic_reconnect_remove_callback()
-        self._periodic_reconnect_remove_callback = self.async_track_time_interval(
-            self._periodic_reconnect_callback, datetime.timedelta(seconds=30)
-        )
+        # make entities unavailable without waiting for the next poll
+        self.hass.loop.call_soon_threadsafe(self.async_signal_send, SIGNAL_CONNECTION_STATE)
+
+        # start reconnection attempts; this is a no-op if they're already running
+        self.hass.loop.call_soon_threadsafe(self._reconnect.start)
 
     def _on_status_notification_callback(self, msg):
         if self._is_unloading or self._is_stopping:
             return
 
-        # forward only state notifications to data manager to update channels
-        if msg.get("command") == self.api.CMD_CONTROL_DEVICE:
+        # forward only state and scene notifications to data manager to update channels / discover scenes
+        command = msg.get("command")
+        if command == self.api.CMD_CONTROL_DEVICE:
+            # drop notifications nobody listens to (repeaters, unsupported or not yet discovered devices)
+            # before any signal or event is built for them
+            if not self._data_manager.is_subscribed(msg.get("data")):
+                return
             self._data_manager.on_notify(msg)
+        elif command == self.api.CMD_ACTIVATE_SCENE:
+            self._data_manager.on_scene_notify(msg)
 
         self._put_notification_on_event_bus(msg)
 
 
-    async def _periodic_reconnect_callback(self, now):
-        """Reconnect with the controller after connection is lost
-        This will be executed periodically until reconnection is successfull"""
-        await self.api.async_reconnect()
+    async def async_verify_mac(self):
+        """Store the MAC known by API (resolved on connect) in Config Entry on the 1st connection.
+        Later resolve it in the background and compare it with the stored one"""
+        stored = self.config_entry.data.get(CONF_CONTROLLER_MAC)
+        if stored is None:
+            # API already resolved it on connect if it could - no need for another ARP lookup
+            if self.api.mac is not None:
+                self.hass.config_entries.async_update_entry(
+                    self.config_entry, data={**self.config_entry.data, CONF_CONTROLLER_MAC: self.api.mac}
+                )
+            return
+
+        mac = await self.api.async_get_mac()
+        if mac is not None and stored != mac:
+            # keep the stored MAC - it identifies controller device and entities in registries
+            _LOGGER.warning(
+                "Controller MAC resolved for IP %s: %s differs from the stored one: %s",
+                self.api.host,
+                mac,
+                stored,
+            )
 
     async def register_controller(self):
         """Register controller in Device Registry and create its entity"""
@@ -242,6 +311,22 @@ class Core:
     def set_data_manager(self, manager: ChannelDataManagerType):
         self._poller = manager
 
+    @property
+    def bindings(self) -> ButtonBindings:
+        return self._bindings
+
+    @property
+    def group_options(self) -> dict:
+        return self._group_options
+
+    @property
+    def poll_scheduler(self) -> PollScheduler:
+        return Core._poll_scheduler
+
+    @property
+    def reconnect_manager(self) -> ReconnectManager:
+        return self._reconnect
+
     @property
     def data_manager(self) -> "ChannelDataManager":
         return self._data_manager
@@ -251,7 +336,7 @@ class Core:
         return self._config_entry
 
     @property
-    def hass(self) -> HomeAssistantType():
+    def hass(self) -> HomeAssistantType:
         return Core._hass
 
     @property
@@ -307,6 +392,35 @@ class Core:
         else:
             self._platforms[platform] = []
 
+    def async_setup_platform_entities(self, platform: str, async_add_entities: Callable, factory: Callable):
+        """Called by platform setup. Keep platform's async_add_entities callback, so that entities
+        for devices discovered later are added directly without setting up the platform again,
+        and add entities for channels stored for the platform setup
+
+        factory - creates entity from channel data"""
+        self._platform_adders[platform] = (async_add_entities, factory)
+
+        channels = self.get_channels(platform)
+        self.pop_channels(platform)
+        self.async_add_channels(platform, channels)
+
+    def is_platform_setup(self, platform: str) -> bool:
+        """Can entities of the platform be added by async_add_channels?"""
+        return platform in self._platform_adders
+
+    def async_add_channels(self, platform: str, channels: list) -> bool:
+        """Add entities of channels to already set up platform.
+        Returns False if the platform is not set up yet"""
+        adder = self._platform_adders.get(platform)
+        if adder is None:
+            return False
+
+        _LOGGER.debug("Discovery (%s): %s", platform, pformat(channels))
+        if channels:
+            async_add_entities, factory = adder
+            async_add_entities([factory(channel) for channel in channels])
+        return True
+
     async def async_setup_custom_platforms(self, module):
         """Setup other, custom (pseudo)platforms"""
 
@@ -320,6 +434,9 @@ class Core:
         """Unload other, custom (pseudo)platforms"""
         package = ".".join(__package__.split(".")[:-1])  # 1 level above current package
         for platform, channels in self._platforms_cust.items():
+            # virtual sensor channels are set up by the sensor platform, there's no module to unload
+            if platform in DOMAIN_VIRTUAL_SENSORS:
+                continue
             module = importlib.import_module("." + platform, package=package)
             func = getattr(module, "async_unload_entry")
             await func(self._hass, self.config_entry)
@@ -328,10 +445,10 @@ class Core:
         self._storage.update({id: inst})
 
     def storage_get(self, id):
-        self._storage.get(id)
+        return self._storage.get(id)
 
     def storage_remove(self, id):
-        self._storage.pop(id)
+        self._storage.pop(id, None)
 
     def async_track_time_interval(self, callback, interval: datetime.timedelta):
         """Add a listener that fires repetitively at every timedelta interval."""
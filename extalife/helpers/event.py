@@ -60,6 +60,7 @@ class ExtaLifeTransmitterEventProcessor(ExtaLifeEventProcessor):
         # assumption: data fields in JSON protocol: button & state
         button = data.get('button')
         state = data.get('state')
+        transmitter_id = f"{data.get('id')}-{data.get('channel', '#')}"
 
         event_data = {
             CONF_EXTALIFE_EVENT_UNIQUE_ID: self._device.event.unique_id,
@@ -67,9 +68,9 @@ class ExtaLifeTransmitterEventProcessor(ExtaLifeEventProcessor):
             }
 
         if state == 1:
-            event_data[CONF_TYPE]  = TRIGGER_BUTTON_DOWN
+            event_data[TRIGGER_TYPE]  = TRIGGER_BUTTON_DOWN
         else:
-            event_data[CONF_TYPE]  = TRIGGER_BUTTON_UP
+            event_data[TRIGGER_TYPE]  = TRIGGER_BUTTON_UP
 
         def _timeout_callback(now=None):
             # assumption: state = 0 or 1
@@ -84,16 +85,23 @@ class ExtaLifeTransmitterEventProcessor(ExtaLifeEventProcessor):
 
             event_data[TRIGGER_SUBTYPE] = TRIGGER_SUBTYPE_BUTTON_TEMPLATE.format(button)
             if value == '1':  # long press
-                event_data[CONF_TYPE] = TRIGGER_BUTTON_LONG_PRESS
+                event_data[TRIGGER_TYPE] = TRIGGER_BUTTON_LONG_PRESS
 
             elif value == '10':  # single click
-                event_data[CONF_TYPE] = TRIGGER_BUTTON_SINGLE_CLICK
+                event_data[TRIGGER_TYPE] = TRIGGER_BUTTON_SINGLE_CLICK
 
             elif value == '1010':  # double click
-                event_data[CONF_TYPE]    = TRIGGER_BUTTON_DOUBLE_CLICK
+                event_data[TRIGGER_TYPE]    = TRIGGER_BUTTON_DOUBLE_CLICK
 
             elif value == '101010':  # triple click
-                event_data[CONF_TYPE]    = TRIGGER_BUTTON_TRIPLE_CLICK
+                event_data[TRIGGER_TYPE]    = TRIGGER_BUTTON_TRIPLE_CLICK
+
+            gesture = event_data.get(TRIGGER_TYPE)
+            if gesture not in (TRIGGER_BUTTON_DOWN, TRIGGER_BUTTON_UP):
+                # button down / up bindings are executed by the data manager straight from the notification
+                core = Core.get(self._device.config_entry_id)
+                if core is not None and core.bindings:
+                    core.bindings.on_button_event(transmitter_id, button, gesture)
 
             if event_data.get(TRIGGER_TYPE):
                 # raise event to HA event bus
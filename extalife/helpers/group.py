@@ -0,0 +1,151 @@
+""" Native groups of Exta Life channels """
+import logging
+
+from homeassistant.components.cover import DOMAIN as DOMAIN_COVER
+from homeassistant.components.light import DOMAIN as DOMAIN_LIGHT
+from homeassistant.components.switch import DOMAIN as DOMAIN_SWITCH
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.entity import Entity
+
+from .const import (
+    DOMAIN,
+    GROUP_CHANNELS,
+    GROUP_ID,
+    GROUP_NAME,
+    GROUP_PLATFORM,
+    OPTIONS_GROUP,
+    OPTIONS_GROUP_LIST,
+    SIGNAL_CONNECTION_STATE,
+    SIGNAL_DATA_UPDATED,
+    SIGNAL_CHANNEL_DATA_UPDATED,
+    SIGNAL_CHANNEL_STATE_STORED,
+)
+from .core import Core
+from ..pyextalife import ExtaLifeAPI, TCPConnError, DEVICE_ARR_COVER
+
+_LOGGER = logging.getLogger(__name__)
+
+# platforms of channels which can be grouped
+GROUP_PLATFORMS = (DOMAIN_SWITCH, DOMAIN_LIGHT, DOMAIN_COVER)
+
+
+def get_groups(config_entry: ConfigEntry, platform: str = None) -> list:
+    """Return group definitions from options, optionally only of the given platform.
+    Empty while the controller MAC is unknown - it's a part of unique ids of groups"""
+    groups = config_entry.options.get(OPTIONS_GROUP, {}).get(OPTIONS_GROUP_LIST, [])
+    if groups and Core.get(config_entry.entry_id).api.mac is None:
+        _LOGGER.warning("Controller MAC address is unknown - groups are not created until it's resolved and the entry is reloaded")
+        return []
+    return [group for group in groups if platform is None or group.get(GROUP_PLATFORM) == platform]
+
+
+def get_group_members(config_entry: ConfigEntry) -> set:
+    """Ids of channels which are members of any group"""
+    groups = config_entry.options.get(OPTIONS_GROUP, {}).get(OPTIONS_GROUP_LIST, [])
+    return {channel_id for group in groups for channel_id in group[GROUP_CHANNELS]}
+
+
+def get_groupable_channels(core: Core) -> dict:
+    """Channels which can be members of groups: native Exta Life switches, lights and roller shutters.
+    Returns {channel id: (platform, alias)}"""
+    manager = core.data_manager
+    channels = {}
+    for channel_id, platform in manager.discovered_channels.items():
+        data = manager.channels_indx.get(channel_id)
+        if platform not in GROUP_PLATFORMS or data is None or data.get("exta_free_device"):
+            continue
+        if platform == DOMAIN_COVER and data.get("type") not in DEVICE_ARR_COVER:
+            continue
+        channels[channel_id] = (platform, data.get("alias"))
+    return channels
+
+
+class ExtaLifeGroup(Entity):
+    """Group of channels of the same platform defined in options. An action is sent to all members
+    as one batch of commands instead of a service call and a controller round trip per member.
+    The state is computed from members' channel data, so it follows their notifications without polling"""
+
+    def __init__(self, group: dict, config_entry: ConfigEntry):
+        self.config_entry = config_entry
+        self.group_id = group[GROUP_ID]
+        self.members = list(group[GROUP_CHANNELS])
+
+        self._attr_name = group[GROUP_NAME]
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+
+        core = self.core
+        signals = [SIGNAL_DATA_UPDATED, SIGNAL_CONNECTION_STATE]
+        for channel_id in self.members:
+            signals.append(f"{SIGNAL_CHANNEL_STATE_STORED}_{channel_id}")
+            signals.append(f"{SIGNAL_CHANNEL_DATA_UPDATED}_{channel_id}")
+
+        for signal in signals:
+            self.async_on_remove(core.async_signal_register(signal, self.async_member_update_callback))
+
+    async def async_member_update_callback(self, *args):
+        """Member channel data changed: stored by the member entity (notification, optimistic update)
+        or by a status poll - in both cases before the signal is sent"""
+        self.async_schedule_update_ha_state()
+
+    @property
+    def core(self):
+        return Core.get(self.config_entry.entry_id)
+
+    @property
+    def controller(self) -> ExtaLifeAPI:
+        return self.core.api
+
+    @property
+    def unique_id(self) -> str:
+        return f"extalife-{self.controller.mac}-group-{self.group_id}"
+
+    @property
+    def should_poll(self):
+        return False
+
+    @property
+    def device_info(self):
+        """Groups belong to the controller device"""
+        return {"identifiers": {(DOMAIN, self.controller.mac)}}
+
+    @property
+    def available(self) -> bool:
+        return self.controller.is_connected and bool(self.members_data)
+
+    @property
+    def members_data(self) -> list:
+        """(channel id, channel data) of members known to the data manager"""
+        channels = self.core.data_manager.channels_indx
+        return [(channel_id, channels[channel_id]) for channel_id in self.members if channel_id in channels]
+
+    @property
+    def extra_state_attributes(self):
+        return {"channels": self.members}
+
+    async def async_action_members(self, action, get_fields=None) -> bool:
+        """Run action on all members in one batch
+
+        get_fields - optional function returning fields of the native JSON command for a member, called with member channel data
+
+        Returns True if all members executed the action"""
+        channels = [(channel_id, get_fields(data) if get_fields else {}) for channel_id, data in self.members_data]
+        if not channels:
+            return False
+
+        _LOGGER.debug("Executing action %s on group %s, channels: %s", action, self.entity_id, channels)
+        resp = None
+        with self.controller.tracer.trace("action", entity_id=self.entity_id, action=action):
+            try:
+                resp = await self.controller.async_execute_actions(action, channels)
+            except TCPConnError as err:
+                _LOGGER.error(err.data)
+
+        if resp is None:
+            return False
+
+        failed = [channel_id for (channel_id, fields), frames in zip(channels, resp) if frames[-1].get("status") != "success"]
+        if failed:
+            _LOGGER.warning("Action %s on group %s failed for channels: %s", action, self.entity_id, failed)
+        return not failed
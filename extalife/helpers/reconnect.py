@@ -0,0 +1,165 @@
+""" Reconnection engine: restores connection with the controller after it's lost """
+import asyncio
+import logging
+import random
+import time
+
+from homeassistant.core import callback
+
+from .const import CONF_CONTROLLER_IP, CONF_CONTROLLER_MAC, DOMAIN
+from ..pyextalife import ExtaLifeAPI, TCPConnError
+from .typing import CoreType
+
+_LOGGER = logging.getLogger(__name__)
+
+RECONNECT_BACKOFF_BASE = 1.0        # delay (seconds) before the 2nd attempt; the 1st one is immediate
+RECONNECT_BACKOFF_MAX = 60.0        # max. delay (seconds) between attempts
+RECONNECT_JITTER = 0.2              # randomize delays by +/- 20% so that multiple instances don't align
+RECONNECT_DISCOVERY_AFTER = 3       # failed attempts using cached IP before falling back to multicast discovery
+
+
+class ReconnectManager:
+    """Reconnects with the controller using exponential backoff. Only 1 reconnection
+    loop runs at a time, no matter how many times disconnection is reported"""
+
+    def __init__(self, core: CoreType):
+        self._core = core
+        self._task: asyncio.Task = None
+
+        # metrics
+        self._disconnected_at = None
+        self.reconnects = 0                 # number of successful reconnections
+        self.failed_attempts = 0            # number of failed attempts since last successful connection
+        self.last_attempts = None           # number of attempts needed for the last reconnection
+        self.last_reconnect_time = None     # time (seconds) from disconnection to reconnection - the last one
+        self.max_reconnect_time = None      # time (seconds) from disconnection to reconnection - the longest one
+
+    @property
+    def is_running(self) -> bool:
+        """Is reconnection loop running?"""
+        return self._task is not None and not self._task.done()
+
+    @callback
+    def start(self):
+        """Start reconnection loop unless it's already running (single-flight)"""
+        if self.is_running:
+            return
+
+        if self._disconnected_at is None:
+            self._disconnected_at = time.monotonic()
+        self._task = self._core.hass.async_create_task(self._async_reconnect_loop())
+
+    async def async_stop(self):
+        """Stop reconnection loop"""
+        if not self.is_running:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    @staticmethod
+    def get_delay(attempt: int) -> float:
+        """Return delay (seconds) before reconnection attempt no. `attempt` (counted from 0)"""
+        if attempt == 0:
+            return 0
+
+        delay = min(RECONNECT_BACKOFF_BASE * 2 ** (attempt - 1), RECONNECT_BACKOFF_MAX)
+        return delay * random.uniform(1 - RECONNECT_JITTER, 1 + RECONNECT_JITTER)
+
+    async def _async_reconnect_loop(self):
+        attempt = 0
+        while True:
+            await asyncio.sleep(self.get_delay(attempt))
+            attempt += 1
+
+            if await self._async_try_reconnect(attempt):
+                break
+
+            self.failed_attempts += 1
+
+        duration = time.monotonic() - self._disconnected_at
+        self._disconnected_at = None
+        self.failed_attempts = 0
+        self.reconnects += 1
+        self.last_attempts = attempt
+        self.last_reconnect_time = round(duration, 3)
+        self.max_reconnect_time = max(self.max_reconnect_time or 0, self.last_reconnect_time)
+
+        _LOGGER.info(
+            "Reconnected with controller after %s attempt(s) in %.1f seconds",
+            attempt,
+            duration,
+        )
+
+    async def _async_try_reconnect(self, attempt: int) -> bool:
+        """Single reconnection attempt. Fast path first: reconnect using cached IP.
+        Fall back to multicast discovery if that keeps failing - the IP may have changed"""
+        api = self._core.api
+
+        _LOGGER.debug("Reconnection attempt no. %s to IP: %s", attempt, api.host)
+        try:
+            await api.async_reconnect()
+            return True
+        except TCPConnError as err:
+            _LOGGER.debug("Reconnection attempt no. %s failed: %s", attempt, err.data)
+
+        if attempt < RECONNECT_DISCOVERY_AFTER:
+            return False
+
+        host = await self._async_discover_host()
+        if not host or host == api.host:
+            return False
+
+        _LOGGER.warning("Controller found on a new IP: %s. Reconnecting", host)
+        try:
+            await api.async_reconnect(host)
+        except TCPConnError as err:
+            _LOGGER.debug("Reconnection attempt no. %s to IP: %s failed: %s", attempt, host, err.data)
+            return False
+
+        # update ConfigEntry with the new IP
+        config_entry = self._core.config_entry
+        self._core.hass.config_entries.async_update_entry(
+            config_entry, data={**config_entry.data, CONF_CONTROLLER_IP: host}
+        )
+        _LOGGER.info("Controller IP updated to: %s", host)
+        return True
+
+    async def _async_discover_host(self) -> str:
+        """IP of this entry's controller found by multicast discovery. With multiple controllers in the network
+        the first one answering may be another one, so the controller is recognized by its MAC: broadcast
+        by the controller or resolved via ARP. If the entry's MAC is unknown, any controller not configured
+        in other entries is taken"""
+        core = self._core
+        mac = _normalize_mac(core.config_entry.data.get(CONF_CONTROLLER_MAC) or core.api.mac)
+
+        others = [entry.data for entry in core.hass.config_entries.async_entries(DOMAIN)
+                  if entry.entry_id != core.config_entry.entry_id]
+        other_hosts = {data.get(CONF_CONTROLLER_IP) for data in others}
+        other_macs = {_normalize_mac(data.get(CONF_CONTROLLER_MAC)) for data in others} - {None}
+
+        for controller in await ExtaLifeAPI.async_discover_controllers(core.hass.loop):
+            host = controller["host"]
+            if host in other_hosts:
+                continue
+
+            found_mac = _normalize_mac(controller.get("mac"))
+            if mac is None:
+                if found_mac not in other_macs:
+                    return host
+                continue
+
+            if found_mac is None:
+                # the firmware doesn't broadcast MAC
+                found_mac = _normalize_mac(await ExtaLifeAPI.async_resolve_mac(core.hass.loop, host))
+            if found_mac == mac:
+                return host
+
+        return None
+
+
+def _normalize_mac(mac: str) -> str:
+    return mac.lower().replace("-", ":") if mac else None
@@ -0,0 +1,101 @@
+""" Status poll scheduler shared by all controllers (config entries) """
+import asyncio
+import datetime
+import logging
+from typing import Callable
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.typing import HomeAssistantType
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Poller:
+    """Periodic poll of a single controller"""
+
+    def __init__(self, period: float, action: Callable):
+        self.period = period
+        self.action = action
+        self.next_run: float = None         # loop time of the next poll
+        self.task: asyncio.Task = None
+        self.cancel_timer: Callable = None
+
+
+class PollScheduler:
+    """Runs periodic status polls of all controllers. Each poll is placed in the middle of the largest gap
+    between polls of the other controllers, so that they don't fire at the same moment and load
+    Home Assistant and the network in bursts. Polls run at a fixed rate and a poll is skipped
+    if the previous one of the same controller is still running"""
+
+    def __init__(self, hass: HomeAssistantType):
+        self._hass = hass
+        self._pollers = {}      # key (config entry id): _Poller
+
+    @callback
+    def async_add(self, key: str, interval: datetime.timedelta, action: Callable) -> Callable:
+        """Start periodic poll. An existing poll with the same key is replaced
+
+        action - coroutine function called with the current time, like for async_track_time_interval
+
+        Returns function removing the poll"""
+        self.async_remove(key)
+
+        poller = _Poller(interval.total_seconds(), action)
+        poller.next_run = self._hass.loop.time() + self._get_offset(poller.period)
+        self._pollers[key] = poller
+        self._schedule(key, poller)
+
+        @callback
+        def remove():
+            if self._pollers.get(key) is poller:
+                self.async_remove(key)
+
+        return remove
+
+    @callback
+    def async_remove(self, key: str) -> None:
+        """Stop periodic poll. A poll already running is not interrupted"""
+        poller = self._pollers.pop(key, None)
+        if poller is not None and poller.cancel_timer is not None:
+            poller.cancel_timer()
+
+    def _get_offset(self, period: float) -> float:
+        """Return delay (seconds) of the first poll: the middle of the largest gap between the next polls
+        of other controllers, counted within the poll period. Between 1/2 and 1.5 period, because
+        a new poll usually follows a status fetch which has just been made"""
+        now = self._hass.loop.time()
+        phases = sorted((p.next_run - now) % period for p in self._pollers.values())
+        if not phases:
+            return period
+
+        gaps = zip(phases, phases[1:] + [phases[0] + period])
+        start, end = max(gaps, key=lambda gap: gap[1] - gap[0])
+        offset = ((start + end) / 2) % period
+        return offset if offset >= period / 2 else offset + period
+
+    def _schedule(self, key: str, poller: _Poller) -> None:
+        @callback
+        def run(now: datetime.datetime):
+            self._run(key, poller, now)
+
+        poller.cancel_timer = async_call_later(
+            self._hass, max(poller.next_run - self._hass.loop.time(), 0), run
+        )
+
+    @callback
+    def _run(self, key: str, poller: _Poller, now: datetime.datetime) -> None:
+        if self._pollers.get(key) is not poller:
+            return
+
+        # fixed rate - keep the phase no matter how long the poll takes; skip polls missed e.g. by a stalled loop
+        loop_time = self._hass.loop.time()
+        while poller.next_run <= loop_time:
+            poller.next_run += poller.period
+        self._schedule(key, poller)
+
+        if poller.task is not None and not poller.task.done():
+            _LOGGER.debug("Poll of %s skipped - the previous one is still running", key)
+            return
+
+        poller.task = self._hass.async_create_task(poller.action(now))
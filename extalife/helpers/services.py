@@ -1,18 +1,30 @@
 """ definition of all services for this integration """
 import asyncio
+from datetime import datetime
+import json
 import logging
+import os
 import voluptuous as vol
 from homeassistant.const import CONF_ENTITY_ID
 import homeassistant.helpers.entity_registry as er
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.typing import HomeAssistantType
 from .const import DOMAIN
-from ..pyextalife import ExtaLifeAPI
+from ..pyextalife import ExtaLifeAPI, TRACE_BUFFER_SIZE
 from .typing import CoreType
 
 # services
 SVC_RESTART = "restart"  # restart controller
 SVC_REFRESH_STATE = "refresh_state"  # execute status refresh, fetch new status from controller
+SVC_TRACE_START = "trace_start"  # start sampled tracing of commands
+SVC_TRACE_STOP = "trace_stop"  # stop tracing
+SVC_TRACE_DUMP = "trace_dump"  # save collected traces in Chrome trace format
+
+ATTR_SAMPLE_RATE = "sample_rate"
+ATTR_CAPACITY = "capacity"
+ATTR_FILENAME = "filename"
+
+TRACE_DIR = f"{DOMAIN}_traces"  # subdirectory of HA config directory for trace dumps
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,6 +44,31 @@ SCHEMA_TEST_BUTTON = vol.Schema(
     }
 )
 
+SCHEMA_TRACE_START = vol.Schema(
+    {
+        vol.Required(CONF_ENTITY_ID): cv.entity_id,
+        vol.Optional(ATTR_SAMPLE_RATE, default=0.1): vol.All(vol.Coerce(float), vol.Range(min=0.001, max=1)),
+        vol.Optional(ATTR_CAPACITY, default=TRACE_BUFFER_SIZE): vol.All(vol.Coerce(int), vol.Range(min=1, max=100000)),
+    }
+)
+SCHEMA_TRACE_STOP = SCHEMA_BASE
+
+
+def trace_filename(value) -> str:
+    """Validate plain file name of a trace dump - no directories"""
+    value = cv.string(value)
+    if os.path.basename(value) != value or "/" in value or "\\" in value or value in (".", ".."):
+        raise vol.Invalid("File name must not contain a directory")
+    return value
+
+
+SCHEMA_TRACE_DUMP = vol.Schema(
+    {
+        vol.Required(CONF_ENTITY_ID): cv.entity_id,
+        vol.Optional(ATTR_FILENAME): trace_filename,
+    }
+)
+
 class ExtaLifeServices():
     """ handle Exta Life services """
 
@@ -61,6 +98,15 @@ class ExtaLifeServices():
         self._hass.services.async_register(DOMAIN, 'test_button', self._handle_test_button, SCHEMA_TEST_BUTTON)
         self._services.append('test_button')
 
+        self._hass.services.async_register(DOMAIN, SVC_TRACE_START, self._handle_trace_start, SCHEMA_TRACE_START)
+        self._services.append(SVC_TRACE_START)
+
+        self._hass.services.async_register(DOMAIN, SVC_TRACE_STOP, self._handle_trace_stop, SCHEMA_TRACE_STOP)
+        self._services.append(SVC_TRACE_STOP)
+
+        self._hass.services.async_register(DOMAIN, SVC_TRACE_DUMP, self._async_handle_trace_dump, SCHEMA_TRACE_DUMP)
+        self._services.append(SVC_TRACE_DUMP)
+
     async def async_unregister_services(self):
         """ Unregister all Exta Life integration services """
         for service in self._services:
@@ -82,6 +128,38 @@ class ExtaLifeServices():
         asyncio.run_coroutine_threadsafe(core.data_manager.async_execute_status_polling(), self._hass.loop)
         #  core.data_manager.async_execute_status_polling
 
+    def _handle_trace_start(self, call):
+        """ service: extalife.trace_start """
+        core = self._get_core(call.data.get(CONF_ENTITY_ID))
+        core.api.tracer.start(call.data.get(ATTR_SAMPLE_RATE), call.data.get(ATTR_CAPACITY))
+        _LOGGER.info("Command tracing started, sample rate: %s", call.data.get(ATTR_SAMPLE_RATE))
+
+    def _handle_trace_stop(self, call):
+        """ service: extalife.trace_stop """
+        core = self._get_core(call.data.get(CONF_ENTITY_ID))
+        core.api.tracer.stop()
+        _LOGGER.info("Command tracing stopped")
+
+    async def _async_handle_trace_dump(self, call):
+        """ service: extalife.trace_dump """
+        core = self._get_core(call.data.get(CONF_ENTITY_ID))
+        filename = call.data.get(ATTR_FILENAME)
+        if not filename:
+            filename = f"{DOMAIN}_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        directory = self._hass.config.path(TRACE_DIR)
+        path = os.path.join(directory, os.path.basename(filename))
+
+        # export in the event loop - the ring buffer is modified there
+        data = core.api.tracer.as_chrome_trace()
+
+        def write():
+            os.makedirs(directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+
+        await self._hass.async_add_executor_job(write)
+        _LOGGER.info("Command traces saved to: %s", path)
+
     def _handle_test_button(self, call):
         from .common import PseudoPlatform
         from .core import Core
@@ -0,0 +1,85 @@
+""" Channel data store with per-channel revisions """
+from collections.abc import Mapping
+
+# source of channel data
+SOURCE_POLL = "poll"                    # status poll / resync - snapshot of all channels
+SOURCE_NOTIFICATION = "notification"    # state notification processed by entity
+SOURCE_OPTIMISTIC = "optimistic"        # state expected after an action, not confirmed yet
+
+
+class ChannelStore(Mapping):
+    """Channel data indexed by channel id: {"id": "data"}, read like a dict.
+
+    Every change gets the next number of a store-wide counter as the channel's revision, so revisions
+    only grow and entities can skip work if the revision of their channel didn't change.
+
+    Poll snapshots are merged so that they never overwrite data which was updated by notification
+    or optimistically after the snapshot had been requested"""
+
+    def __init__(self, channels: dict = None):
+        self._data = {}
+        self._meta = {}  # channel id: (revision, source)
+        self._revision = 0
+        if channels:
+            self.merge_snapshot(channels.items(), self._revision)
+
+    def __getitem__(self, channel_id: str) -> dict:
+        return self._data[channel_id]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def revision(self) -> int:
+        """The latest revision in the store. Take it before requesting a snapshot, see merge_snapshot"""
+        return self._revision
+
+    def get_revision(self, channel_id: str) -> int:
+        """Revision of the channel data; 0 for unknown channel"""
+        return self._meta.get(channel_id, (0, None))[0]
+
+    def get_source(self, channel_id: str) -> str:
+        """Source of the channel data, see SOURCE_*"""
+        return self._meta.get(channel_id, (0, None))[1]
+
+    def update(self, channel_id: str, data: dict, source: str = SOURCE_NOTIFICATION) -> int:
+        """Store channel data unconditionally. Returns new revision of the channel"""
+        self._revision += 1
+        self._data[channel_id] = data
+        self._meta[channel_id] = (self._revision, source)
+        return self._revision
+
+    def remove(self, channel_id: str) -> bool:
+        """Remove channel e.g. of a device deleted from the controller. Returns False for unknown channel"""
+        self._meta.pop(channel_id, None)
+        return self._data.pop(channel_id, None) is not None
+
+    def merge_snapshot(self, channels, since: int) -> list:
+        """Merge poll snapshot
+
+        channels - iterable of (channel id, data) pairs
+
+        since - store revision taken before the snapshot was requested. Channels updated
+        by other sources after it keep their data
+
+        Returns ids of channels whose data changed"""
+        changed = []
+        for channel_id, data in channels:
+            revision, source = self._meta.get(channel_id, (0, None))
+            if revision > since and source != SOURCE_POLL:
+                # newer than the snapshot
+                continue
+            if self._data.get(channel_id) == data:
+                continue
+
+            self.update(channel_id, data, SOURCE_POLL)
+            changed.append(channel_id)
+
+        return changed
+
+    def copy(self) -> dict:
+        """Return plain dict of channel data"""
+        return self._data.copy()
@@ -2,7 +2,6 @@
 Support for real Exta Life light controllers (RDP, RDM, SLR) + fake lights (on/off switches: ROP,ROM devices) mapped as light in HA
 """
 import logging
-from pprint import pformat
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.light import (
@@ -19,6 +18,7 @@ from homeassistant.helpers.typing import HomeAssistantType
 from . import ExtaLifeChannel
 from .helpers.const import DOMAIN_VIRTUAL_LIGHT_SENSOR
 from .helpers.core import Core
+from .helpers.group import ExtaLifeGroup, get_groups
 from .pyextalife import (       # pylint: disable=syntax-error
     ExtaLifeAPI,
     ExtaLifeDeviceModel,
@@ -137,6 +137,21 @@ def modeval_upd(old, new):
     return None
 
 
+def get_state_fields(data: dict) -> dict:
+    """Fields of control command keeping the current mode, colour and brightness of the channel"""
+    params = dict()
+    mode = data.get("mode")
+    if mode is not None:
+        params.update({"mode": mode})
+    mode_val = data.get("mode_val")
+    if mode_val is not None:
+        params.update({"mode_val": modevaltoint(mode_val)})
+    value = data.get("value")
+    if value is not None:
+        params.update({"value": value})
+    return params
+
+
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """setup via configuration.yaml not supported anymore"""
 
@@ -147,12 +162,11 @@ async def async_setup_entry(
     """Set up an Exta Life light based on existing config."""
 
     core = Core.get(config_entry.entry_id)
-    channels = core.get_channels(DOMAIN_LIGHT)
+    core.async_setup_platform_entities(
+        DOMAIN_LIGHT, async_add_entities, lambda device: ExtaLifeLight(device, config_entry)
+    )
 
-    _LOGGER.debug("Discovery: %s", pformat(channels))
-    async_add_entities([ExtaLifeLight(device, config_entry) for device in channels])
-
-    core.pop_channels(DOMAIN_LIGHT)
+    async_add_entities([ExtaLifeLightGroup(group, config_entry) for group in get_groups(config_entry, DOMAIN_LIGHT)])
 
 
 class ExtaLifeLight(ExtaLifeChannel, LightEntity):
@@ -254,21 +268,17 @@ class ExtaLifeLight(ExtaLifeChannel, LightEntity):
             )  # mode - one of effects
 
         if not self.is_exta_free:
-            if await self.async_action(ExtaLifeAPI.ACTN_TURN_ON, **params):
-                # update channel data with new values
-                data["power"] = 1
-                mode_val_new = params.get("mode_val")
-                if mode_val_new is not None:
-                    params["mode_val"] = modeval_upd(
-                        mode_val, mode_val_new
-                    )  # convert new value to the format of the old value from channel_data
-                data.update(params)
-                self.async_schedule_update_ha_state()
+            # channel data expected after the action
+            expected = {**params, "power": 1}
+            mode_val_new = params.get("mode_val")
+            if mode_val_new is not None:
+                expected["mode_val"] = modeval_upd(
+                    mode_val, mode_val_new
+                )  # convert new value to the format of the old value from channel_data
+            await self.async_action_optimistic(ExtaLifeAPI.ACTN_TURN_ON, expected, **params)
         else:
-            if await self.async_action(
+            if await self.async_action_press_release(
                 ExtaLifeAPI.ACTN_EXFREE_TURN_ON_PRESS, **params
-            ) and await self.async_action(
-                ExtaLifeAPI.ACTN_EXFREE_TURN_ON_RELEASE, **params
             ):
                 self._assumed_on = True
                 self.schedule_update_ha_state()
@@ -276,27 +286,13 @@ class ExtaLifeLight(ExtaLifeChannel, LightEntity):
     async def async_turn_off(self, **kwargs):
         """Turn off the switch."""
         data = self.channel_data
-        params = dict()
-        mode = data.get("mode")
-        if mode is not None:
-            params.update({"mode": mode})
-        mode_val = data.get("mode_val")
-        if mode_val is not None:
-            params.update({"mode_val": modevaltoint(mode_val)})
-        value = data.get("value")
-        if value is not None:
-            params.update({"value": value})
+        params = get_state_fields(data)
 
         if not self.is_exta_free:
-            if await self.async_action(ExtaLifeAPI.ACTN_TURN_OFF, **params):
-                data["power"] = 0
-                data["mode"] = mode
-                self.async_schedule_update_ha_state()
+            await self.async_action_optimistic(ExtaLifeAPI.ACTN_TURN_OFF, {"power": 0, "mode": data.get("mode")}, **params)
         else:
-            if await self.async_action(
+            if await self.async_action_press_release(
                 ExtaLifeAPI.ACTN_EXFREE_TURN_OFF_PRESS, **params
-            ) and await self.async_action(
-                ExtaLifeAPI.ACTN_EXFREE_TURN_OFF_RELEASE, **params
             ):
                 self._assumed_on = False
                 self.schedule_update_ha_state()
@@ -383,3 +379,48 @@ class ExtaLifeLight(ExtaLifeChannel, LightEntity):
 
             # synchronize DataManager data with processed update & entity data
             self.sync_data_update_ha()
+
+
+class ExtaLifeLightGroup(ExtaLifeGroup, LightEntity):
+    """Native group of Exta Life lights. Members keep their mode and colour, the group controls power and brightness"""
+
+    @property
+    def _dimmable_data(self) -> list:
+        return [data for channel_id, data in self.members_data if data.get("type") in SUPPORT_BRIGHTNESS]
+
+    @property
+    def supported_color_modes(self):
+        return {ColorMode.BRIGHTNESS} if self._dimmable_data else {ColorMode.ONOFF}
+
+    @property
+    def color_mode(self):
+        return ColorMode.BRIGHTNESS if self._dimmable_data else ColorMode.ONOFF
+
+    @property
+    def is_on(self):
+        """Return true if any member is on"""
+        return any(data.get("power") == 1 for channel_id, data in self.members_data)
+
+    @property
+    def brightness(self):
+        """Mean brightness of dimmable members which are on"""
+        values = [data.get("value") for data in self._dimmable_data if data.get("power") == 1 and data.get("value") is not None]
+        if not values:
+            return None
+        return scaleto255(sum(values) / len(values))
+
+    async def async_turn_on(self, **kwargs):
+        """Turn on all members, optionally setting brightness of dimmable ones"""
+        target_brightness = kwargs.get(ATTR_BRIGHTNESS)
+
+        def get_fields(data: dict) -> dict:
+            params = get_state_fields(data)
+            if target_brightness is not None and data.get("type") in SUPPORT_BRIGHTNESS:
+                params.update({"value": scaleto100(target_brightness)})
+            return params
+
+        await self.async_action_members(ExtaLifeAPI.ACTN_TURN_ON, get_fields)
+
+    async def async_turn_off(self, **kwargs):
+        """Turn off all members"""
+        await self.async_action_members(ExtaLifeAPI.ACTN_TURN_OFF, get_state_fields)
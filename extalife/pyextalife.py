@@ -6,10 +6,43 @@ import socket
 import json
 import asyncio
 from asyncio.events import AbstractEventLoop
+from collections import deque
+from contextlib import contextmanager
+import contextvars
+import random
+import time
 import attr
 
 _LOGGER = logging.getLogger(__name__)
 
+# connection health monitoring
+TCP_KEEPALIVE_IDLE = 10             # seconds of socket inactivity before the OS starts sending keepalive probes
+TCP_KEEPALIVE_INTERVAL = 3          # seconds between OS keepalive probes
+TCP_KEEPALIVE_COUNT = 3             # number of unanswered keepalive probes after which the OS drops the connection
+WATCHDOG_TIMEOUT = 15.0             # max. seconds without any incoming traffic before the link is verified
+WATCHDOG_PROBE_TIMEOUT = 5.0        # max. seconds to wait for the controller to answer the verification probe
+
+# command deadlines (seconds), including wait for the command queue
+COMMAND_TIMEOUT_CONTROL = 5.0       # device control, scene activation - single frame response, quick
+COMMAND_TIMEOUT_FETCH = 30.0        # device list fetch - large, multi-frame response
+COMMAND_TIMEOUT_DEFAULT = 10.0      # other commands
+LATE_RESPONSE_EXPIRY = 30.0         # max. seconds after a command timed out during which its late response is dropped
+
+# command priorities: lower value is executed first
+COMMAND_PRIORITY_CONTROL = 0        # user actions: device control, scenes
+COMMAND_PRIORITY_REFRESH = 1        # state refresh requested by the user or after reconnection
+COMMAND_PRIORITY_BACKGROUND = 2     # periodic polling, version/name queries, probes
+COMMAND_STARVATION_LIMIT = 10.0     # seconds in the queue after which a command is executed ahead of any priority
+EXTA_FREE_RELEASE_DELAY = 0.01      # max. seconds the pipelined Exta Free button release waits for the press response
+
+# tracing
+TRACE_BUFFER_SIZE = 1000            # number of the most recent traces kept in memory
+
+# autodiscovery
+EFC01_MCAST_GRP = "225.0.0.1"
+EFC01_MCAST_PORT = 20401
+DISCOVERY_TIMEOUT = 3.0             # seconds to collect controller broadcasts
+
 # controller info
 PRODUCT_MANUFACTURER = "ZAMEL"
 PRODUCT_SERIES = "Exta Life"
@@ -265,6 +298,22 @@ class ExtaLifeAPI:
     CMD_VERSION = 151
     CMD_RESTART = 150
 
+    # Deadline class per command; commands not listed use COMMAND_TIMEOUT_DEFAULT
+    COMMAND_TIMEOUTS = {
+        CMD_CONTROL_DEVICE: COMMAND_TIMEOUT_CONTROL,
+        CMD_ACTIVATE_SCENE: COMMAND_TIMEOUT_CONTROL,
+        CMD_FETCH_RECEIVERS: COMMAND_TIMEOUT_FETCH,
+        CMD_FETCH_SENSORS: COMMAND_TIMEOUT_FETCH,
+        CMD_FETCH_TRANSMITTERS: COMMAND_TIMEOUT_FETCH,
+        CMD_FETCH_EXTAFREE: COMMAND_TIMEOUT_FETCH,
+    }
+
+    # Default priority per command; commands not listed run in the background
+    COMMAND_PRIORITIES = {
+        CMD_CONTROL_DEVICE: COMMAND_PRIORITY_CONTROL,
+        CMD_ACTIVATE_SCENE: COMMAND_PRIORITY_CONTROL,
+    }
+
     # Actions
     ACTN_TURN_ON = "TURN_ON"
     ACTN_TURN_OFF = "TURN_OFF"
@@ -280,6 +329,19 @@ class ExtaLifeAPI:
     ACTN_SET_RGT_MODE_MANUAL = "RGT_SET_MODE_MANUAL"
     ACTN_SET_RGT_MODE_AUTO = "RGT_SET_MODE_AUTO"
 
+    # Actions setting complete target state of a channel. If such an action is issued for a channel while the previous
+    # one still waits in the command queue (e.g. brightness slider dragged), only the latest one is sent
+    COALESCED_ACTIONS = (
+        ACTN_TURN_ON,
+        ACTN_TURN_OFF,
+        ACTN_SET_BRI,
+        ACTN_SET_RGB,
+        ACTN_SET_POS,
+        ACTN_SET_TMP,
+        ACTN_SET_RGT_MODE_MANUAL,
+        ACTN_SET_RGT_MODE_AUTO,
+    )
+
     # Exta Free Actions
     ACTN_EXFREE_TURN_ON_PRESS = "TURN_ON_PRESS"
     ACTN_EXFREE_TURN_ON_RELEASE = "TURN_ON_RELEASE"
@@ -294,18 +356,36 @@ class ExtaLifeAPI:
     ACTN_EXFREE_BRIGHT_DOWN_PRESS = "BRIGHT_DOWN_PRESS"
     ACTN_EXFREE_BRIGHT_DOWN_RELEASE = "BRIGHT_DOWN_RELEASE"
 
+    # Exta Free button press action: matching release action, see async_execute_press_release
+    EXFREE_RELEASE_ACTIONS = {
+        ACTN_EXFREE_TURN_ON_PRESS: ACTN_EXFREE_TURN_ON_RELEASE,
+        ACTN_EXFREE_TURN_OFF_PRESS: ACTN_EXFREE_TURN_OFF_RELEASE,
+        ACTN_EXFREE_UP_PRESS: ACTN_EXFREE_UP_RELEASE,
+        ACTN_EXFREE_DOWN_PRESS: ACTN_EXFREE_DOWN_RELEASE,
+        ACTN_EXFREE_BRIGHT_UP_PRESS: ACTN_EXFREE_BRIGHT_UP_RELEASE,
+        ACTN_EXFREE_BRIGHT_DOWN_PRESS: ACTN_EXFREE_BRIGHT_DOWN_RELEASE,
+    }
+
     # Channel Types
     CHN_TYP_RECEIVERS = "receivers"
     CHN_TYP_SENSORS = "sensors"
     CHN_TYP_TRANSMITTERS = "transmitters"
     CHN_TYP_EXFREE_RECEIVERS = "exta_free_receivers"
 
-    def __init__(self, loop: AbstractEventLoop, on_notification_callback=None, on_connect_callback=None, on_disconnect_callback=None):
+    def __init__(self, loop: AbstractEventLoop, on_notification_callback=None, on_connect_callback=None, on_disconnect_callback=None,
+            tcp_keepalive=(TCP_KEEPALIVE_IDLE, TCP_KEEPALIVE_INTERVAL, TCP_KEEPALIVE_COUNT), watchdog_timeout=WATCHDOG_TIMEOUT, port=None):
         """ API Object constructor
 
         on_connect - optional callback for notifications when API connects to the controller and performs successfull login
 
-        on_disconnect - optional callback for notifications when API loses connection to the controller """
+        on_disconnect - optional callback for notifications when API loses connection to the controller
+
+        tcp_keepalive - tuple (idle, interval, count) of OS-level TCP keepalive settings or None to disable them
+
+        watchdog_timeout - max. number of seconds without any incoming traffic before the connection is verified
+        and torn down if the controller does not answer; None disables the watchdog
+
+        port - optional, controller TCP port if other than the standard one e.g. for a local simulator """
 
         self.tcp: TCPAdapter = None
         self._mac = None
@@ -326,6 +406,15 @@ class ExtaLifeAPI:
         self._password: str = None
         self._connection: TCPAdapter = None
 
+        self._tcp_keepalive = tcp_keepalive
+        self._watchdog_timeout = watchdog_timeout
+        self._port = port
+
+        self._stats = ConnectionStats()
+        self._tracer = Tracer()
+
+        self._pending_actions = {}  # channel_id: PendingAction - coalesced action waiting in the command queue
+
     async def async_connect(self, user, password, host=None):
         """Connect & authenticate to the controller using user and password parameters"""
         self._host = host
@@ -334,48 +423,70 @@ class ExtaLifeAPI:
 
         # perform controller autodiscovery if no IP specified
         if self._host is None or self._host == '':
-            self._host = await self._loop.run_in_executor(None, TCPAdapter.discover_controller)
+            self._host = await self.async_discover_controller(self._loop)
 
         # check if still None after autodiscovery
         if not self._host:
             raise TCPConnError("Could not find controller IP via autodiscovery")
 
-        ConnectionParams.host = self._host
-        ConnectionParams.user = self._user
-        ConnectionParams.password = self._password
-        ConnectionParams.eventloop = self._loop
-        ConnectionParams.keepalive = 8  # ping period; in seconds
-        ConnectionParams.on_notification_callback = self._async_on_notification_callback
-        ConnectionParams.on_connect_callback      = self._async_on_tcp_connect_callback#self._on_connect_callback
-        ConnectionParams.on_disconnect_callback   = self._async_on_tcp_disconnect_callback
-
+        params = ConnectionParams(
+            eventloop=self._loop,
+            host=self._host,
+            user=self._user,
+            password=self._password,
+            on_connect_callback=self._async_on_tcp_connect_callback,
+            on_disconnect_callback=self._async_on_tcp_disconnect_callback,
+            on_notification_callback=self._async_on_notification_callback,
+            port=self._port,
+            tcp_keepalive=self._tcp_keepalive,
+            watchdog_timeout=self._watchdog_timeout,
+            stats=self._stats,
+        )
 
         # init TCP adapter and try to connect
-        self._connection = TCPAdapter(ConnectionParams)
+        self._connection = TCPAdapter(params)
 
         # connect and login - may raise TCPConnErr
         _LOGGER.debug("Connecting to controller using IP: %s", self._host)
         await self._connection.async_connect()
 
-        resp = await self._connection.async_login()
+        try:
+            resp = await self._connection.async_login()
 
-        # check response if login succeeded
-        if resp[0]["status"] != "success":
-            raise TCPConnError(resp)
+            # check response if login succeeded
+            if resp[0]["status"] != "success":
+                raise TCPConnError(resp)
+        except Exception:
+            # don't leave the adapter's reader, ping and watchdog tasks running on a half-open connection
+            await self._connection.async_stop(True)
+            raise
 
-        # determine controller MAC as its unique identifier
-        self._mac = await self.async_get_mac()
+        # determine controller MAC as its unique identifier; resolve only once - (re)connects reuse it
+        if self._mac is None:
+            self._mac = await self.async_get_mac()
 
         return True
 
-    async def async_reconnect(self):
-        """ Reconnect with existing connection parameters """
-        return await self.async_connect(self._user, self._password, self._host)
+    async def async_reconnect(self, host=None):
+        """ Reconnect with existing connection parameters
+
+        host - optional, new controller IP to be used instead of the current one """
+        return await self.async_connect(self._user, self._password, host if host else self._host)
 
     @property
     def host(self):
         return self._host
 
+    @property
+    def stats(self) -> "ConnectionStats":
+        """ Connection instrumentation: command latencies, lock wait, frame and notification rates """
+        return self._stats
+
+    @property
+    def tracer(self) -> "Tracer":
+        """ Command lifecycle tracing; disabled until started """
+        return self._tracer
+
     async def _async_on_tcp_connect_callback(self):
         """ Called when connectivity is (re)established and logged on successfully """
         self._is_connected = True
@@ -395,8 +506,8 @@ class ExtaLifeAPI:
 
     async def _async_on_notification_callback(self, data):
         """ Called when notification from the controller is received """
-        if self._on_notification_callback(data) is not None:
-            # forward only device status changes to the listener
+        # no callback e.g. for the connection made by config flow
+        if self._on_notification_callback is not None:
             self._on_notification_callback(data)
 
     def set_notification_callback(self, callback):
@@ -409,9 +520,25 @@ class ExtaLifeAPI:
         return self._is_connected
 
     @classmethod
-    def discover_controller(cls):
-        """ Returns controller IP address if found, otherwise None"""
-        return TCPAdapter.discover_controller()
+    async def async_discover_controller(cls, loop: AbstractEventLoop):
+        """ Returns IP address of the first controller found, otherwise None"""
+        controllers = await TCPAdapter.async_discover_controllers(loop, first_only=True)
+        return controllers[0]["host"] if controllers else None
+
+    @classmethod
+    async def async_discover_controllers(cls, loop: AbstractEventLoop, timeout: float = DISCOVERY_TIMEOUT) -> list:
+        """ Returns list of dicts (host, mac, name) of all controllers found in the network """
+        return await TCPAdapter.async_discover_controllers(loop, timeout)
+
+    @classmethod
+    def get_command_priority(cls, command) -> int:
+        """ Default priority of a command in the command queue """
+        return cls.COMMAND_PRIORITIES.get(command, COMMAND_PRIORITY_BACKGROUND)
+
+    @classmethod
+    def get_command_timeout(cls, command) -> float:
+        """ Default time (seconds) for command to complete, depending on its class """
+        return cls.COMMAND_TIMEOUTS.get(command, COMMAND_TIMEOUT_DEFAULT)
 
     @property
     def sw_version(self) -> str:
@@ -425,19 +552,33 @@ class ExtaLifeAPI:
             self._sw_version = resp[0]["data"]["new_version"]
             return self._sw_version
 
-        except TCPCmdError:
+        except (TCPCmdError, TCPCmdTimeoutError):
             _LOGGER.error("Command %s could not be executed", self.CMD_VERSION)
             return
 
     async def async_get_mac(self):
+        """ Resolve EFC-01 controller MAC address. This scans ARP tables and may shell out, so it's slow """
+        return await self.async_resolve_mac(self._loop, self._host)
+
+    @classmethod
+    async def async_resolve_mac(cls, loop: AbstractEventLoop, host: str):
+        """ Resolve MAC address of any host, e.g. a discovered controller. Slow, see async_get_mac """
+        return await loop.run_in_executor(None, cls._resolve_mac, host)
+
+    @staticmethod
+    def _resolve_mac(host):
+        # import here: keep getmac off the startup path and out of the event loop
         from getmac import get_mac_address
-        # get EFC-01 controller MAC address
-        return await self._loop.run_in_executor(None, get_mac_address, None, self._host, None, self._host)
+        return get_mac_address(None, host, None, host)
 
     @property
     def mac(self):
         return self._mac
 
+    def set_mac(self, mac):
+        """ Set known controller MAC address e.g. stored from previous session, so it won't be resolved on connect """
+        self._mac = mac
+
     async def async_get_network_settings(self):
         """ Executes command 102 to get network settings and controller name """
         try:
@@ -445,7 +586,7 @@ class ExtaLifeAPI:
             resp = await self._connection.async_execute_command(cmd, None)
             return resp[0].get("data")
 
-        except TCPCmdError:
+        except (TCPCmdError, TCPCmdTimeoutError):
             _LOGGER.error("Command %s could not be executed", cmd)
             return None
 
@@ -460,40 +601,46 @@ class ExtaLifeAPI:
         """ Get controller name from buffer """
         return self._name
 
-    async def async_get_channels(self, include=(CHN_TYP_RECEIVERS, CHN_TYP_SENSORS, CHN_TYP_TRANSMITTERS, CHN_TYP_EXFREE_RECEIVERS)):
+    async def async_get_channels(self, include=(CHN_TYP_RECEIVERS, CHN_TYP_SENSORS, CHN_TYP_TRANSMITTERS, CHN_TYP_EXFREE_RECEIVERS), timeout: float = None,
+            priority: int = COMMAND_PRIORITY_BACKGROUND):
         """
         Get list of dicts of Exta Life channels consisting of native Exta Life TCP JSON
         data, but with transformed data model. Each channel will have native channel info
         AND device info. 2 channels of the same device will have the same device attributes
+
+        timeout - optional, max. time (seconds) for all the fetches together. By default each fetch has its own
+
+        priority - priority of the fetches in the command queue, see COMMAND_PRIORITY_*
         """
+        deadline = time.monotonic() + timeout if timeout is not None else None
         try:
             channels = list()
             if self.CHN_TYP_RECEIVERS in include:
                 cmd = self.CMD_FETCH_RECEIVERS
-                resp = await self._connection.async_execute_command(cmd, None)
+                resp = await self._connection.async_execute_command(cmd, None, deadline=deadline, priority=priority)
                 # here is where the magic happens - transform TCP JSON data into API channel representation
                 resp.extend(FAKE_RECEIVERS)
                 channels.extend(self._get_channels_int(resp))
 
             if self.CHN_TYP_SENSORS in include:
                 cmd = self.CMD_FETCH_SENSORS
-                resp = await self._connection.async_execute_command(cmd, None)
+                resp = await self._connection.async_execute_command(cmd, None, deadline=deadline, priority=priority)
                 resp.extend(FAKE_SENSORS)
                 channels.extend(self._get_channels_int(resp))
 
             if self.CHN_TYP_TRANSMITTERS in include:
                 cmd = self.CMD_FETCH_TRANSMITTERS
-                resp = await self._connection.async_execute_command(cmd, None)
+                resp = await self._connection.async_execute_command(cmd, None, deadline=deadline, priority=priority)
                 channels.extend(self._get_channels_int(resp, dummy_ch=True))
 
             if self.CHN_TYP_EXFREE_RECEIVERS in include:
                 cmd = self.CMD_FETCH_EXTAFREE
-                resp = await self._connection.async_execute_command(cmd, None)
+                resp = await self._connection.async_execute_command(cmd, None, deadline=deadline, priority=priority)
                 channels.extend(self._get_channels_int(resp))
 
             return channels
 
-        except TCPCmdError:
+        except (TCPCmdError, TCPCmdTimeoutError):
             _LOGGER.error("Command %s could not be executed", cmd)
             return None
 
@@ -574,14 +721,97 @@ class ExtaLifeAPI:
                     channels.append(channel)
         return channels
 
-    async def async_execute_action(self, action, channel_id, **fields):
+    async def async_execute_action(self, action, channel_id, timeout: float = None, **fields):
         """Execute action/command in controller
         action - action to be performed. See ACTN_* constants
         channel_id - concatenation of device id and channel number e.g. '1-1'
+        timeout - optional, max. time (seconds) for the command to complete, including wait in the command queue
         **fields - fields of the native JSON command e.g. value, mode, mode_val etc
 
         Returns array of dicts converted from JSON or None if error occured
         """
+        cmd_data = self._get_action_data(action, channel_id, **fields)
+
+        try:
+            cmd = self.CMD_CONTROL_DEVICE
+            if action in self.COALESCED_ACTIONS:
+                resp = await self._async_execute_coalesced(channel_id, cmd_data, timeout)
+            else:
+                # keep order: actions issued after this one must not be merged into those issued before
+                self._pending_actions.pop(channel_id, None)
+                resp = await self._connection.async_execute_command(cmd, cmd_data, timeout)
+
+            _LOGGER.debug("JSON response for command %s: %s", cmd, resp)
+
+            return resp
+        except (TCPCmdError, TCPCmdTimeoutError) as err:
+            # _LOGGER.error("Command %s could not be executed", cmd)
+            _LOGGER.exception(err)
+            return None
+
+    async def async_execute_actions(self, action, channels: list, timeout: float = None):
+        """Execute the same action on multiple channels as one batch. The commands are sent back-to-back
+        holding the command queue once and their responses are awaited together, instead of a round trip per channel
+        action - action to be performed. See ACTN_* constants
+        channels - list of (channel_id, fields) pairs; fields - dict of fields of the native JSON command of the channel
+        timeout - optional, max. time (seconds) for the whole batch to complete, including wait in the command queue
+
+        Returns list of responses, one per channel, or None if error occured
+        """
+        cmd = self.CMD_CONTROL_DEVICE
+        cmd_data = []
+        for channel_id, fields in channels:
+            # keep order: actions issued after the batch must not be merged into those issued before
+            self._pending_actions.pop(channel_id, None)
+            cmd_data.append(self._get_action_data(action, channel_id, **fields))
+
+        try:
+            resp = await self._connection.async_execute_commands(cmd, cmd_data, timeout)
+
+            _LOGGER.debug("JSON responses for batch of command %s: %s", cmd, resp)
+
+            return resp
+        except (TCPCmdError, TCPCmdTimeoutError) as err:
+            _LOGGER.exception(err)
+            return None
+
+    async def async_execute_press_release(self, press_action, channel_id, timeout: float = None, **fields):
+        """Press and release Exta Free button in one operation. The release follows the press as soon as it is
+        answered, but not later than EXTA_FREE_RELEASE_DELAY after it; both responses are awaited together
+        press_action - one of ACTN_EXFREE_*_PRESS actions
+        channel_id, timeout, **fields - see async_execute_action
+
+        If the press succeeded but the release response got lost, the release is repeated once on its own,
+        so that the button is not left pressed
+
+        Returns list of the press and release responses or None if error occured
+        """
+        press_data = self._get_action_data(press_action, channel_id, **fields)
+        release_data = self._get_action_data(self.EXFREE_RELEASE_ACTIONS[press_action], channel_id, **fields)
+
+        try:
+            cmd = self.CMD_CONTROL_DEVICE
+            self._pending_actions.pop(channel_id, None)
+            try:
+                resp = await self._connection.async_execute_commands(cmd, [press_data, release_data], timeout,
+                    spacing=EXTA_FREE_RELEASE_DELAY)
+            except TCPCmdTimeoutError as err:
+                if len(err.completed) != 1:
+                    raise
+                _LOGGER.warning("Release of Exta Free button on channel %s not confirmed. Retrying", channel_id)
+                # the late response to the lost release, if any, is dropped - the retry is confirmed by its own
+                resp = [err.completed[0], await self._connection.async_execute_command(cmd, release_data, timeout)]
+
+            _LOGGER.debug("JSON response for command %s: %s", cmd, resp)
+
+            return resp
+        except (TCPCmdError, TCPCmdTimeoutError) as err:
+            _LOGGER.exception(err)
+            return None
+
+    @staticmethod
+    def _get_action_data(action, channel_id, **fields) -> dict:
+        """ Build data of control command for the action """
         MAP_ACION_STATE = {
             # Exta Life:
             ExtaLifeAPI.ACTN_TURN_ON: 1,
@@ -619,17 +849,71 @@ class ExtaLifeAPI:
         }
         # this assumes the right fields are passed to the API
         cmd_data.update(**fields)
+        return cmd_data
+
+    async def _async_execute_coalesced(self, channel_id, cmd_data, timeout):
+        """ Execute control command; "latest wins" for commands to the same channel waiting in the command queue.
+        Callers whose command was superseded get the result of the command actually sent.
+        The command runs in its own task, so cancellation of one caller doesn't affect the others;
+        the command is cancelled only when all its callers were cancelled """
+        pending = self._pending_actions.get(channel_id)
+        if pending is not None:
+            # not sent yet - send the new data instead
+            pending.data = cmd_data
+            self._stats.coalesced += 1
+            return await self._async_await_pending(pending)
+
+        def dequeue():
+            # called once the command leaves the queue: further actions will form a new command
+            if self._pending_actions.get(channel_id) is pending:
+                del self._pending_actions[channel_id]
+            return pending.data
+
+        async def execute():
+            try:
+                return await self._connection.async_execute_command(self.CMD_CONTROL_DEVICE, dequeue, timeout)
+            finally:
+                if self._pending_actions.get(channel_id) is pending:
+                    del self._pending_actions[channel_id]
 
+        pending = PendingAction(cmd_data, None)
+        self._pending_actions[channel_id] = pending
+        pending.future = self._loop.create_task(execute())
+        # retrieved - don't warn if the last caller was cancelled just as the command failed
+        pending.future.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+        return await self._async_await_pending(pending)
+
+    @staticmethod
+    async def _async_await_pending(pending: "PendingAction"):
+        """ Await result of coalesced command. Shield - cancellation of a caller must not cancel the shared command
+        while other callers wait for it """
+        pending.waiters += 1
         try:
-            cmd = self.CMD_CONTROL_DEVICE
-            resp = await self._connection.async_execute_command(cmd, cmd_data)
+            return await asyncio.shield(pending.future)
+        except asyncio.CancelledError:
+            if pending.waiters == 1:
+                pending.future.cancel()
+            raise
+        finally:
+            pending.waiters -= 1
+
+    async def async_activate_scene(self, scene_id: int, timeout: float = None):
+        """ Activate scene defined in the controller. The controller executes all actions of the scene itself,
+        so this is a single command instead of one per device
+
+        Returns array of dicts converted from JSON or None if error occured """
+        try:
+            cmd = self.CMD_ACTIVATE_SCENE
+            cmd_data = {"id": scene_id}
+
+            resp = await self._connection.async_execute_command(cmd, cmd_data, timeout)
 
             _LOGGER.debug("JSON response for command %s: %s", cmd, resp)
 
             return resp
-        except TCPCmdError as err:
-            # _LOGGER.error("Command %s could not be executed", cmd)
-            _LOGGER.exception(err)
+        except (TCPCmdError, TCPCmdTimeoutError):
+            _LOGGER.error("Command %s could not be executed", cmd)
             return None
 
     async def async_restart(self):
@@ -643,18 +927,28 @@ class ExtaLifeAPI:
             _LOGGER.debug("JSON response for command %s: %s", cmd, resp)
 
             return resp
-        except TCPCmdError:
+        except (TCPCmdError, TCPCmdTimeoutError):
             _LOGGER.error("Command %s could not be executed", cmd)
             return None
 
     async def disconnect(self):
         """ Disconnect from the controller and stop message tasks """
-        await self._connection.async_stop(True)
+        if self._connection is not None:
+            await self._connection.async_stop(True)
 
     def get_tcp_adapter(self):
         return self._connection
 
 
+class PendingAction:
+    """ Coalesced control command waiting in the command queue """
+
+    def __init__(self, data: dict, future: asyncio.Future):
+        self.data = data
+        self.future = future
+        self.waiters = 0     # callers awaiting the result
+
+
 class TCPConnError(Exception):
     def __init__(self, data=None, previous=None):
         super().__init__()
@@ -666,6 +960,16 @@ class TCPConnError(Exception):
             self.error_code = None if not data else data.get("code")
 
 
+class TCPCmdTimeoutError(TCPConnError):
+    """ Command did not complete within its deadline, but the connection is alive
+
+    completed - responses to the leading messages of a sequence which were received before the timeout """
+
+    def __init__(self, data=None, previous=None, completed=None):
+        super().__init__(data, previous)
+        self.completed = completed or []
+
+
 class TCPCmdError(Exception):
     def __init__(self, data=None):
         super().__init__()
@@ -676,16 +980,311 @@ class TCPCmdError(Exception):
             self.error_code = None if not data else data.get("code")
 
 
+class LatencyStats:
+    """ Latency statistics: count, mean, max and histogram of values in milliseconds.
+    Percentiles are estimated from the histogram: upper bound of the bucket, capped with the max. value """
+
+    BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = None
+        self.histogram = [0] * len(self.BUCKETS)
+
+    def add(self, seconds: float) -> None:
+        value = seconds * 1000
+        self.count += 1
+        self.total += value
+        self.last = value
+        if value > self.max:
+            self.max = value
+        for i, bound in enumerate(self.BUCKETS):
+            if value <= bound:
+                self.histogram[i] += 1
+                break
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else None
+
+    def percentile(self, pct: float) -> float:
+        """ pct - percentile as a fraction e.g. 0.99 """
+        if not self.count:
+            return None
+        rank = pct * self.count
+        cumulative = 0
+        for i, bound in enumerate(self.BUCKETS):
+            cumulative += self.histogram[i]
+            if cumulative >= rank:
+                return round(min(bound, self.max), 3)
+        return round(self.max, 3)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": None if self.mean is None else round(self.mean, 3),
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "max": round(self.max, 3),
+            "last": None if self.last is None else round(self.last, 3),
+            "histogram": {str(bound): count for bound, count in zip(self.BUCKETS, self.histogram) if count},
+        }
+
+
+class RateMeter:
+    """ Events per second over a sliding window of `window` full seconds """
+
+    def __init__(self, window: int = 10):
+        self.total = 0
+        self._window = window
+        self._second = int(time.monotonic())
+        self._counts = [0] * window
+
+    def _advance(self, second: int) -> None:
+        elapsed = second - self._second
+        if elapsed <= 0:
+            return
+        for i in range(1, min(elapsed, self._window) + 1):
+            self._counts[(self._second + i) % self._window] = 0
+        self._second = second
+
+    def add(self, count: int = 1) -> None:
+        self._advance(int(time.monotonic()))
+        self.total += count
+        self._counts[self._second % self._window] += count
+
+    @property
+    def rate(self) -> float:
+        self._advance(int(time.monotonic()))
+        # skip the current, incomplete second
+        return (sum(self._counts) - self._counts[self._second % self._window]) / (self._window - 1)
+
+    def as_dict(self) -> dict:
+        return {"total": self.total, "rate": round(self.rate, 2)}
+
+
+class PriorityLock:
+    """ asyncio lock granted in priority order (lower value first), FIFO within the same priority.
+    Starvation guard: a waiter queued longer than `starvation_limit` seconds is granted the lock ahead of
+    higher priorities. The lock is handed over directly to the next waiter on release """
+
+    def __init__(self, starvation_limit: float = COMMAND_STARVATION_LIMIT, stats: "ConnectionStats" = None):
+        self._starvation_limit = starvation_limit
+        self._stats = stats
+        self._locked = False
+        self._waiters = []      # [priority, seq, queued at, future]
+        self._seq = 0
+
+    def locked(self) -> bool:
+        return self._locked
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, priority: int = COMMAND_PRIORITY_BACKGROUND) -> bool:
+        if not self._locked and not self._waiters:
+            self._locked = True
+            return True
+
+        fut = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        waiter = [priority, self._seq, time.monotonic(), fut]
+        self._waiters.append(waiter)
+        if self._stats is not None and len(self._waiters) > self._stats.queue_depth_max:
+            self._stats.queue_depth_max = len(self._waiters)
+
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # the lock was handed over, but the waiter is gone - pass it on
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        return True
+
+    def release(self) -> None:
+        if not self._locked:
+            raise RuntimeError("Lock is not acquired")
+
+        while self._waiters:
+            waiter = self._next_waiter()
+            self._waiters.remove(waiter)
+            fut = waiter[3]
+            if not fut.done():
+                # stays locked - ownership goes to the waiter
+                fut.set_result(True)
+                return
+
+        self._locked = False
+
+    def _next_waiter(self) -> list:
+        oldest = min(self._waiters, key=lambda w: w[1])
+        best = min(self._waiters, key=lambda w: (w[0], w[1]))
+        if oldest is not best and time.monotonic() - oldest[2] >= self._starvation_limit:
+            if self._stats is not None:
+                self._stats.starvation_promotions += 1
+            return oldest
+        return best
+
+
+class ConnectionStats:
+    """ Controller connection instrumentation. Survives reconnections - owned by ExtaLifeAPI """
+
+    def __init__(self):
+        self.commands = {}                          # command id: round-trip LatencyStats
+        self.command_all = LatencyStats()           # round-trip of all commands
+        self.lock_wait = LatencyStats()             # wait time for the command execution lock
+        self.lock_wait_by_priority = {}             # priority: LatencyStats
+        self.queue_depth_max = 0                    # max. number of commands waiting for execution
+        self.starvation_promotions = 0              # commands executed ahead of priority order due to long wait
+        self.coalesced = 0                          # control commands superseded by a newer one before being sent
+        self.notification_latency = LatencyStats()  # frame received -> notification dispatched
+        self.frames = RateMeter()
+        self.notifications = RateMeter()
+        self.timeouts = 0
+
+    def add_lock_wait(self, priority: int, seconds: float) -> None:
+        self.lock_wait_by_priority.setdefault(priority, LatencyStats()).add(seconds)
+        self.lock_wait.add(seconds)
+
+    def add_command(self, command, seconds: float) -> None:
+        self.commands.setdefault(command, LatencyStats()).add(seconds)
+        self.command_all.add(seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "commands": {str(cmd): stats.as_dict() for cmd, stats in self.commands.items()},
+            "command_all": self.command_all.as_dict(),
+            "lock_wait": self.lock_wait.as_dict(),
+            "lock_wait_by_priority": {str(prio): stats.as_dict() for prio, stats in self.lock_wait_by_priority.items()},
+            "queue_depth_max": self.queue_depth_max,
+            "starvation_promotions": self.starvation_promotions,
+            "coalesced": self.coalesced,
+            "notification_latency": self.notification_latency.as_dict(),
+            "frames": self.frames.as_dict(),
+            "notifications": self.notifications.as_dict(),
+            "timeouts": self.timeouts,
+        }
+
+
+class Trace:
+    """ Spans of a single command lifecycle """
+
+    def __init__(self, trace_id: int, name: str):
+        self.id = trace_id
+        self.name = name
+        self.spans = []
+
+    def add_span(self, name: str, start: float, end: float, **args) -> None:
+        """ start, end - time.monotonic() timestamps """
+        self.spans.append((name, start, end, args))
+
+
+# trace of the command being executed in the current asyncio task, if sampled
+_CURRENT_TRACE = contextvars.ContextVar("extalife_trace", default=None)
+
+
+def current_trace() -> Trace:
+    """ Return trace of the current task or None if the command is not traced """
+    return _CURRENT_TRACE.get()
+
+
+class Tracer:
+    """ Sampled tracing of command lifecycle. Disabled by default; when enabled only every n-th command
+    (on average) is traced, according to the sample rate. The most recent traces are kept in a ring buffer
+    and can be exported in Chrome trace format (chrome://tracing, https://ui.perfetto.dev) """
+
+    def __init__(self):
+        self.sample_rate = 0.0
+        self._traces = deque(maxlen=TRACE_BUFFER_SIZE)
+        self._next_id = 1
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def start(self, sample_rate: float, capacity: int = TRACE_BUFFER_SIZE) -> None:
+        """ sample_rate - fraction of commands to be traced: 0 < sample_rate <= 1 """
+        self.sample_rate = sample_rate
+        if capacity != self._traces.maxlen:
+            self._traces = deque(self._traces, maxlen=capacity)
+
+    def stop(self) -> None:
+        self.sample_rate = 0.0
+
+    def clear(self) -> None:
+        self._traces.clear()
+
+    @contextmanager
+    def trace(self, name: str, **args):
+        """ Trace the enclosed block and everything it awaits in the current task. Yields the Trace or None
+        if not sampled. Inside of an active trace this only adds a span """
+        active = _CURRENT_TRACE.get()
+        if active is None and (not self.sample_rate or random.random() >= self.sample_rate):
+            yield None
+            return
+
+        start = time.monotonic()
+        if active is not None:
+            try:
+                yield active
+            finally:
+                active.add_span(name, start, time.monotonic(), **args)
+            return
+
+        trace = Trace(self._next_id, name)
+        self._next_id += 1
+        token = _CURRENT_TRACE.set(trace)
+        try:
+            yield trace
+        finally:
+            trace.add_span(name, start, time.monotonic(), **args)
+            _CURRENT_TRACE.reset(token)
+            self._traces.append(trace)
+
+    def as_chrome_trace(self) -> dict:
+        """ Export traces in Chrome Trace Event format. Each trace is shown as a separate thread """
+        events = []
+        for trace in self._traces:
+            events.append(
+                {"name": "thread_name", "ph": "M", "pid": 1, "tid": trace.id, "args": {"name": f"{trace.name} #{trace.id}"}}
+            )
+            for (name, start, end, args) in trace.spans:
+                events.append(
+                    {
+                        "name": name,
+                        "cat": "extalife",
+                        "ph": "X",
+                        "ts": round(start * 1e6, 1),
+                        "dur": round((end - start) * 1e6, 1),
+                        "pid": 1,
+                        "tid": trace.id,
+                        "args": args,
+                    }
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
 @attr.s
 class ConnectionParams:
+    """ Connection parameters of a single controller. Each API object owns its own instance """
     eventloop = attr.ib(type=asyncio.events.AbstractEventLoop)
     host = attr.ib(type=str)
     user = attr.ib(type=str)
     password = attr.ib(type=str)
-    on_connect_callback = None
-    on_disconnect_callback = None
-    on_notification_callback = None
-    keepalive = attr.ib(type=float)
+    on_connect_callback = attr.ib(default=None)
+    on_disconnect_callback = attr.ib(default=None)
+    on_notification_callback = attr.ib(default=None)
+    keepalive = attr.ib(type=float, default=8)      # ping period; in seconds
+    port = attr.ib(type=int, default=None)
+    tcp_keepalive = attr.ib(type=tuple, default=(TCP_KEEPALIVE_IDLE, TCP_KEEPALIVE_INTERVAL, TCP_KEEPALIVE_COUNT))
+    watchdog_timeout = attr.ib(type=float, default=WATCHDOG_TIMEOUT)
+    stats = attr.ib(type="ConnectionStats", default=None)
 
 class APIMessage:
     def __init__(self):
@@ -733,8 +1332,6 @@ class TCPAdapter:
     TCP_BUFF_SIZE = 8192
     EFC01_PORT = 20400
 
-    _cmd_in_execution = False
-
     def __init__(self,
             params: ConnectionParams) -> None:
 
@@ -756,15 +1353,21 @@ class TCPAdapter:
         self._tcp_reader: asyncio.StreamReader = None     # type asyncio.StreamReader
         self._tcp_writer: asyncio.StreamWriter = None     # type asyncio.StreamWriter
         self._write_lock = asyncio.Lock()
-        self._cmd_exec_lock = asyncio.Lock()
+        self._cmd_exec_lock = PriorityLock(stats=params.stats)
         self._running_task = None
         self._socket = None
         self._socket_connected = False
         self._ping_task = None
+        self._watchdog_task = None
 
         self._tcp_last_write = datetime.now()
+        self._tcp_last_read = time.monotonic()
 
         self._message_handlers = []
+        # command: [(time.monotonic() until which the response is expected, echo)] - late responses to timed out
+        # messages in send order. Their frames are dropped, otherwise they would be taken as the response to the next
+        # message of the same command. echo - (id, channel) of control command, echoed by the controller in the response
+        self._late_responses = {}
 
         return None
 
@@ -790,12 +1393,65 @@ class TCPAdapter:
             try:
                 await self.async_ping()
             except TCPConnError:
-                _LOGGER.error("%s: Ping Failed!", self._params.address)
+                _LOGGER.error("%s: Ping Failed!", self._params.host)
                 await self._async_on_error()
                 break
 
         _LOGGER.debug("_ping_() - task ends")
 
+    def _start_watchdog(self) -> None:
+        """ Start read-side watchdog task. Controller must send something within the watchdog period """
+
+        if self._params.watchdog_timeout:
+            self._watchdog_task = self._params.eventloop.create_task(self._watchdog_())
+
+    async def _watchdog_(self) -> None:
+        """ Detect dead link faster than a stalled command would. If nothing was received
+        in the watchdog period and a command is waiting for response - the link is considered dead.
+        If the link is simply idle - the controller is probed with a cheap command """
+        timeout = self._params.watchdog_timeout
+        while self._connected:
+            silence = time.monotonic() - self._tcp_last_read
+
+            if silence < timeout:
+                await asyncio.sleep(timeout - silence)
+                continue
+
+            if not self._connected:
+                break
+
+            if self._cmd_exec_lock.locked():
+                # some command awaits response, but the controller is silent
+                _LOGGER.warning("%s: No data received from controller for %s seconds. Connection lost", self._params.host, int(silence))
+                await self._async_on_error()
+                break
+
+            try:
+                await self.async_execute_command(ExtaLifeAPI.CMD_VERSION, None, timeout=WATCHDOG_PROBE_TIMEOUT)
+            except TCPCmdTimeoutError:
+                # the probe is late, but other data arrived in the meantime - the link is alive
+                continue
+            except TCPConnError:
+                _LOGGER.warning("%s: Controller did not answer watchdog probe. Connection lost", self._params.host)
+                break
+            # any response (also command failure) proves the link is alive
+
+        _LOGGER.debug("_watchdog_() - task ends")
+
+    def _set_tcp_keepalive(self) -> None:
+        """ Enable OS-level TCP keepalive on the socket; options not supported by the OS are skipped """
+        if not self._params.tcp_keepalive:
+            return
+
+        idle, interval, count = self._params.tcp_keepalive
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for opt, value in (("TCP_KEEPIDLE", idle), ("TCP_KEEPINTVL", interval), ("TCP_KEEPCNT", count)):
+            if hasattr(socket, opt):
+                self._socket.setsockopt(socket.IPPROTO_TCP, getattr(socket, opt), value)
+        # macOS names TCP_KEEPIDLE differently
+        if not hasattr(socket, "TCP_KEEPIDLE") and hasattr(socket, "TCP_KEEPALIVE"):
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle)
+
     async def async_ping(self) -> None:
         self._check_connected()
         msg =  " " + chr(3)
@@ -821,14 +1477,52 @@ class TCPAdapter:
         await self._async_write(bytes(msg))
 
 
-    async def async_send_message_await_response(self, send_msg, command: str, timeout: float = 30.0): #-> Any:
-        """ Send message to controller and await response """
+    async def async_send_message_await_response(self, send_msg, command: str, deadline: float,
+            priority: int = COMMAND_PRIORITY_BACKGROUND): #-> Any:
+        """ Send message to controller and await response
+
+        deadline - time.monotonic() time by which the response must be received, including wait for the command queue
+
+        priority - position in the command queue, see COMMAND_PRIORITY_*
+
+        A late response tears the connection down only if nothing else was received from the controller
+        in the meantime. Otherwise TCPCmdTimeoutError is raised and the late response will be ignored """
+        responses = await self.async_send_messages_await_responses([send_msg], command, deadline, priority)
+        return responses[0]
+
+    async def async_send_messages_await_responses(self, send_msgs: list, command: str, deadline: float,
+            priority: int = COMMAND_PRIORITY_BACKGROUND, spacing: float = 0.0) -> list:
+        """ Send a sequence of messages of the same command back-to-back and await all the responses.
+        The sequence holds the command queue once, the next message does not wait for the response to the previous one.
+        The controller answers in order, so the n-th complete response belongs to the n-th message
+
+        spacing - time (seconds) to wait for the response to the previous message before the next one is sent
+        anyway. The next message is sent right away when the response comes earlier
+
+        Returns list of responses (lists of frames), one per message. On timeout TCPCmdTimeoutError carries
+        the responses received so far in `completed`, see async_send_message_await_response """
+        stats = self._params.stats
+        trace = current_trace()
+        lock_requested = time.monotonic()
         # prevent controller overloading and command loss - wait until finished (lock released)
-        async with self._cmd_exec_lock:
+        try:
+            await asyncio.wait_for(self._cmd_exec_lock.acquire(priority), deadline - lock_requested)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise TCPCmdTimeoutError(f"Deadline exceeded while waiting for execution of command {command}")      # pylint: disable=raise-missing-from
+
+        try:
+            sent = time.monotonic()
+            stats.add_lock_wait(priority, sent - lock_requested)
             fut = self._params.eventloop.create_future()
+            completed = []
+            answered = asyncio.Event()
             responses = []
+            received = matched = None
+            sent_msgs = []
 
             def on_message(resp: APIResponse):
+                nonlocal responses, received, matched
                 _LOGGER.debug("on_message(), resp: %s", resp.as_dict())
                 if fut.done():
                     return
@@ -840,42 +1534,127 @@ class TCPAdapter:
                     responses.append(resp.as_dict())
                 elif resp.status in ("success", "failure", "partial"):
                     responses.append(resp.as_dict())
-                    fut.set_result(responses)
+                    completed.append(responses)
+                    responses = []
+                    answered.set()
+                    if len(completed) == len(send_msgs):
+                        fut.set_result(completed)
+                        # the frame was read just before being passed to message handlers
+                        received = self._tcp_last_read
+                        matched = time.monotonic()
 
             self._message_handlers.append(on_message)
-            await self.async_send_message(send_msg)
-
             try:
-                await asyncio.wait_for(fut, timeout)
+                for i, send_msg in enumerate(send_msgs):
+                    if i and spacing and len(completed) < i:
+                        answered.clear()
+                        try:
+                            await asyncio.wait_for(answered.wait(), spacing - (time.monotonic() - written))
+                        except asyncio.TimeoutError:
+                            pass
+                    if callable(send_msg):
+                        # message built only now - after wait in the queue
+                        send_msg = send_msg()
+                    await self.async_send_message(send_msg)
+                    sent_msgs.append(send_msg)
+                    written = time.monotonic()
+
+                try:
+                    await asyncio.wait_for(fut, deadline - written)
+
+                except asyncio.TimeoutError:
+                    if self._stopped:
+                        raise TCPConnError(
+                            "Disconnected while waiting for API response!")             # pylint: disable=raise-missing-from
+                    stats.timeouts += 1
+                    if self._tcp_last_read > written:
+                        # the controller is alive - just this one command is late
+                        expires = time.monotonic() + LATE_RESPONSE_EXPIRY
+                        self._late_responses.setdefault(command, []).extend(
+                            (expires, self._get_echo(json.loads(msg[:-1]).get("data"))) for msg in sent_msgs[len(completed):]
+                        )
+                        raise TCPCmdTimeoutError(f"Timeout while waiting for response to command {command}",       # pylint: disable=raise-missing-from
+                            completed=completed)
+                    await self._async_on_error()
+                    raise TCPConnError("Timeout while waiting for API response!")       # pylint: disable=raise-missing-from
+            finally:
+                try:
+                    self._message_handlers.remove(on_message)
+                except ValueError:
+                    pass
+
+            done = time.monotonic()
+            stats.add_command(command, done - sent)
+
+            if trace is not None:
+                trace.add_span("lock_wait", lock_requested, sent)
+                trace.add_span("socket_write", sent, written)
+                trace.add_span("controller", written, received, command=command)
+                trace.add_span("response_match", received, matched)
+                trace.add_span("task_wakeup", matched, done)
+
+            return completed
+
+        finally:
+            self._cmd_exec_lock.release()
 
-            except asyncio.TimeoutError:
-                if self._stopped:
-                    raise TCPConnError(
-                        "Disconnected while waiting for API response!")             # pylint: disable=raise-missing-from
-                await self._async_on_error()
-                raise TCPConnError("Timeout while waiting for API response!")       # pylint: disable=raise-missing-from
-
-            try:
-                self._message_handlers.remove(on_message)                           # pylint: disable=raise-missing-from
-            except ValueError:
-                pass
-
-
-            return responses
-            # return
-
-    async def async_execute_command(self, command: str, data) -> list:
-
-        # request = {"command": command, "data": data}
-        # req = self._json_to_tcp(request)
+    @staticmethod
+    def _encode(command, data) -> bytes:
+        encode_start = time.monotonic()
         req = APIRequest(command, data)
         msg = str(req.as_json() + chr(3)).encode()
-        response = await self.async_send_message_await_response(msg, command)
-
-        if len(response) == 0:
+        trace = current_trace()
+        if trace is not None:
+            trace.add_span("encode", encode_start, time.monotonic())
+        return msg
+
+    async def async_execute_command(self, command: str, data, timeout: float = None, deadline: float = None,
+            priority: int = None) -> list:
+        """ Execute command and return list of response frames (dicts)
+
+        data - command data or a function returning it, to be called right before the command is sent
+
+        timeout - max. time (seconds) for the command to complete, including wait for the command queue.
+        Default depends on command class, see ExtaLifeAPI.COMMAND_TIMEOUTS
+
+        deadline - alternatively: time.monotonic() time by which the command must complete,
+        e.g. shared by a sequence of commands
+
+        priority - position in the command queue, see COMMAND_PRIORITY_*.
+        Default depends on command, see ExtaLifeAPI.COMMAND_PRIORITIES """
+        responses = await self.async_execute_commands(command, [data], timeout, deadline, priority)
+        return responses[0]
+
+    async def async_execute_commands(self, command: str, data_seq: list, timeout: float = None, deadline: float = None,
+            priority: int = None, spacing: float = 0.0) -> list:
+        """ Execute a sequence of commands of the same type pipelined: sent back-to-back within one slot
+        of the command queue, without waiting for the response to the previous one
+
+        Returns list of responses (lists of response frames), one per item of data_seq.
+        For parameters see async_execute_command and async_send_messages_await_responses """
+        if priority is None:
+            priority = ExtaLifeAPI.get_command_priority(command)
+        if deadline is None:
+            if timeout is None:
+                timeout = ExtaLifeAPI.get_command_timeout(command)
+            deadline = time.monotonic() + timeout
+
+        msgs = []
+        for data in data_seq:
+            if callable(data):
+                # data evaluated once the command leaves the queue - see ExtaLifeAPI._async_execute_coalesced
+                def msg(data=data):
+                    return self._encode(command, data())
+            else:
+                msg = self._encode(command, data)
+            msgs.append(msg)
+
+        responses = await self.async_send_messages_await_responses(msgs, command, deadline, priority, spacing)
+
+        if any(len(response) == 0 for response in responses):
             raise TCPConnError("No response received from Controller!")
 
-        return response
+        return responses
 
     async def _async_recv(self) -> bytes:
 
@@ -920,11 +1699,13 @@ class TCPAdapter:
         self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._socket.setblocking(False)
         self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._set_tcp_keepalive()
 
+        port = self._params.port if self._params.port else self.EFC01_PORT
         _LOGGER.debug("Connecting to %s:%s", self._params.host,
-                      self.EFC01_PORT, )
+                      port, )
         try:
-            coro = self._params.eventloop.sock_connect(self._socket, (self._params.host, self.EFC01_PORT))
+            coro = self._params.eventloop.sock_connect(self._socket, (self._params.host, port))
             await asyncio.wait_for(coro, 30.0)
         except OSError as err:
             await self._async_on_error()
@@ -938,13 +1719,15 @@ class TCPAdapter:
         _LOGGER.debug("%s: Opened socket for", self._params.host)
         self._tcp_reader, self._tcp_writer = await asyncio.open_connection(sock=self._socket)
         self._socket_connected = True
-        self._params.eventloop.create_task(self.async_run_forever())
+        self._tcp_last_read = time.monotonic()
+        self._running_task = self._params.eventloop.create_task(self.async_run_forever())
 
         _LOGGER.debug("Successfully connected ")
 
         self._connected = True
 
         self._start_ping()
+        self._start_watchdog()
 
     async def async_login(self) -> None:
         """
@@ -990,23 +1773,70 @@ class TCPAdapter:
     async def _async_run_once(self) -> None:
 
         raw_msg = await self._async_recv()
+        self._tcp_last_read = time.monotonic()
+        self._params.stats.frames.add()
 
         msg = raw_msg.decode()
 
         resp = APIResponse.from_json(msg)
         _LOGGER.debug("_async_run_once, msg: %s", msg)
 
+        if self._late_responses and self._is_late_response(resp):
+            _LOGGER.debug("Late response to command %s dropped", resp.command)
+            return
+
         for msg_handler in self._message_handlers[:]:
             msg_handler(resp)
 
         await self._handle_notification(resp)
 
+    def _is_late_response(self, resp: APIResponse) -> bool:
+        """ Is the frame a part of response to a message which has already timed out?
+
+        The controller answers in order. A response echoing other request than the oldest late one belongs
+        to a newer message, so the late response will never come. Responses without echo (fetches, failures)
+        are paired by order only """
+        late = self._late_responses.get(resp.command)
+        if late is None or resp.status == "notification":
+            return False
+
+        now = time.monotonic()
+        while late and late[0][0] < now:
+            # never came
+            late.pop(0)
+
+        echo = self._get_echo(resp.data)
+        is_late = False
+        while late:
+            expected = late[0][1]
+            if expected is None or echo is None or expected == echo:
+                is_late = True
+                if resp.status != "searching":
+                    # the last frame of the response
+                    late.pop(0)
+                break
+            late.pop(0)
+
+        if not late:
+            del self._late_responses[resp.command]
+        return is_late
+
+    @staticmethod
+    def _get_echo(data) -> tuple:
+        """ (id, channel) of control command data or of response to it; None for other commands """
+        if isinstance(data, dict) and "id" in data:
+            return data.get("id"), data.get("channel")
+        return None
+
     async def _handle_notification(self, resp: APIResponse):
         _LOGGER.debug("_handle_notification(), resp: %s", resp.as_dict())
 
         # pass only status change notifications to registered listeners
         if resp.status == "notification" and self._params.on_notification_callback is not None:
             await self._params.on_notification_callback(resp.as_dict())
+            stats = self._params.stats
+            stats.notifications.add()
+            stats.notification_latency.add(time.monotonic() - self._tcp_last_read)
 
     async def _async_on_error(self) -> None:
         await self.async_stop(force=True)
@@ -1018,13 +1848,15 @@ class TCPAdapter:
             return
 
         self._stopped = True
-        if self._running_task is not None:
+        if self._running_task is not None and self._running_task is not asyncio.current_task():
             self._running_task.cancel()
 
-        if self._ping_task is not None:
-            self._ping_task.cancel()
+        for task in (self._ping_task, self._watchdog_task):
+            if task is None or task is asyncio.current_task():
+                continue
+            task.cancel()
             try:
-                await self._ping_task
+                await task
             except asyncio.CancelledError:
                 pass
 
@@ -1045,47 +1877,72 @@ class TCPAdapter:
             await self._on_disconnect_callback()
 
     @staticmethod
-    def discover_controller():
+    async def async_discover_controllers(loop: AbstractEventLoop, timeout: float = DISCOVERY_TIMEOUT, first_only: bool = False) -> list:
         """
-        Perform controller autodiscovery using UDP query
-        return IP as string or false if not found
+        Perform controller autodiscovery by listening to UDP multicast broadcasts of EFC-01
+        return list of dicts (host, mac, name) of all controllers found within `timeout` seconds.
+        mac and name are None unless the controller firmware broadcasts them
+
+        first_only - return as soon as the first controller is found
         """
-        MCAST_GRP = "225.0.0.1"
-        MCAST_PORT = 20401
         import struct
 
-        # sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        server_address = ("", MCAST_PORT)
-
         # Create the socket
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 
         # Bind to the server address
         try:
-            sock.bind(server_address)
-        except socket.error as e:               # pylint: disable=usused-variable
+            sock.bind(("", EFC01_MCAST_PORT))
+        except socket.error:
             sock.close()
-            sock = None
-            _LOGGER.error("Could not connect to receive UDP multicast from EFC-01 on port %s", MCAST_PORT)
-            return False
+            _LOGGER.error("Could not connect to receive UDP multicast from EFC-01 on port %s", EFC01_MCAST_PORT)
+            return []
         # Tell the operating system to add the socket to the multicast group
         # on all interfaces (join multicast group)
-        group = socket.inet_aton(MCAST_GRP)
+        group = socket.inet_aton(EFC01_MCAST_GRP)
         mreq = struct.pack("4sL", group, socket.INADDR_ANY)
         sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+        sock.setblocking(False)
+
+        found = {}
+        done = loop.create_future()
 
-        sock.settimeout(3)
+        def on_found(controller: dict):
+            if controller["host"] in found:
+                return
+            _LOGGER.debug("Found EFC-01 controller: %s", controller)
+            found[controller["host"]] = controller
+            if first_only and not done.done():
+                done.set_result(None)
+
+        transport, _ = await loop.create_datagram_endpoint(lambda: DiscoveryProtocol(on_found), sock=sock)
         try:
-            data, address = sock.recvfrom(1024)
-        except Exception:                       # pylint: disable=broad-except
-            sock.close()
-            return
-        sock.close()
-        _LOGGER.debug("Got multicast response from EFC-01: %s", str(data.decode()))
-        if data == b'{"status":"broadcast","command":0,"data":null}\x03':
-            return address[0]  # return IP - array[0]; array[1] is sender's port
-        return
+            await asyncio.wait([done], timeout=timeout)
+        finally:
+            # also when cancelled
+            transport.close()
+            if not done.done():
+                done.cancel()
 
+        return list(found.values())
 
 
+class DiscoveryProtocol(asyncio.DatagramProtocol):
+    """ Receives EFC-01 multicast broadcasts """
+
+    def __init__(self, on_found_callback) -> None:
+        self._on_found_callback = on_found_callback
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        _LOGGER.debug("Got multicast response from EFC-01: %s", data)
+        try:
+            msg = json.loads(data.decode().rstrip(chr(3)))
+        except (UnicodeDecodeError, ValueError):
+            return
+
+        if not isinstance(msg, dict) or msg.get("status") != "broadcast" or msg.get("command") != 0:
+            return
 
+        info = msg.get("data") if isinstance(msg.get("data"), dict) else {}
+        self._on_found_callback({"host": addr[0], "mac": info.get("mac"), "name": info.get("name")})
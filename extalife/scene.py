@@ -0,0 +1,96 @@
+"""Support for Exta Life controller scenes"""
+import logging
+from typing import Any
+
+from homeassistant.components.scene import DOMAIN as DOMAIN_SCENE, Scene
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.typing import HomeAssistantType
+
+from .helpers.const import DOMAIN, SIGNAL_CONNECTION_STATE
+from .helpers.core import Core
+from .pyextalife import ExtaLifeAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(hass: HomeAssistantType, config_entry: ConfigEntry, async_add_entities):
+    """Set up Exta Life scenes based on existing config."""
+
+    core = Core.get(config_entry.entry_id)
+    if core.api.mac is None:
+        # MAC is a part of unique ids of scenes
+        _LOGGER.warning("Controller MAC address is unknown - scenes are not created until it's resolved and the entry is reloaded")
+        return
+
+    core.async_setup_platform_entities(
+        DOMAIN_SCENE, async_add_entities, lambda scene: ExtaLifeScene(scene, config_entry)
+    )
+
+
+class ExtaLifeScene(Scene):
+    """Scene defined in the controller. Activated by a single command - the controller
+    then controls all devices of the scene on its own"""
+
+    def __init__(self, scene: dict, config_entry: ConfigEntry):
+        # e.g. scene = { "id": 1, "data": {notification data}}
+        self.scene_id: int = scene.get("id")
+        self.config_entry = config_entry
+
+        data = scene.get("data") or {}
+        self._attr_name = data.get("alias") or f"Scene {self.scene_id}"
+
+    @staticmethod
+    def get_unique_id(mac: str, scene_id: int) -> str:
+        return f"extalife-{mac}-scene-{scene_id}"
+
+    @staticmethod
+    def get_scene_id(unique_id: str) -> int:
+        """Scene id from unique id of the entity or None if it's not a scene entity"""
+        prefix, sep, scene_id = unique_id.rpartition("-scene-")
+        if not sep or not prefix.startswith("extalife-"):
+            return None
+        try:
+            return int(scene_id)
+        except ValueError:
+            return None
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+
+        self.async_on_remove(
+            self.core.async_signal_register(SIGNAL_CONNECTION_STATE, self.async_connection_state_callback)
+        )
+
+    async def async_connection_state_callback(self):
+        """Inform HA of availability change after controller connection was lost or restored"""
+        self.async_write_ha_state()
+
+    @property
+    def core(self):
+        return Core.get(self.config_entry.entry_id)
+
+    @property
+    def controller(self) -> ExtaLifeAPI:
+        return self.core.api
+
+    @property
+    def unique_id(self) -> str:
+        return self.get_unique_id(self.controller.mac, self.scene_id)
+
+    @property
+    def should_poll(self):
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self.controller.is_connected
+
+    @property
+    def device_info(self):
+        """Scenes belong to the controller device"""
+        return {"identifiers": {(DOMAIN, self.controller.mac)}}
+
+    async def async_activate(self, **kwargs: Any) -> None:
+        """Activate the scene in the controller"""
+        if await self.controller.async_activate_scene(self.scene_id) is None:
+            _LOGGER.error("Scene %s could not be activated", self.scene_id)
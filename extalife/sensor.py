@@ -1,7 +1,9 @@
 """Support for Exta Life sensor devices"""
 from dataclasses import dataclass
 import logging
-from pprint import pformat
+from functools import partial
+import time
+from typing import Any, Callable
 
 from homeassistant.backports.enum import StrEnum
 
@@ -13,6 +15,7 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 
 from homeassistant.const import (
     PERCENTAGE,
@@ -27,20 +30,26 @@ from homeassistant.const import (
     POWER_VOLT_AMPERE,
     ENERGY_KILO_WATT_HOUR,
     LIGHT_LUX,
+    TIME_MILLISECONDS,
 )
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import HomeAssistantType
 
 from . import ExtaLifeChannel
 from .helpers.core import Core
 from .helpers.const import (
+    DOMAIN,
     DOMAIN_VIRTUAL_SENSORS,
     DOMAIN_VIRTUAL_SENSOR,
     VIRT_SENSOR_CHN_FIELD,
     VIRT_SENSOR_DEV_CLS,
     VIRT_SENSOR_PATH,
     VIRT_SENSOR_ALLOWED_CHANNELS,
+    VIRT_SENSOR_ENABLED_DEFAULT,
 )
 from .pyextalife import (           # pylint: disable=syntax-error
+    LatencyStats,
     DEVICE_ARR_SENS_ENERGY_METER,
     DEVICE_ARR_SENS_TEMP,
     DEVICE_ARR_SENS_LIGHT,
@@ -52,6 +61,10 @@ from .pyextalife import (           # pylint: disable=syntax-error
 _LOGGER = logging.getLogger(__name__)
 
 
+# max. time (seconds) a state change filtered out by deadband / min. write interval waits before it's written anyway
+SENSOR_MAX_AGE = 300
+
+
 @dataclass
 class ELSensorEntityDescription(SensorEntityDescription):
     """Sensor entity config description"""
@@ -59,6 +72,9 @@ class ELSensorEntityDescription(SensorEntityDescription):
     key: str = ""
     factor: float = 1  # value scaling factor to have a value in normalized units like Watt, Volt etc
     value_path: str = "value_1"  # path to the value field in channel_data
+    deadband: float = 0  # min. change of the value (in normalized units) to be written to HA right away
+    min_interval: float = 0  # min. time (seconds) between state writes
+    enabled_default: bool = True  # are virtual (attribute) sensors of this type enabled in entity registry by default
 
 class SensorEntityConfig():
     """ This class MUST correspond to class ELSensorEntityDescription.
@@ -68,6 +84,9 @@ class SensorEntityConfig():
         self.key: str = descr.key
         self.factor: float = descr.factor
         self.value_path: str = descr.value_path
+        self.deadband: float = descr.deadband
+        self.min_interval: float = descr.min_interval
+        self.enabled_default: bool = descr.enabled_default
 
         self.native_unit_of_measurement: str = descr.native_unit_of_measurement
         self.device_class: str = descr.device_class
@@ -138,6 +157,8 @@ SENSOR_TYPES: dict[str, ELSensorEntityDescription] = {
         state_class=SensorStateClass.TOTAL_INCREASING,
         value_path='total_energy',
         factor=0.00001,
+        deadband=0.01,
+        min_interval=10,
     ),
     ExtaSensorDeviceClass.MANUAL_ENERGY: ELSensorEntityDescription(
         native_unit_of_measurement=ENERGY_KILO_WATT_HOUR,
@@ -145,62 +166,92 @@ SENSOR_TYPES: dict[str, ELSensorEntityDescription] = {
         state_class=SensorStateClass.TOTAL_INCREASING,
         value_path='manual_energy',
         factor=0.00001,
+        deadband=0.01,
+        min_interval=10,
+        enabled_default=False,
     ),
     ExtaSensorDeviceClass.APPARENT_ENERGY: ELSensorEntityDescription(
         native_unit_of_measurement="kVAh",
         device_class=ExtaSensorDeviceClass.APPARENT_ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
         factor=0.00001,
+        deadband=0.01,
+        min_interval=10,
+        enabled_default=False,
     ),
     ExtaSensorDeviceClass.REACTIVE_ENERGY: ELSensorEntityDescription(
         native_unit_of_measurement="kvarh",
         device_class=ExtaSensorDeviceClass.REACTIVE_ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
         factor=0.00001,
+        deadband=0.01,
+        min_interval=10,
+        enabled_default=False,
     ),
     SensorDeviceClass.POWER: ELSensorEntityDescription(
         native_unit_of_measurement=POWER_WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
+        deadband=5,
+        min_interval=5,
     ),
     SensorDeviceClass.REACTIVE_POWER: ELSensorEntityDescription(
         native_unit_of_measurement=POWER_VOLT_AMPERE_REACTIVE,
         device_class=SensorDeviceClass.REACTIVE_POWER,
         state_class=SensorStateClass.MEASUREMENT,
+        deadband=5,
+        min_interval=5,
+        enabled_default=False,
     ),
     SensorDeviceClass.APPARENT_POWER: ELSensorEntityDescription(
         native_unit_of_measurement=POWER_VOLT_AMPERE,
         device_class=SensorDeviceClass.APPARENT_POWER,
         state_class=SensorStateClass.MEASUREMENT,
+        deadband=5,
+        min_interval=5,
+        enabled_default=False,
     ),
     SensorDeviceClass.VOLTAGE: ELSensorEntityDescription(
         native_unit_of_measurement=ELECTRIC_POTENTIAL_VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
         factor=0.01,
+        deadband=1,
+        min_interval=10,
     ),
     SensorDeviceClass.POWER_FACTOR: ELSensorEntityDescription(
         device_class=SensorDeviceClass.POWER_FACTOR,
         state_class=SensorStateClass.MEASUREMENT,
         factor=0.001,
+        deadband=0.02,
+        min_interval=10,
+        enabled_default=False,
     ),
     SensorDeviceClass.CURRENT: ELSensorEntityDescription(
         native_unit_of_measurement=ELECTRIC_CURRENT_AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
         factor=0.001,
+        deadband=0.05,
+        min_interval=5,
     ),
     SensorDeviceClass.FREQUENCY: ELSensorEntityDescription(
         native_unit_of_measurement=FREQUENCY_HERTZ,
         device_class=SensorDeviceClass.FREQUENCY,
         state_class=SensorStateClass.MEASUREMENT,
         factor=0.01,
+        deadband=0.05,
+        min_interval=10,
+        enabled_default=False,
     ),
     ExtaSensorDeviceClass.PHASE_SHIFT: ELSensorEntityDescription(
         native_unit_of_measurement=DEGREE,
         device_class=ExtaSensorDeviceClass.PHASE_SHIFT,
         state_class=SensorStateClass.MEASUREMENT,
         factor=0.1,
+        deadband=1,
+        min_interval=10,
+        enabled_default=False,
     ),
     SensorDeviceClass.PRESSURE: ELSensorEntityDescription(
         native_unit_of_measurement=PRESSURE_HPA,
@@ -231,10 +282,84 @@ SENSOR_TYPES: dict[str, ELSensorEntityDescription] = {
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
         factor=1,
+        deadband=0.2,
     ),
 }
 
 
+@dataclass
+class ELDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Controller diagnostic sensor description. Provide either `stats_fn` - the sensor shows
+    mean latency of the values collected since its last update, or `value_fn` - the sensor shows the value returned"""
+
+    key: str = ""
+    stats_fn: Callable[[Core], LatencyStats] = None
+    value_fn: Callable[[Core], Any] = None
+
+
+DIAGNOSTIC_SENSORS: tuple[ELDiagnosticSensorEntityDescription, ...] = (
+    ELDiagnosticSensorEntityDescription(
+        key="command_latency",
+        name="command latency",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=TIME_MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        stats_fn=lambda core: core.api.stats.command_all,
+    ),
+    ELDiagnosticSensorEntityDescription(
+        key="command_lock_wait",
+        name="command queue wait",
+        icon="mdi:timer-sand",
+        native_unit_of_measurement=TIME_MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        stats_fn=lambda core: core.api.stats.lock_wait,
+    ),
+    ELDiagnosticSensorEntityDescription(
+        key="frame_rate",
+        name="frames received",
+        icon="mdi:swap-horizontal",
+        native_unit_of_measurement="frames/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda core: round(core.api.stats.frames.rate, 2),
+    ),
+    ELDiagnosticSensorEntityDescription(
+        key="notification_latency",
+        name="notification dispatch latency",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=TIME_MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        stats_fn=lambda core: core.api.stats.notification_latency,
+    ),
+    ELDiagnosticSensorEntityDescription(
+        key="poll_duration",
+        name="poll duration",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=TIME_MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        stats_fn=lambda core: core.data_manager.poll_stats,
+    ),
+    ELDiagnosticSensorEntityDescription(
+        key="discovery_duration",
+        name="discovery duration",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=TIME_MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        stats_fn=lambda core: core.data_manager.discovery_stats,
+    ),
+    ELDiagnosticSensorEntityDescription(
+        key="command_timeouts",
+        name="command timeouts",
+        icon="mdi:timer-alert-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda core: core.api.stats.timeouts,
+    ),
+)
+
+
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """setup via configuration.yaml not supported anymore"""
 
@@ -245,29 +370,29 @@ async def async_setup_entry(
     """Set up Exta Life sensors based on existing config."""
 
     core = Core.get(config_entry.entry_id)
-    channels = core.get_channels(DOMAIN_SENSOR)
-
-    _LOGGER.debug("Discovery: %s", pformat(channels))
-    if channels:
-        async_add_entities(
-            [ExtaLifeSensor(device, config_entry) for device in channels]
-        )
-
-    core.pop_channels(DOMAIN_SENSOR)
+    core.async_setup_platform_entities(
+        DOMAIN_SENSOR, async_add_entities, lambda device: ExtaLifeSensor(device, config_entry)
+    )
 
     # time for virtual, entity sensors
     for virtual_domain in DOMAIN_VIRTUAL_SENSORS:
-        channels = core.get_channels(virtual_domain)
-        _LOGGER.debug("Discovery (%s): %s", virtual_domain, pformat(channels))
-        if channels:
-            async_add_entities(
-                [
-                    ExtaLifeVirtualSensor(device, config_entry, virtual_domain)
-                    for device in channels
-                ]
-            )
+        core.async_setup_platform_entities(
+            virtual_domain,
+            async_add_entities,
+            partial(ExtaLifeVirtualSensor, config_entry=config_entry, virtual_domain=virtual_domain),
+        )
 
-        core.pop_channels(virtual_domain)
+    # controller diagnostic sensors; the platform is set up once, newly discovered devices are added directly.
+    # They are identified by the controller MAC - without it they would share ids with other controllers
+    if core.api.mac is None:
+        _LOGGER.warning(
+            "MAC address of the controller %s is unknown, diagnostic sensors not created", core.api.host
+        )
+        return
+
+    async_add_entities(
+        [ExtaLifeDiagnosticSensor(config_entry, descr) for descr in DIAGNOSTIC_SENSORS]
+    )
 
 
 class ExtaLifeSensorBase(ExtaLifeChannel, SensorEntity):
@@ -279,6 +404,21 @@ class ExtaLifeSensorBase(ExtaLifeChannel, SensorEntity):
         # self.channel_data = channel_data.get("data")
         self._config: SensorEntityConfig = None
 
+        # state write filtering: value and time (time.monotonic()) of the last write, pending flush of held changes
+        self._written_value = None
+        self._written_at: float = None
+        self._flush_at: float = None
+        self._flush_remove = None
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        # state is written when entity is added
+        self._set_written()
+
+    async def async_will_remove_from_hass(self) -> None:
+        await super().async_will_remove_from_hass()
+        self._cancel_flush()
+
     @property
     def device_class(self):
         return self._config.device_class
@@ -295,17 +435,19 @@ class ExtaLifeSensorBase(ExtaLifeChannel, SensorEntity):
     def native_value(self):
         """Return state of the sensor"""
 
-        value = self.get_value_from_attr_path(self._config.value_path)
+        return self._get_native_value(self.channel_data)
+
+    def _get_native_value(self, data: dict):
+        value = self.get_value_from_attr_path(self._config.value_path, data)
 
         if value:
             value = value * self._config.factor
 
         return value
 
-    @property
-    def extra_state_attributes(self):
+    def build_state_attributes(self) -> dict:
         """Return device specific state attributes."""
-        attr = super().extra_state_attributes
+        attr = super().build_state_attributes()
 
         data = self.channel_data
         if data.get("sync_time") is not None:
@@ -322,10 +464,84 @@ class ExtaLifeSensorBase(ExtaLifeChannel, SensorEntity):
 
         self.channel_data.update(data)
 
+        if self._hold_update(self.channel_data):
+            # keep DataManager data in sync, but don't write insignificant change to HA (state machine & recorder)
+            self._revision = self.data_poller.update_channel(self.channel_id, self.channel_data)
+            return
+
         # synchronize DataManager data with processed update & entity data
         self.sync_data_update_ha()
 
-    def get_value_from_attr_path(self, path: str):
+    async def async_update_callback(self):
+        """Inform HA of state update from status poller - unless the change is insignificant"""
+        if self.is_revision_current:
+            return
+
+        channel_indx = self.data_poller.channels_indx
+        data = channel_indx.get(self.channel_id)
+        if data is not None and self.data_available and self._hold_update(data):
+            self.channel_data = data
+            self._revision = channel_indx.get_revision(self.channel_id)
+            return
+
+        self._set_written(data)
+        await super().async_update_callback()
+
+    def sync_data_update_ha(self):
+        self._set_written()
+        super().sync_data_update_ha()
+
+    def _hold_update(self, data: dict) -> bool:
+        """Should the update be held instead of written to HA? The update is written if the value changed
+        by deadband or more since the last write, but not sooner than min. interval after it.
+        Held updates are written by the flush timer: after min. interval if the change is significant,
+        otherwise after SENSOR_MAX_AGE"""
+        config = self._config
+        if self._written_at is None or (not config.deadband and not config.min_interval):
+            return False
+
+        value = self._get_native_value(data)
+        significant = True
+        if config.deadband and isinstance(value, (int, float)) and isinstance(self._written_value, (int, float)):
+            # tolerate float rounding of scaled values
+            significant = abs(value - self._written_value) >= config.deadband - 1e-9
+
+        delay = (config.min_interval if significant else SENSOR_MAX_AGE) - (time.monotonic() - self._written_at)
+        if delay <= 0:
+            return False
+
+        self._schedule_flush(delay)
+        return True
+
+    def _set_written(self, data: dict = None) -> None:
+        """Record state write of the channel data (current one if not given)"""
+        self._cancel_flush()
+        self._written_value = self._get_native_value(self.channel_data if data is None else data)
+        self._written_at = time.monotonic()
+
+    def _schedule_flush(self, delay: float) -> None:
+        flush_at = time.monotonic() + delay
+        if self._flush_remove is not None:
+            if self._flush_at <= flush_at:
+                return
+            self._flush_remove()
+
+        self._flush_at = flush_at
+        self._flush_remove = async_call_later(self.hass, delay, self._async_flush)
+
+    def _cancel_flush(self) -> None:
+        if self._flush_remove is not None:
+            self._flush_remove()
+            self._flush_remove = None
+
+    @callback
+    def _async_flush(self, now):
+        """Write held update"""
+        self._flush_remove = None
+        self._set_written()
+        self.async_write_ha_state()
+
+    def get_value_from_attr_path(self, path: str, data: dict = None):
         """Extract value from encoded path"""
         # Example path: 'phase[1].voltage   -> array phase, row 1, field voltage
         # attr.append({"dev_class": dev_class, "path": f"?phase[{c}]{k}", "unit": unit})
@@ -349,7 +565,7 @@ class ExtaLifeSensorBase(ExtaLifeChannel, SensorEntity):
 
             return _find_element(_keys.split("."), dictionary)
 
-        return find_element(path, self.channel_data)
+        return find_element(path, self.channel_data if data is None else data)
 
 class ExtaLifeSensor(ExtaLifeSensorBase):
     """Representation of Exta Life Sensors"""
@@ -388,6 +604,8 @@ class ExtaLifeSensor(ExtaLifeSensorBase):
                             {
                                 VIRT_SENSOR_DEV_CLS: dev_class,
                                 VIRT_SENSOR_PATH: f"phase[{phase.index(p)}].{k}",
+                                # per-phase values are rarely used; the meter reports totals too
+                                VIRT_SENSOR_ENABLED_DEFAULT: False,
                             }
                         )
 
@@ -407,6 +625,9 @@ class ExtaLifeVirtualSensor(ExtaLifeSensorBase):
 
         self.override_config_from_dict(self._virtual_prop)
 
+        # rarely used sensors are registered disabled. HA doesn't add disabled entities to the state machine,
+        # so they don't subscribe to signals nor write state until the user enables them
+        self._attr_entity_registry_enabled_default = self._config.enabled_default
 
     def override_config_from_dict(self, override: dict):
         """Override sensor config from a dict"""
@@ -436,4 +657,64 @@ class ExtaLifeVirtualSensor(ExtaLifeSensorBase):
     @property
     def name(self) -> str:
         """Entity name = default name + escaped name suffix (whitespaces)"""
+        return self.get_cached_metadata("name", self._build_name)
+
+    def _build_name(self) -> str:
         return f"{super().name} {self.get_name_suffix(self._virtual_prop.get(VIRT_SENSOR_PATH))}"
+
+
+class ExtaLifeDiagnosticSensor(SensorEntity):
+    """Controller instrumentation exposed as a diagnostic sensor of the controller device"""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, config_entry: ConfigEntry, description: ELDiagnosticSensorEntityDescription):
+        self.entity_description = description
+        self._entry_id = config_entry.entry_id
+        self._value = None
+        # (count, total) of the latency stats at the last update
+        self._last_stats = (0, 0.0)
+
+    @property
+    def core(self):
+        return Core.get(self._entry_id)
+
+    @property
+    def unique_id(self):
+        return f"{self.core.api.mac}-{self.entity_description.key}"
+
+    @property
+    def name(self) -> str:
+        return f"{self.core.api.name} {self.entity_description.name}"
+
+    @property
+    def device_info(self):
+        """Attach the entity to the controller device"""
+        return {"identifiers": {(DOMAIN, self.core.api.mac)}}
+
+    @property
+    def native_value(self):
+        return self._value
+
+    @property
+    def extra_state_attributes(self):
+        descr = self.entity_description
+        if descr.stats_fn is None:
+            return None
+        stats = descr.stats_fn(self.core).as_dict()
+        stats.pop("histogram")
+        return stats
+
+    async def async_update(self):
+        """Called by HA on the platform scan interval"""
+        descr = self.entity_description
+        if descr.value_fn is not None:
+            self._value = descr.value_fn(self.core)
+            return
+
+        # mean of the values collected since the last update; keep the previous one if there were none
+        stats = descr.stats_fn(self.core)
+        count, total = self._last_stats
+        if stats.count > count:
+            self._value = round((stats.total - total) / (stats.count - count), 2)
+        self._last_stats = (stats.count, stats.total)
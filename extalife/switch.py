@@ -1,6 +1,5 @@
 """Support for Exta Life on/off switches: ROP, ROM, ROG devices"""
 import logging
-from pprint import pformat
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.switch import SwitchEntity, DOMAIN as DOMAIN_SWITCH
@@ -9,6 +8,7 @@ from homeassistant.helpers.typing import HomeAssistantType
 from . import ExtaLifeChannel
 from .helpers.const import DOMAIN_VIRTUAL_SWITCH_SENSOR
 from .helpers.core import Core
+from .helpers.group import ExtaLifeGroup, get_groups
 from .pyextalife import ExtaLifeAPI     # pylint: disable=syntax-error
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,12 +20,18 @@ async def async_setup_entry(hass: HomeAssistantType, config_entry: ConfigEntry,
     """Set up Exta Life switches based on existing config."""
 
     core = Core.get(config_entry.entry_id)
-    channels = core.get_channels(DOMAIN_SWITCH)
+    core.async_setup_platform_entities(
+        DOMAIN_SWITCH, async_add_entities, lambda device: ExtaLifeSwitch(device, config_entry)
+    )
 
-    _LOGGER.debug("Discovery: %s", pformat(channels))
-    async_add_entities([ExtaLifeSwitch(device, config_entry) for device in channels])
+    async_add_entities([ExtaLifeSwitchGroup(group, config_entry) for group in get_groups(config_entry, DOMAIN_SWITCH)])
 
-    core.pop_channels(DOMAIN_SWITCH)
+def is_switch_on(data: dict) -> bool:
+    """Return true if switch channel data says it's on"""
+    field = "power" if data.get("output_state") is None else "output_state"
+    state = data.get(field)
+
+    return state == 1 or state == True
 
 class ExtaLifeSwitch(ExtaLifeChannel, SwitchEntity):
     """Representation of an ExtaLife Switch."""
@@ -44,12 +50,10 @@ class ExtaLifeSwitch(ExtaLifeChannel, SwitchEntity):
     async def async_turn_on(self, **kwargs):
         """Turn on the switch."""
         if not self.is_exta_free:
-            if await self.async_action(ExtaLifeAPI.ACTN_TURN_ON):
-                field = "power" if self.channel_data.get("output_state") is None else "output_state"
-                self.channel_data[field] = 1
-                self.async_schedule_update_ha_state()
+            field = "power" if self.channel_data.get("output_state") is None else "output_state"
+            await self.async_action_optimistic(ExtaLifeAPI.ACTN_TURN_ON, {field: 1})
         else:
-            if await self.async_action(ExtaLifeAPI.ACTN_EXFREE_TURN_ON_PRESS) and await self.async_action(ExtaLifeAPI.ACTN_EXFREE_TURN_ON_RELEASE):
+            if await self.async_action_press_release(ExtaLifeAPI.ACTN_EXFREE_TURN_ON_PRESS):
                 self._assumed_on = True
                 self.async_schedule_update_ha_state()
 
@@ -57,12 +61,10 @@ class ExtaLifeSwitch(ExtaLifeChannel, SwitchEntity):
     async def async_turn_off(self, **kwargs):
         """Turn off the switch."""
         if not self.is_exta_free:
-            if await self.async_action(ExtaLifeAPI.ACTN_TURN_OFF):
-                field = "power" if self.channel_data.get("output_state") is None else "output_state"
-                self.channel_data[field] = 0
-                self.async_schedule_update_ha_state()
+            field = "power" if self.channel_data.get("output_state") is None else "output_state"
+            await self.async_action_optimistic(ExtaLifeAPI.ACTN_TURN_OFF, {field: 0})
         else:
-            if await self.async_action(ExtaLifeAPI.ACTN_EXFREE_TURN_OFF_PRESS) and await self.async_action(ExtaLifeAPI.ACTN_EXFREE_TURN_OFF_RELEASE):
+            if await self.async_action_press_release(ExtaLifeAPI.ACTN_EXFREE_TURN_OFF_PRESS):
                 self._assumed_on = False
                 self.async_schedule_update_ha_state()
 
@@ -73,12 +75,7 @@ class ExtaLifeSwitch(ExtaLifeChannel, SwitchEntity):
         if self.is_exta_free:
             return self._assumed_on
 
-        field = "power" if self.channel_data.get("output_state") is None else "output_state"
-        state = self.channel_data.get(field)
-
-        if state == 1 or state == True:
-            return True
-        return False
+        return is_switch_on(self.channel_data)
 
 
     def on_state_notification(self, data):
@@ -100,3 +97,18 @@ class ExtaLifeSwitch(ExtaLifeChannel, SwitchEntity):
             self.sync_data_update_ha()
 
 
+class ExtaLifeSwitchGroup(ExtaLifeGroup, SwitchEntity):
+    """Native group of Exta Life switches"""
+
+    @property
+    def is_on(self):
+        """Return true if any member is on"""
+        return any(is_switch_on(data) for channel_id, data in self.members_data)
+
+    async def async_turn_on(self, **kwargs):
+        """Turn on all members"""
+        await self.async_action_members(ExtaLifeAPI.ACTN_TURN_ON)
+
+    async def async_turn_off(self, **kwargs):
+        """Turn off all members"""
+        await self.async_action_members(ExtaLifeAPI.ACTN_TURN_OFF)
@@ -61,6 +61,7 @@ class ExtaLifeTransmitter(PseudoPlatform):
         super().__init__(config_entry, channel_data)
 
         self._event_processor = None
+        self._signal_removed_remove_callback = None
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
@@ -70,11 +71,22 @@ class ExtaLifeTransmitter(PseudoPlatform):
             self.get_notif_upd_signal(self.id),
             self._sync_state_notif_update_callback,
         )
+        self._signal_removed_remove_callback = core.async_signal_register(
+            self.get_remove_signal(self.id),
+            self._async_channel_removed_callback,
+        )
 
 
     async def async_will_remove_from_hass(self) -> None:
         await super().async_will_remove_from_hass()
         self._signal_data_notif_remove_callback()
+        self._signal_removed_remove_callback()
+
+    async def _async_channel_removed_callback(self):
+        """ Transmitter no longer exists in the controller """
+        manager = Core.get(self._config_entry.entry_id).storage_get(CORE_STORAGE_ID)
+        if manager is not None:
+            await manager.remove(self.id)
 
 
     def _sync_state_notif_update_callback(self, data):
@@ -104,8 +116,7 @@ class TransmitterManager():
     async def add(self, channel_data: dict):
         """ Add transmitter instance to buffer """
         transmitter = ExtaLifeTransmitter(self._config_entry, channel_data)
-        data = {id: transmitter.id}
-        self._transmitters.update(data)
+        self._transmitters[transmitter.id] = transmitter
 
         await self.register_device(transmitter)
         await transmitter.async_added_to_hass()
@@ -120,7 +131,14 @@ class TransmitterManager():
 
     async def unload_transmitters(self):
         """ Unload transmitters: cleanup, unregister signals etc """
-        for id, transmitter in self._transmitters:
+        for transmitter in self._transmitters.values():
+            await transmitter.async_will_remove_from_hass()
+        self._transmitters = dict()
+
+    async def remove(self, transmitter_id: str):
+        """ Unload transmitter removed from the controller """
+        transmitter = self._transmitters.pop(transmitter_id, None)
+        if transmitter is not None:
             await transmitter.async_will_remove_from_hass()
 
 
@@ -0,0 +1,490 @@
+""" Benchmark suite for protocol and data manager hot paths.
+
+Runs against the local EFC-01 simulator (tools/efc01_simulator.py) and reports ops/sec and p50/p99 latency.
+Results can be saved as JSON and compared between commits to catch regressions:
+
+    python tools/benchmark.py --json base.json
+    ... change code ...
+    python tools/benchmark.py --compare base.json
+
+Benchmarks of integration classes (Core, ChannelDataManager, entities) need Home Assistant installed;
+they are skipped otherwise.
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+sys.path.insert(0, ROOT)
+
+from efc01_simulator import EFC01Simulator, SimulatorConfig     # pylint: disable=wrong-import-position
+
+_LOGGER = logging.getLogger(__name__)
+
+BENCH_ENTRY_ID = "benchmark"
+
+try:
+    import homeassistant        # pylint: disable=unused-import
+    HAS_HA = True
+except ImportError:
+    HAS_HA = False
+
+
+def load_pyextalife():
+    """Import PyExtaLife; without Home Assistant load the module file directly,
+    as importing the integration package requires Home Assistant"""
+    if HAS_HA:
+        from extalife import pyextalife
+        return pyextalife
+
+    spec = importlib.util.spec_from_file_location("pyextalife", os.path.join(ROOT, "extalife", "pyextalife.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+pyextalife = load_pyextalife()
+
+
+class Result:
+    """Timing results of a single benchmark"""
+
+    def __init__(self, name: str, samples: list, total: float):
+        self.name = name
+        samples = sorted(samples)
+        self.iterations = len(samples)
+        self.ops = self.iterations / total if total else 0
+        self.p50 = samples[len(samples) // 2] if samples else 0
+        self.p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] if samples else 0
+        self.mean = statistics.fmean(samples) if samples else 0
+
+    def as_dict(self) -> dict:
+        return {"iterations": self.iterations, "ops": self.ops, "p50": self.p50, "p99": self.p99, "mean": self.mean}
+
+
+def bench_sync(name: str, func, iterations: int) -> Result:
+    for _ in range(iterations // 10):  # warm-up
+        func()
+    samples = []
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(iterations):
+        t0 = clock()
+        func()
+        samples.append(clock() - t0)
+    return Result(name, samples, clock() - start)
+
+
+async def bench_async(name: str, func, iterations: int) -> Result:
+    for _ in range(iterations // 10):  # warm-up
+        await func()
+    samples = []
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(iterations):
+        t0 = clock()
+        await func()
+        samples.append(clock() - t0)
+    return Result(name, samples, clock() - start)
+
+
+def make_fetch_frames(simulator: EFC01Simulator, command: int) -> list:
+    """Raw controller frames for a fetch command, as sent by the controller"""
+    devices = simulator.devices[command]
+    size = simulator.config.chunk_size
+    chunks = [devices[i:i + size] for i in range(0, len(devices), size)]
+    frames = [{"command": command, "status": "searching", "data": {"devices": c}} for c in chunks[:-1]]
+    frames.append({"command": command, "status": "success", "data": {"devices": chunks[-1]}})
+    return frames
+
+
+BENCH_MAC = "00:00:00:00:00:00"
+
+
+def make_api(simulator: EFC01Simulator):
+    api = pyextalife.ExtaLifeAPI(
+        asyncio.get_event_loop(), on_notification_callback=lambda msg: None, port=simulator.port
+    )
+    api.set_mac(BENCH_MAC)  # don't resolve MAC of the simulator via ARP
+    return api
+
+
+async def async_connect_api(simulator: EFC01Simulator, api=None):
+    api = api or make_api(simulator)
+    await api.async_connect(simulator.config.user, simulator.config.password, "127.0.0.1")
+    return api
+
+
+# ----------------------------------------------------------------------------------------------------------------
+# protocol benchmarks
+# ----------------------------------------------------------------------------------------------------------------
+def bench_parse(simulator: EFC01Simulator, iterations: int) -> Result:
+    frame = json.dumps(make_fetch_frames(simulator, pyextalife.ExtaLifeAPI.CMD_FETCH_RECEIVERS)[0]) + chr(3)
+    return bench_sync("parse_frame", lambda: pyextalife.APIResponse.from_json(frame), iterations)
+
+
+def bench_get_channels(simulator: EFC01Simulator, iterations: int) -> Result:
+    frames = make_fetch_frames(simulator, pyextalife.ExtaLifeAPI.CMD_FETCH_RECEIVERS)
+    return bench_sync("get_channels_int", lambda: pyextalife.ExtaLifeAPI._get_channels_int(frames), iterations)
+
+
+async def async_bench_execute_action(simulator: EFC01Simulator, iterations: int) -> Result:
+    device = simulator.devices[pyextalife.ExtaLifeAPI.CMD_FETCH_RECEIVERS][0]
+    channel_id = f"{device['id']}-{device['state'][0]['channel']}"
+
+    api = await async_connect_api(simulator)
+    try:
+        return await bench_async(
+            "execute_action",
+            lambda: api.async_execute_action(pyextalife.ExtaLifeAPI.ACTN_TURN_ON, channel_id),
+            iterations,
+        )
+    finally:
+        await api.disconnect()
+
+
+async def async_bench_fetch_channels(simulator: EFC01Simulator, iterations: int) -> Result:
+    api = await async_connect_api(simulator)
+    try:
+        return await bench_async("fetch_channels", api.async_get_channels, iterations)
+    finally:
+        await api.disconnect()
+
+
+# ----------------------------------------------------------------------------------------------------------------
+# integration benchmarks (Home Assistant required)
+# ----------------------------------------------------------------------------------------------------------------
+class BenchHass:
+    """Minimal stand-in for HomeAssistant object: just enough for the code paths benchmarked"""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.data = {}
+        self.bus = SimpleNamespace(async_fire=lambda *args, **kwargs: None)
+        self.config_entries = SimpleNamespace(
+            async_forward_entry_setup=self._async_noop, async_forward_entry_unload=self._async_noop
+        )
+
+    @staticmethod
+    async def _async_noop(*args, **kwargs):
+        return True
+
+    def async_add_job(self, target, *args):
+        if asyncio.iscoroutinefunction(target):
+            return self.loop.create_task(target(*args))
+        return target(*args)
+
+    def async_create_task(self, coro):
+        return self.loop.create_task(coro)
+
+
+def make_core(simulator: EFC01Simulator, options: dict):
+    """Create Core instance with a (not connected) API of the simulator and without Home Assistant"""
+    from extalife.helpers.const import CONF_CONTROLLER_MAC
+    from extalife.helpers.core import Core
+
+    config_entry = SimpleNamespace(entry_id=BENCH_ENTRY_ID, options=options, data={CONF_CONTROLLER_MAC: BENCH_MAC})
+    return Core.create_with_api(BenchHass(asyncio.get_event_loop()), config_entry, make_api(simulator))
+
+
+
+
+def default_options() -> dict:
+    from extalife.config_flow import get_default_options
+    return get_default_options()
+
+
+async def async_bench_discover_devices(simulator: EFC01Simulator, iterations: int) -> Result:
+    core = make_core(simulator, default_options())
+    manager = core.data_manager
+
+    # transmitters are set up as a custom platform registering devices in the device registry - not available here
+    channels = []
+    for cmd in (pyextalife.ExtaLifeAPI.CMD_FETCH_RECEIVERS, pyextalife.ExtaLifeAPI.CMD_FETCH_SENSORS):
+        channels.extend(pyextalife.ExtaLifeAPI._get_channels_int(make_fetch_frames(simulator, cmd)))
+    manager.channels_indx.merge_snapshot(((c["id"], c["data"]) for c in channels), manager.channels_indx.revision)
+
+    async def discover():
+        manager.discovered_channels = {}
+        await manager.async_discover_devices()
+
+    try:
+        return await bench_async("discover_devices", discover, iterations)
+    finally:
+        await core.unload_entry_from_hass()
+
+
+async def async_bench_notification_dispatch(simulator: EFC01Simulator, iterations: int) -> Result:
+    """Notification from controller frame to entity callback through Core signals"""
+    from extalife import ExtaLifeChannel
+
+    core = make_core(simulator, default_options())
+    manager = core.data_manager
+
+    delivered = asyncio.Event()
+
+    async def entity_callback(data):
+        delivered.set()
+
+    # one "entity" per receiver / sensor channel, like in a real installation
+    for (dev_id, channel) in simulator._channels:
+        core.async_signal_register(ExtaLifeChannel.get_notif_upd_signal(f"{dev_id}-{channel}"), entity_callback)
+
+    dev_id, channel = next(c for c in simulator._channels if c[1] != "#")
+    notification = {
+        "command": pyextalife.ExtaLifeAPI.CMD_CONTROL_DEVICE,
+        "status": "notification",
+        "data": {"id": dev_id, "channel": channel, "state": 1, "value": 100},
+    }
+
+    async def dispatch():
+        delivered.clear()
+        manager.on_notify(notification)
+        await delivered.wait()
+
+    try:
+        return await bench_async("notification_dispatch", dispatch, iterations)
+    finally:
+        await core.unload_entry_from_hass()
+
+
+async def async_bench_notification_drop(simulator: EFC01Simulator, iterations: int) -> Result:
+    """Notification of a channel nobody listens to (e.g. repeater), dropped by Core before the data manager"""
+    core = make_core(simulator, default_options())
+
+    device = simulator.devices[pyextalife.ExtaLifeAPI.CMD_FETCH_RECEIVERS][0]
+    core.data_manager.ignored_channels.add((device["id"], device["state"][0]["channel"]))
+    notification = {
+        "command": pyextalife.ExtaLifeAPI.CMD_CONTROL_DEVICE,
+        "status": "notification",
+        "data": {"id": device["id"], "channel": device["state"][0]["channel"], "state": 1, "value": 100},
+    }
+
+    try:
+        return bench_sync(
+            "notification_drop", lambda: core._on_status_notification_callback(notification), iterations
+        )
+    finally:
+        await core.unload_entry_from_hass()
+
+
+async def async_bench_button_binding(simulator: EFC01Simulator, iterations: int) -> Result:
+    """Transmitter button press to the bound receiver action received by the controller, end-to-end over TCP"""
+    from extalife.helpers.const import (
+        BINDING_ACTION, BINDING_ACTION_TOGGLE, BINDING_BUTTON, BINDING_CHANNEL, BINDING_GESTURE, BINDING_ID,
+        BINDING_TRANSMITTER, OPTIONS_BINDING, OPTIONS_BINDING_LIST, TRIGGER_BUTTON_DOWN,
+    )
+
+    transmitter = simulator.devices[pyextalife.ExtaLifeAPI.CMD_FETCH_TRANSMITTERS][0]
+    frames = make_fetch_frames(simulator, pyextalife.ExtaLifeAPI.CMD_FETCH_RECEIVERS)
+    channel = pyextalife.ExtaLifeAPI._get_channels_int(frames)[0]
+
+    options = default_options()
+    options[OPTIONS_BINDING] = {
+        OPTIONS_BINDING_LIST: [
+            {
+                BINDING_ID: "benchmark",
+                BINDING_TRANSMITTER: f"{transmitter['id']}-#",
+                BINDING_BUTTON: 1,
+                BINDING_GESTURE: TRIGGER_BUTTON_DOWN,
+                BINDING_CHANNEL: channel["id"],
+                BINDING_ACTION: BINDING_ACTION_TOGGLE,
+            }
+        ]
+    }
+    core = make_core(simulator, options)
+    manager = core.data_manager
+    manager.channels_indx.merge_snapshot([(channel["id"], channel["data"])], manager.channels_indx.revision)
+    manager.discovered_channels[channel["id"]] = "switch"
+    # as after discovery: notifications of the transmitter are forwarded by Core to the data manager
+    manager.subscribed_channels.add((transmitter["id"], "#"))
+
+    received = asyncio.Event()
+    handle_command = simulator._handle_command
+
+    async def handle_command_wrapper(writer, command, data):
+        if command == pyextalife.ExtaLifeAPI.CMD_CONTROL_DEVICE:
+            received.set()
+        return await handle_command(writer, command, data)
+
+    simulator._handle_command = handle_command_wrapper
+    await async_connect_api(simulator, core.api)
+
+    async def press():
+        received.clear()
+        simulator.press_button(transmitter["id"], 1, 1)
+        await received.wait()
+
+    try:
+        result = await bench_async("button_binding", press, iterations)
+        _LOGGER.info("button_binding stats: %s", core.bindings.stats.as_dict())
+        return result
+    finally:
+        simulator._handle_command = handle_command
+        await core.unload_entry_from_hass()
+
+
+async def async_bench_sensor_native_value(simulator: EFC01Simulator, iterations: int) -> Result:
+    from extalife.sensor import ExtaLifeSensor
+
+    core = make_core(simulator, default_options())
+    frames = make_fetch_frames(simulator, pyextalife.ExtaLifeAPI.CMD_FETCH_SENSORS)
+    channels = pyextalife.ExtaLifeAPI._get_channels_int(frames)
+    sensors = [ExtaLifeSensor(channel, core.config_entry) for channel in channels]
+
+    def read():
+        for sensor in sensors:
+            sensor.native_value      # pylint: disable=pointless-statement
+
+    try:
+        return bench_sync(f"sensor_native_value_x{len(sensors)}", read, iterations)
+    finally:
+        await core.unload_entry_from_hass()
+
+
+async def async_bench_entity_metadata(simulator: EFC01Simulator, iterations: int) -> Result:
+    """Entity properties read by Home Assistant on every state write, for all receiver and sensor entities"""
+    from extalife.sensor import ExtaLifeSensor
+    from extalife.switch import ExtaLifeSwitch
+
+    core = make_core(simulator, default_options())
+    await async_connect_api(simulator, core.api)
+    entities = []
+    for cmd, entity_class in (
+        (pyextalife.ExtaLifeAPI.CMD_FETCH_RECEIVERS, ExtaLifeSwitch),
+        (pyextalife.ExtaLifeAPI.CMD_FETCH_SENSORS, ExtaLifeSensor),
+    ):
+        channels = pyextalife.ExtaLifeAPI._get_channels_int(make_fetch_frames(simulator, cmd))
+        entities.extend(entity_class(channel, core.config_entry) for channel in channels)
+
+    def read():
+        for entity in entities:
+            # pylint: disable=pointless-statement
+            entity.unique_id
+            entity.name
+            entity.device_info
+            entity.available
+            entity.assumed_state
+            entity.extra_state_attributes
+
+    try:
+        return bench_sync(f"entity_metadata_x{len(entities)}", read, iterations)
+    finally:
+        await core.unload_entry_from_hass()
+
+
+# ----------------------------------------------------------------------------------------------------------------
+async def async_run(args) -> list:
+    simulator = EFC01Simulator(
+        SimulatorConfig(
+            receivers=args.receivers, sensors=args.sensors, transmitters=args.transmitters, latency=args.latency
+        )
+    )
+    await simulator.async_start(port=0)
+
+    n = args.iterations
+    results = []
+    try:
+        results.append(bench_parse(simulator, n * 10))
+        results.append(bench_get_channels(simulator, n))
+        results.append(await async_bench_execute_action(simulator, n))
+        results.append(await async_bench_fetch_channels(simulator, max(n // 10, 1)))
+
+        if HAS_HA:
+            results.append(await async_bench_discover_devices(simulator, max(n // 10, 1)))
+            results.append(await async_bench_notification_dispatch(simulator, n))
+            results.append(await async_bench_notification_drop(simulator, n * 10))
+            results.append(await async_bench_button_binding(simulator, n))
+            results.append(await async_bench_sensor_native_value(simulator, n))
+            results.append(await async_bench_entity_metadata(simulator, max(n // 10, 1)))
+        else:
+            _LOGGER.warning("Home Assistant is not installed - integration benchmarks skipped")
+    finally:
+        await simulator.async_stop()
+
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: list, baseline: dict = None):
+    print(f"{'benchmark':32} {'ops/s':>12} {'p50 [us]':>12} {'p99 [us]':>12} {'p50 vs base':>12}")
+    for res in results:
+        delta = ""
+        if baseline and res.name in baseline:
+            base_p50 = baseline[res.name]["p50"]
+            if base_p50:
+                delta = f"{(res.p50 - base_p50) / base_p50 * 100:+.1f}%"
+        print(f"{res.name:32} {res.ops:12.1f} {res.p50 * 1e6:12.1f} {res.p99 * 1e6:12.1f} {delta:>12}")
+
+
+def find_regressions(results: list, baseline: dict, threshold: float) -> list:
+    """Names of benchmarks with p50 latency worse than baseline by more than threshold (fraction)"""
+    regressed = []
+    for res in results:
+        base = baseline.get(res.name)
+        if base and base["p50"] and (res.p50 - base["p50"]) / base["p50"] > threshold:
+            regressed.append(res.name)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exta Life integration benchmarks")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--receivers", type=int, default=400)
+    parser.add_argument("--sensors", type=int, default=100)
+    parser.add_argument("--transmitters", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated controller latency (seconds)")
+    parser.add_argument("--json", help="save results to a JSON file")
+    parser.add_argument("--compare", help="compare with results saved in a JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="p50 regression threshold, default: 0.1 (10%%)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = asyncio.run(async_run(args))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "revision": git_revision(),
+                    "python": platform.python_version(),
+                    "params": vars(args),
+                    "results": {res.name: res.as_dict() for res in results},
+                },
+                file,
+                indent=2,
+            )
+
+    if baseline:
+        regressed = find_regressions(results, baseline, args.threshold)
+        if regressed:
+            print(f"Regressions: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
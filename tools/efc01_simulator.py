@@ -0,0 +1,418 @@
+""" Local EFC-01 controller simulator. Speaks the ETX-framed JSON protocol of EFC-01 on TCP port 20400,
+so the integration and the PyExtaLife API can be exercised, load- and latency-tested without real hardware.
+
+Supported commands: 1 (login), 20 (control), 37, 38, 39, 203 (fetch channels; multi-part "searching" replies),
+44 (scene), 102 (network settings), 150 (restart), 151 (version).
+
+Example:
+    python tools/efc01_simulator.py --receivers 400 --sensors 100 --latency 0.01 --storm-rate 200
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+import json
+import logging
+import random
+import socket
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+ETX = b"\x03"
+
+EFC01_PORT = 20400
+EFC01_MCAST_GRP = "225.0.0.1"
+EFC01_MCAST_PORT = 20401
+
+CMD_LOGIN = 1
+CMD_CONTROL_DEVICE = 20
+CMD_FETCH_RECEIVERS = 37
+CMD_FETCH_SENSORS = 38
+CMD_FETCH_TRANSMITTERS = 39
+CMD_ACTIVATE_SCENE = 44
+CMD_FETCH_NETW_SETTINGS = 102
+CMD_RESTART = 150
+CMD_VERSION = 151
+CMD_FETCH_EXTAFREE = 203
+
+# device types used to populate the simulated installation
+RECEIVER_TYPES = (10, 11, 13, 12, 27)       # ROP-21, ROP-22, RDP-21, SRP-22, SLR-22
+SENSOR_TYPES = (20, 35)                     # RCT-21, MEM-21
+TRANSMITTER_TYPES = (1, 3)                  # RNK-22, RNK-24
+EXTA_FREE_TYPES = (26, 36)                  # ROP-01, RDP-01 (+300 in Exta Life "namespace")
+
+
+@dataclass
+class SimulatorConfig:
+    """Simulated installation and controller behaviour"""
+
+    user: str = "root"
+    password: str = "password"
+    name: str = "EFC-01 simulator"
+    version: str = "1.6.30"
+    receivers: int = 50             # number of receiver devices (command 37)
+    sensors: int = 10               # number of sensor devices (command 38)
+    transmitters: int = 10          # number of transmitter devices (command 39)
+    exta_free: int = 5              # number of Exta Free receivers (command 203)
+    chunk_size: int = 10            # devices per "searching" reply of fetch commands
+    latency: float = 0.0            # seconds before each reply
+    latency_jitter: float = 0.0     # max. random seconds added to latency
+    seed: int = 0
+
+
+class EFC01Simulator:
+    """EFC-01 controller simulator"""
+
+    def __init__(self, config: SimulatorConfig = None):
+        self.config = config if config else SimulatorConfig()
+        self._random = random.Random(self.config.seed)
+        self._server: asyncio.AbstractServer = None
+        self._clients = set()
+        self._handlers = set()
+        self._storm_task: asyncio.Task = None
+
+        self.devices = {
+            CMD_FETCH_RECEIVERS: [],
+            CMD_FETCH_SENSORS: [],
+            CMD_FETCH_TRANSMITTERS: [],
+            CMD_FETCH_EXTAFREE: [],
+        }
+        self._channels = {}  # (id, channel): (device, state)
+
+        # statistics
+        self.commands = {}          # command: number of requests received
+        self.frames_sent = 0
+        self.notifications_sent = 0
+        self.command_log = []       # (monotonic time, command, data) of control commands
+
+        self._populate()
+
+    def _populate(self):
+        """Build simulated installation"""
+        dev_id = 1
+        serial = 100000
+        for cmd, count, types in (
+            (CMD_FETCH_RECEIVERS, self.config.receivers, RECEIVER_TYPES),
+            (CMD_FETCH_SENSORS, self.config.sensors, SENSOR_TYPES),
+            (CMD_FETCH_TRANSMITTERS, self.config.transmitters, TRANSMITTER_TYPES),
+            (CMD_FETCH_EXTAFREE, self.config.exta_free, EXTA_FREE_TYPES),
+        ):
+            for i in range(count):
+                dev_type = types[i % len(types)]
+                device = self._make_device(cmd, dev_id, dev_type, serial)
+                self.devices[cmd].append(device)
+                for state in device["state"]:
+                    self._channels[(dev_id, state.get("channel", "#"))] = (device, state)
+                dev_id += 1
+                serial += 1
+
+    def _make_device(self, cmd, dev_id, dev_type, serial) -> dict:
+        device = {
+            "id": dev_id,
+            "is_powered": True,
+            "is_paired": False,
+            "set_remove_sensor": False,
+            "device": 1,
+            "type": dev_type,
+            "serial": serial,
+            "state": [],
+        }
+        base = {"is_timeout": False, "fav": None, "icon": 13}
+
+        if cmd == CMD_FETCH_RECEIVERS:
+            channels = 2 if dev_type == 11 else 1
+            for ch in range(1, channels + 1):
+                state = {**base, "alias": f"Receiver {dev_id}-{ch}", "channel": ch, "power": 0, "last_dir": None, "value": None}
+                if dev_type in (13, 27):
+                    state["value"] = 50
+                if dev_type == 27:
+                    state.update({"mode": 1, "mode_val": "FFFFFF00"})
+                if dev_type == 12:
+                    state["value"] = 0
+                device["state"].append(state)
+
+        elif cmd == CMD_FETCH_SENSORS:
+            state = {**base, "alias": f"Sensor {dev_id}", "channel": 1, "sync_time": 60, "last_sync": 0, "battery_status": 0.9}
+            if dev_type == 20:
+                state["value_1"] = 21.5
+            else:
+                state["total_energy"] = 123456789
+                state["phase"] = [
+                    {"voltage": 23000, "current": 1000, "active_power": 200, "frequency": 5000, "power_factor": 950}
+                    for p in range(3)
+                ]
+            device["state"].append(state)
+
+        elif cmd == CMD_FETCH_TRANSMITTERS:
+            device["state"].append({**base, "alias": f"Transmitter {dev_id}"})
+
+        elif cmd == CMD_FETCH_EXTAFREE:
+            device["exta_free_device"] = True
+            device["type"] = 80
+            device["state"].append(
+                {**base, "alias": f"Exta Free {dev_id}", "channel": 1, "exta_free_type": dev_type, "power": 0, "value": None}
+            )
+
+        return device
+
+    @property
+    def port(self) -> int:
+        """Port the simulator listens on"""
+        return self._server.sockets[0].getsockname()[1]
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = EFC01_PORT):
+        """Start listening. Use port 0 to pick a free port"""
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        _LOGGER.info("EFC-01 simulator listening on %s:%s", host, self.port)
+
+    async def async_stop(self):
+        """Stop notification storm, close all client connections and stop listening"""
+        if self._storm_task is not None:
+            self._storm_task.cancel()
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        if self._handlers:
+            await asyncio.wait(self._handlers)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        authenticated = False
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            while True:
+                try:
+                    frame = await reader.readuntil(ETX)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                try:
+                    request = json.loads(frame[:-1].decode())
+                except ValueError:
+                    continue  # ping frame
+
+                command = request.get("command")
+                data = request.get("data")
+                self.commands[command] = self.commands.get(command, 0) + 1
+
+                if command == CMD_LOGIN:
+                    authenticated = self._login(data)
+                    if authenticated:
+                        self._clients.add(writer)
+                        await self._reply(writer, command, "success", None)
+                    else:
+                        await self._reply(writer, command, "failure", {"code": -2})
+                    continue
+
+                if not authenticated:
+                    await self._reply(writer, command, "failure", {"code": -1})
+                    continue
+
+                await self._handle_command(writer, command, data)
+        finally:
+            self._clients.discard(writer)
+            self._handlers.discard(handler)
+            writer.close()
+
+    def _login(self, data) -> bool:
+        return bool(data) and data.get("login") == self.config.user and data.get("password") == self.config.password
+
+    async def _handle_command(self, writer, command, data):
+        if command in self.devices:
+            devices = self.devices[command]
+            size = self.config.chunk_size
+            chunks = [devices[i:i + size] for i in range(0, len(devices), size)] or [[]]
+            for chunk in chunks[:-1]:
+                await self._reply(writer, command, "searching", {"devices": chunk})
+            await self._reply(writer, command, "success", {"devices": chunks[-1]})
+
+        elif command == CMD_CONTROL_DEVICE:
+            self.command_log.append((time.monotonic(), command, data))
+            notification = self._control(data)
+            if notification is None:
+                await self._reply(writer, command, "failure", {"code": -1})
+                return
+            await self._reply(writer, command, "success", data)
+            self.notify(notification)
+
+        elif command == CMD_ACTIVATE_SCENE:
+            self.command_log.append((time.monotonic(), command, data))
+            await self._reply(writer, command, "success", data)
+            self.notify({"command": CMD_ACTIVATE_SCENE, "status": "notification", "data": data})
+
+        elif command == CMD_FETCH_NETW_SETTINGS:
+            await self._reply(writer, command, "success", {"name": self.config.name, "dhcp": True})
+
+        elif command == CMD_VERSION:
+            await self._reply(writer, command, "success", {"new_version": self.config.version})
+
+        elif command == CMD_RESTART:
+            await self._reply(writer, command, "success", None)
+            for client in list(self._clients):
+                client.close()
+
+        else:
+            await self._reply(writer, command, "failure", {"code": -1})
+
+    def _control(self, data) -> dict:
+        """Apply control command to simulated channel state and return status notification"""
+        if not data:
+            return None
+        found = self._channels.get((data.get("id"), data.get("channel")))
+        if found is None:
+            return None
+        device, state = found
+
+        if device["type"] in (12, 25):      # covers: position in 'value'
+            if data.get("value") is not None:
+                state["value"] = data["value"]
+        else:
+            if data.get("state") in (0, 1):
+                state["power"] = data["state"]
+            for field in ("value", "mode", "mode_val"):
+                if data.get(field) is not None:
+                    state[field] = data[field]
+
+        notif = {"id": device["id"], "channel": state["channel"], "state": state.get("power")}
+        for field in ("value", "mode", "mode_val"):
+            if field in state:
+                notif[field] = state[field]
+        return {"command": CMD_CONTROL_DEVICE, "status": "notification", "data": notif}
+
+    async def _reply(self, writer: asyncio.StreamWriter, command, status, data):
+        delay = self.config.latency
+        if self.config.latency_jitter:
+            delay += self._random.uniform(0, self.config.latency_jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        self._send(writer, {"command": command, "status": status, "data": data})
+
+    def _send(self, writer: asyncio.StreamWriter, msg: dict):
+        if writer.is_closing():
+            return
+        writer.write(json.dumps(msg).encode() + ETX)
+        self.frames_sent += 1
+
+    def notify(self, msg: dict):
+        """Send notification to all logged on clients"""
+        for writer in list(self._clients):
+            self._send(writer, msg)
+        self.notifications_sent += 1
+
+    def press_button(self, transmitter_id: int, button: int, state: int):
+        """Simulate transmitter button press (state=1) or release (state=0)"""
+        self.notify(
+            {
+                "command": CMD_CONTROL_DEVICE,
+                "status": "notification",
+                "data": {"id": transmitter_id, "button": button, "state": state},
+            }
+        )
+
+    def random_notification(self) -> dict:
+        """Random state change of a receiver or measurement of a sensor"""
+        device, state = self._random.choice(list(self._channels.values()))
+        data = {"id": device["id"], "channel": state.get("channel")}
+        if "value_1" in state:
+            state["value_1"] = round(state["value_1"] + self._random.uniform(-0.2, 0.2), 1)
+            data["value_1"] = state["value_1"]
+        elif "phase" in state:
+            for phase in state["phase"]:
+                phase["voltage"] += self._random.randint(-50, 50)
+            data["phase"] = state["phase"]
+        elif "power" in state:
+            state["power"] = 0 if state["power"] else 1
+            data.update({"state": state["power"], "value": state.get("value")})
+        else:
+            data.update({"button": 1, "state": self._random.randint(0, 1)})
+        return {"command": CMD_CONTROL_DEVICE, "status": "notification", "data": data}
+
+    async def async_notification_storm(self, rate: float, duration: float = None, count: int = None):
+        """Send random notifications at `rate` per second for `duration` seconds or `count` notifications"""
+        interval = 1.0 / rate
+        sent = 0
+        start = time.monotonic()
+        while (duration is None or time.monotonic() - start < duration) and (count is None or sent < count):
+            self.notify(self.random_notification())
+            sent += 1
+            # keep the average rate, even if the loop is late
+            delay = start + sent * interval - time.monotonic()
+            await asyncio.sleep(max(delay, 0))
+        return sent
+
+    def start_notification_storm(self, rate: float, duration: float = None, count: int = None):
+        """Run notification storm in background"""
+        self._storm_task = asyncio.ensure_future(self.async_notification_storm(rate, duration, count))
+        return self._storm_task
+
+    async def async_broadcast(self, period: float = 5.0):
+        """Announce the simulator via UDP multicast like EFC-01 does, for autodiscovery"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+        msg = json.dumps({"status": "broadcast", "command": 0, "data": None}).encode() + ETX
+        try:
+            while True:
+                sock.sendto(msg, (EFC01_MCAST_GRP, EFC01_MCAST_PORT))
+                await asyncio.sleep(period)
+        finally:
+            sock.close()
+
+
+async def _async_main(args):
+    config = SimulatorConfig(
+        user=args.user,
+        password=args.password,
+        receivers=args.receivers,
+        sensors=args.sensors,
+        transmitters=args.transmitters,
+        exta_free=args.exta_free,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+    )
+    simulator = EFC01Simulator(config)
+    await simulator.async_start(args.host, args.port)
+
+    tasks = []
+    if args.broadcast:
+        tasks.append(asyncio.ensure_future(simulator.async_broadcast()))
+    if args.storm_rate:
+        tasks.append(simulator.start_notification_storm(args.storm_rate, args.storm_duration))
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await simulator.async_stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EFC-01 controller simulator")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=EFC01_PORT)
+    parser.add_argument("--user", default=SimulatorConfig.user)
+    parser.add_argument("--password", default=SimulatorConfig.password)
+    parser.add_argument("--receivers", type=int, default=SimulatorConfig.receivers)
+    parser.add_argument("--sensors", type=int, default=SimulatorConfig.sensors)
+    parser.add_argument("--transmitters", type=int, default=SimulatorConfig.transmitters)
+    parser.add_argument("--exta-free", type=int, default=SimulatorConfig.exta_free)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each reply")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="max. random seconds added to latency")
+    parser.add_argument("--storm-rate", type=float, default=0.0, help="random notifications per second")
+    parser.add_argument("--storm-duration", type=float, default=None, help="seconds; runs forever if not set")
+    parser.add_argument("--broadcast", action="store_true", help="announce via UDP multicast for autodiscovery")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()